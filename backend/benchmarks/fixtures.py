@@ -0,0 +1,237 @@
+"""
+HTML fixtures for the offline benchmarks.
+
+`generate` writes synthetic pages that follow the markup the scraper reads
+(search table, Forge Price block, company facts, funding rounds with their
+hidden detail rows). `record` replaces or adds pages captured from the live
+site, for when the real markup or page sizes matter.
+
+    uv run python -m benchmarks.fixtures generate
+    uv run python -m benchmarks.fixtures record --pages 2 --slugs spacex,stripe
+"""
+import os
+import json
+import random
+import argparse
+from html import escape
+from typing import Any, Dict, List
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+LIST_PAGES = 3  # Full pages; other page numbers reuse them in turn
+LAST_PAGE = 219  # Served from list/last.html (short page)
+TOTAL_RESULTS = (LAST_PAGE - 1) * 24 + 11
+
+# Funding rounds per detail fixture: slugs "<size>-<anything>" map to detail/<size>.html
+DETAIL_SIZES = {"small": 2, "typical": 8, "large": 60}
+
+SECTORS = [
+    ("Artificial Intelligence", "Machine Learning"),
+    ("Fintech", "Payments"),
+    ("Healthcare, Biotech & Pharma", "Therapeutics"),
+    ("Enterprise Software", "Security"),
+    ("Consumer", "Marketplaces"),
+]
+ROUNDS = ["Seed", "Series A", "Series B", "Series C", "Series D", "Series E", "Series F"]
+INVESTORS = ["Sequoia Capital", "Andreessen Horowitz", "Founders Fund", "Accel", "Tiger Global",
+             "Benchmark", "Lightspeed", "General Catalyst", "Index Ventures", "Coatue"]
+
+
+def _usd(value: float) -> str:
+    for unit, scale in (("T", 1e12), ("B", 1e9), ("M", 1e6), ("K", 1e3)):
+        if value >= scale:
+            return f"${value / scale:.1f}{unit}"
+    return f"${value:,.2f}"
+
+
+def _change(rng: random.Random, price: float) -> str:
+    """ "+$17.81 (3.17%)" """
+    change = rng.uniform(-0.08, 0.08) * price
+    sign = "+" if change >= 0 else "-"
+    return f"{sign}${abs(change):,.2f} ({change / price * 100:.2f}%)"
+
+
+def _change_span(change: str) -> str:
+    css = "negative" if change.startswith("-") else "positive"
+    return f'<span class="{css}">{change}</span>'
+
+
+def list_page(page: int, rows: int = 24) -> str:
+    rng = random.Random(f"list-{page}")
+    body = []
+    for i in range(rows):
+        n = (page - 1) * 24 + i + 1
+        sector, subsector = rng.choice(SECTORS)
+        price = rng.uniform(2, 600)
+        valuation = rng.uniform(2e8, 4e11)
+        size = "large" if n % 10 == 0 else "small" if n % 10 < 4 else "typical"
+        slug = f"{size}-company-{n:04d}"
+        body.append(
+            "<tr>"
+            f'<td><img src="/logos/{slug}.png" alt=""></td>'
+            f'<td><a href="/{slug}_stock/">Company {n:04d}</a></td>'
+            f"<td><div>{escape(sector)}</div><div>{escape(subsector)}</div></td>"
+            f"<td>${price:,.2f} {_change_span(_change(rng, price))}</td>"
+            f"<td>{'$%.2f' % (price * rng.uniform(0.8, 1.1)) if rng.random() > 0.3 else ''}</td>"
+            f"<td>{rng.choice(ROUNDS)}</td>"
+            f"<td>{_usd(valuation)}</td>"
+            f"<td>${price * rng.uniform(0.5, 1.0):,.2f}</td>"
+            f"<td>{_usd(rng.uniform(5e6, 2e9))}</td>"
+            "</tr>"
+        )
+    links = "".join(f'<a href="/search-companies/?page={p}">{p}</a>' for p in range(1, 6))
+    links += f'<a href="/search-companies/?page={LAST_PAGE}">{LAST_PAGE}</a>'
+    return f"""<!DOCTYPE html>
+<html><head><title>Search Private Companies | Forge</title></head>
+<body><main>
+<h1>Search companies</h1>
+<div class="results-count">{TOTAL_RESULTS:,} results</div>
+<table>
+<thead><tr><th></th><th>Company</th><th>Sector</th><th>Forge Price</th><th>Last Matched Price</th>
+<th>Round</th><th>Post-Money Valuation</th><th>Price Per Share</th><th>Amount Raised</th></tr></thead>
+<tbody>
+{chr(10).join(body)}
+</tbody>
+</table>
+<nav class="pagination">{links}</nav>
+</main></body></html>
+"""
+
+
+def detail_snapshot(size: str, rounds: int) -> Dict[str, Any]:
+    """
+    A synthetic company page as plain data, in the shape DETAIL_SNAPSHOT_JS returns.
+    detail_page renders it to HTML; the harness feeds it straight to the model
+    building step in non-browser mode.
+    """
+    rng = random.Random(f"detail-{size}")
+    price = rng.uniform(10, 600)
+    valuation = rng.uniform(1e9, 4e11)
+    change = _change(rng, price)
+    name = f"{size.title()} Example Co"
+    funding_rounds = []
+    for i in range(rounds):
+        month = rng.choice(["Jan", "Mar", "Jun", "Sep", "Nov"])
+        label = ROUNDS[max(0, rounds - i - 1)] if rounds <= len(ROUNDS) else rng.choice(ROUNDS)
+        funding_rounds.append({
+            "cells": [
+                "+", f"{month} {rng.randint(1, 28)}, {2025 - i // 2}", label,
+                _usd(rng.uniform(5e6, 1e9)), f"${price * (0.85 ** i):,.2f}", _usd(valuation * (0.85 ** i)),
+                ", ".join(rng.sample(INVESTORS, rng.randint(1, 4))),
+            ],
+            "details": [
+                ["shares outstanding", f"{rng.randint(1_000_000, 90_000_000):,}"],
+                ["liquidation pref order", str(rng.randint(1, 4))],
+                ["liquidation pref as multiplier", "1.00x"],
+                ["conversion ratio", "1.00"],
+                ["dividend rate", "--"],
+                ["participation cap", "--"],
+            ],
+        })
+    return {
+        "name": f"{name} Stock",
+        "logo_url": f"/logos/{size}.png",
+        "price_text": f"${price:,.2f} {change}",
+        "change_text": change,
+        "valuation_text": _usd(valuation),
+        "facts": [
+            ["Sector", "Artificial Intelligence"],
+            ["Subsector", "Machine Learning"],
+            ["Founded", str(rng.randint(1995, 2021))],
+            ["Headquarters", "San Francisco, CA"],
+            ["Employees", f"{rng.randint(50, 20000):,}"],
+        ],
+        "description": f"{name} builds things. " + "Lorem ipsum dolor sit amet. " * 20,
+        "website": f"https://{size}.example.com",
+        "rounds": funding_rounds,
+    }
+
+
+def detail_page(snapshot: Dict[str, Any]) -> str:
+    rows: List[str] = []
+    for i, funding_round in enumerate(snapshot["rounds"]):
+        cells = "".join(f"<td>{escape(cell)}</td>" for cell in funding_round["cells"])
+        rows.append(f'<tr class="overview" data-index="{i}">{cells}</tr>')
+        # Label/value div pairs, labels as shown on the site
+        pairs = "".join(
+            f"<div>{escape(label.title())}</div><div>{escape(value)}</div>"
+            for label, value in funding_round["details"]
+        )
+        rows.append(f'<tr class="detail" data-index="{i}"><td colspan="7">{pairs}</td></tr>')
+    facts = "\n".join(
+        f'<div class="col"><div class="label">{escape(label)}</div><div class="value">{escape(value)}</div></div>'
+        for label, value in snapshot["facts"]
+    )
+    price, _, _ = snapshot["price_text"].partition(" ")
+    website = snapshot["website"]
+    return f"""<!DOCTYPE html>
+<html><head><title>{escape(snapshot['name'])} | Forge</title></head>
+<body><main>
+<div class="company-header"><img src="{snapshot['logo_url']}" alt=""><h1>{escape(snapshot['name'])}</h1></div>
+<div class="dg"><div class="dl">Forge Price</div><div class="dv1">{price} {_change_span(snapshot['change_text'])}</div></div>
+<div class="fp-info-item"><div class="label">Forge Price Valuation</div><div class="value">{snapshot['valuation_text']}</div></div>
+<div class="facts">
+{facts}
+</div>
+<div class="desc">{escape(snapshot['description'])}</div>
+<div class="website-url"><a href="{website}">{website.split('//', 1)[-1]}</a></div>
+<table class="funding-rounds">
+<thead><tr><th></th><th>Date</th><th>Round</th><th>Amount Raised</th><th>Price Per Share</th><th>Valuation</th><th>Investors</th></tr></thead>
+<tbody>
+{chr(10).join(rows)}
+</tbody>
+</table>
+</main></body></html>
+"""
+
+
+def _write(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+    print(f"Wrote {os.path.relpath(path, FIXTURES_DIR)} ({len(content):,} bytes)")
+
+
+def generate():
+    for page in range(1, LIST_PAGES + 1):
+        _write(os.path.join(FIXTURES_DIR, "list", f"page-{page}.html"), list_page(page))
+    _write(os.path.join(FIXTURES_DIR, "list", "last.html"), list_page(LAST_PAGE, rows=11))
+    for size, rounds in DETAIL_SIZES.items():
+        snapshot = detail_snapshot(size, rounds)
+        _write(os.path.join(FIXTURES_DIR, "detail", f"{size}.html"), detail_page(snapshot))
+        _write(os.path.join(FIXTURES_DIR, "detail", f"{size}.json"), json.dumps(snapshot, indent=1))
+
+
+def record(pages: int, slugs: List[str], base_url: str):
+    """
+    Saves live pages as fixtures: list pages over plain HTTP (server-rendered)
+    and company pages as detail/<slug>.html, served for that slug.
+    """
+    import httpx
+    from src.services.http_client import DEFAULT_HEADERS
+
+    with httpx.Client(headers=DEFAULT_HEADERS, follow_redirects=True, timeout=30) as client:
+        for page in range(1, pages + 1):
+            response = client.get(f"{base_url}/search-companies/?page={page}")
+            response.raise_for_status()
+            _write(os.path.join(FIXTURES_DIR, "list", f"page-{page}.html"), response.text)
+        for slug in slugs:
+            response = client.get(f"{base_url}/{slug}_stock/")
+            response.raise_for_status()
+            _write(os.path.join(FIXTURES_DIR, "detail", f"{slug}.html"), response.text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("generate", help="Write the synthetic fixtures")
+    rec = commands.add_parser("record", help="Capture pages from the live site")
+    rec.add_argument("--pages", type=int, default=LIST_PAGES)
+    rec.add_argument("--slugs", default="", help="Comma-separated company slugs")
+    rec.add_argument("--base-url", default="https://forgeglobal.com")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate()
+    else:
+        record(args.pages, [s for s in args.slugs.split(",") if s], args.base_url.rstrip("/"))
@@ -0,0 +1,117 @@
+"""
+Micro-benchmark for cache hits on /data/forge and /data/company/{slug}: requests/s
+through the ASGI app, middleware included (called in-process, no network or HTTP
+client), before and after the pre-encoded response path.
+
+    uv run python -m benchmarks.responses
+    uv run python -m benchmarks.responses --iterations 5000 --gzip
+
+"before" is the previous endpoint shape, mounted under /before (return the models,
+FastAPI validates them against response_model and encodes them on every request);
+"after" is the real endpoint, which serves the JSON bytes kept with the cache
+entry. Caches are filled from the fixtures, so no scraping happens.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from typing import List, Optional, Tuple
+from benchmarks.fixtures import FIXTURES_DIR
+from benchmarks.run import measure, report
+
+
+async def asgi_get(app, path: str, query: str, headers: List[Tuple[bytes, bytes]]) -> int:
+    """One GET straight through the ASGI app; returns the status code."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"host", b"bench"), *headers],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(args):
+    # Imported after the environment is set (config reads it on import)
+    from fastapi import APIRouter, Query
+    from src.config import SpeedProfile
+    from src.main import app
+    from src.api.routes import service
+    from src.models.schemas import PaginatedResponse, CompanyDetail
+    from src.services.forge_parser import parse_search_page
+
+    # Cache one list page and the typical and large company pages
+    with open(os.path.join(FIXTURES_DIR, "list", "page-1.html")) as f:
+        rows = service._build_list_rows(parse_search_page(f.read())["rows"])
+    service._list_cache.set(service.list_cache_key(None, None, 1), rows)
+    for size in ("typical", "large"):
+        with open(os.path.join(FIXTURES_DIR, "detail", f"{size}.json")) as f:
+            service._detail_cache.set(size, service._build_company_detail(size, json.load(f)))
+
+    before = APIRouter()
+
+    # Same parameters as the real endpoint, so only the response path differs
+    @before.get("/data/forge", response_model=PaginatedResponse)
+    async def forge_before(
+        sector: Optional[str] = None,
+        valuation: Optional[str] = None,
+        page: int = Query(1, ge=1),
+        speed: SpeedProfile = SpeedProfile.NORMAL
+    ):
+        data = await service.scrape(sector=sector, valuation=valuation, page_num=page, speed=speed)
+        return service.build_page(data, sector, valuation, page)
+
+    @before.get("/data/company/{slug}", response_model=CompanyDetail)
+    async def company_before(slug: str):
+        return await service.scrape_company_detail(slug)
+
+    app.include_router(before, prefix="/before")
+
+    headers = [(b"accept-encoding", b"gzip" if args.gzip else b"identity")]
+    results = []
+    for name, path, query in (
+        ("/data/forge (24 rows)", "/data/forge", "page=1"),
+        ("/data/company (8 rounds)", "/data/company/typical", ""),
+        ("/data/company (60 rounds)", "/data/company/large", ""),
+    ):
+        for label, prefix in (("before", "/before"), ("after", "")):
+            async def call(i: int, path=prefix + path, query=query):
+                return await asgi_get(app, path, query, headers) == 200
+
+            results.append(await measure(f"{name} {label}", call, args.iterations, args.warmup, args.concurrency))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--gzip", action="store_true", help="Ask for gzip (includes compression cost)")
+    args = parser.parse_args()
+
+    os.environ["STORE_ENABLED"] = "false"
+    # Cache hit logging would dominate the timings
+    sys.stdout = open(os.devnull, "w")
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+    report(results, None, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Offline benchmarks for the scrape pipeline, run against the local stand-in site
+(benchmarks/server.py) instead of forgeglobal.com.
+
+    uv run python -m benchmarks.run
+    uv run python -m benchmarks.run --modes http --iterations 200 --concurrency 4
+    uv run python -m benchmarks.run --json results.json --baseline previous.json
+
+Scenarios:
+    scrape / http              list page over the HTTP fast path (lxml)
+    scrape / browser           list page in Camoufox
+    scrape_company_detail / browser   typical (8 rounds) and large (60 rounds) pages in Camoufox
+    scrape_company_detail / snapshot  model building from a recorded page snapshot
+                               (detail pages have no HTTP path; this is everything but the browser)
+
+Every call is a real scrape: caches are cleared between calls, nothing is persisted
+and rate pacing is off (it would measure the limiter, not the scraper). Reports
+throughput and latency percentiles, plus the mean time per pipeline stage.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from benchmarks import server
+from benchmarks.fixtures import FIXTURES_DIR, LAST_PAGE
+
+STAGES = ("semaphore_wait", "browser_start", "context_create", "goto", "evaluate",
+          "http_fetch", "http_parse", "build_models")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear interpolation between closest ranks."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def stage_totals() -> Dict[str, List[float]]:
+    """(sum, count) per stage from the forge_stage_seconds histogram."""
+    from prometheus_client import REGISTRY
+    totals = {}
+    for stage in STAGES:
+        total = REGISTRY.get_sample_value("forge_stage_seconds_sum", {"stage": stage}) or 0.0
+        count = REGISTRY.get_sample_value("forge_stage_seconds_count", {"stage": stage}) or 0.0
+        totals[stage] = [total, count]
+    return totals
+
+
+async def measure(
+    name: str, call: Callable[[int], Awaitable[Any]], iterations: int, warmup: int, concurrency: int
+) -> Dict[str, Any]:
+    """Runs call(i) `iterations` times, `concurrency` at once, after `warmup` unmeasured calls."""
+    for i in range(warmup):
+        await call(i)
+
+    before = stage_totals()
+    latencies: List[float] = []
+    errors = 0
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with limit:
+            started = time.perf_counter()
+            try:
+                if not await call(warmup + i):
+                    errors += 1
+            except Exception as e:
+                print(f"  {name}: {e}")
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    wall = time.perf_counter() - started
+
+    after = stage_totals()
+    stages = {}
+    for stage in STAGES:
+        count = after[stage][1] - before[stage][1]
+        if count:
+            stages[stage] = round((after[stage][0] - before[stage][0]) / count * 1000, 3)
+
+    latencies.sort()
+    return {
+        "name": name,
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "ops_per_sec": round(iterations / wall, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "stages_ms": stages,
+    }
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    # Imported after FORGE_BASE_URL points at the stand-in site (config reads it on import)
+    import src.services.forge_global as forge_global
+    from src.services.forge_global import ForgeGlobalService
+    from src.services.rate_controller import rate_controller
+    from src.services.browser_manager import browser_manager
+    from src.services.http_client import http_client_manager
+
+    async def unpaced(speed=None, max_wait=None):
+        return None
+    rate_controller.acquire = unpaced
+
+    service = ForgeGlobalService()
+
+    def fresh_page(i: int) -> int:
+        page = i % (LAST_PAGE - 1) + 1
+        service._list_cache.delete(service.list_cache_key(None, None, page))
+        return page
+
+    async def scrape_list(i: int):
+        return await service.scrape(page_num=fresh_page(i))
+
+    def detail_call(size: str):
+        async def call(i: int):
+            slug = f"{size}-bench-{i}"
+            service._detail_cache.delete(slug)
+            return await service.scrape_company_detail(slug)
+        return call
+
+    def build_call(size: str):
+        with open(os.path.join(FIXTURES_DIR, "detail", f"{size}.json")) as f:
+            snapshot = json.load(f)
+
+        async def call(i: int):
+            return service._build_company_detail(f"{size}-bench-{i}", snapshot)
+        return call
+
+    results = []
+    try:
+        if "http" in args.modes:
+            forge_global.HTTP_FAST_PATH = True
+            results.append(await measure("scrape / http", scrape_list, args.iterations, args.warmup, args.concurrency))
+            for size in ("typical", "large"):
+                results.append(await measure(
+                    f"scrape_company_detail / snapshot ({size})", build_call(size), args.iterations, args.warmup, 1
+                ))
+
+        if "browser" in args.modes:
+            try:
+                await browser_manager.start()
+            except Exception as e:
+                print(f"Skipping browser mode, the browser did not start: {e}")
+            else:
+                forge_global.HTTP_FAST_PATH = False
+                iterations = args.browser_iterations
+                results.append(await measure("scrape / browser", scrape_list, iterations, args.warmup, args.concurrency))
+                for size in ("typical", "large"):
+                    results.append(await measure(
+                        f"scrape_company_detail / browser ({size})", detail_call(size), iterations, args.warmup,
+                        args.concurrency,
+                    ))
+    finally:
+        await browser_manager.stop()
+        await http_client_manager.stop()
+    return results
+
+
+def report(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]], tolerance: float) -> int:
+    """Prints the results table; returns how many scenarios regressed against the baseline."""
+    header = f"{'scenario':<44}{'n':>6}{'ops/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'err':>5}"
+    print()
+    print(header)
+    print("-" * len(header))
+    regressions = 0
+    for r in results:
+        line = (f"{r['name']:<44}{r['iterations']:>6}{r['ops_per_sec']:>10.1f}{r['p50_ms']:>10.2f}"
+                f"{r['p90_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}{r['errors']:>5}")
+        previous = (baseline or {}).get(r["name"])
+        if previous:
+            change = (r["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100 if previous["p50_ms"] else 0.0
+            line += f"  p50 {change:+.0f}%"
+            if change > tolerance:
+                line += " REGRESSION"
+                regressions += 1
+        print(line)
+        if r["stages_ms"]:
+            print("    " + ", ".join(f"{stage} {ms:.2f}" for stage, ms in r["stages_ms"].items()))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="http,browser", help="Comma-separated: http, browser")
+    parser.add_argument("--iterations", type=int, default=100, help="Measured calls per http scenario")
+    parser.add_argument("--browser-iterations", type=int, default=20, help="Measured calls per browser scenario")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds the stand-in site adds to every response")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Compare p50 latency against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Allowed p50 increase (%%) before flagging")
+    args = parser.parse_args()
+    args.modes = {mode.strip() for mode in args.modes.split(",") if mode.strip()}
+
+    site = server.start(delay=args.delay)
+    os.environ["FORGE_BASE_URL"] = f"http://127.0.0.1:{site.server_port}"
+    os.environ["STORE_ENABLED"] = "false"
+    os.environ.setdefault("WORKER_POOL", "off")
+    print(f"Stand-in site on {os.environ['FORGE_BASE_URL']}")
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        site.shutdown()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+    regressions = report(results, baseline, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "results": results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
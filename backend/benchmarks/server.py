@@ -0,0 +1,103 @@
+"""
+Local stand-in for forgeglobal.com that serves the fixtures. Point the scraper
+at it with FORGE_BASE_URL (the benchmark harness does this itself):
+
+    uv run python -m benchmarks.server --port 8765
+    FORGE_BASE_URL=http://127.0.0.1:8765 uv run uvicorn src.main:app
+"""
+import os
+import re
+import glob
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+from benchmarks.fixtures import FIXTURES_DIR, LAST_PAGE
+
+_DETAIL_RE = re.compile(r"^/([^/]+)_stock/?$")
+
+
+class FixtureSite:
+    """Loads every fixture into memory once and maps request paths to them."""
+
+    def __init__(self, root: str = FIXTURES_DIR, delay: float = 0.0):
+        self.delay = delay  # Added to every response, to mimic network latency
+        self.pages: Dict[str, bytes] = {}
+        for path in glob.glob(os.path.join(root, "*", "*.html")):
+            with open(path, "rb") as f:
+                self.pages[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+        self.list_pages = sorted(
+            int(m.group(1)) for m in (re.match(r"list/page-(\d+)\.html$", key) for key in self.pages) if m
+        )
+        if not self.list_pages:
+            raise RuntimeError(f"No fixtures in {root}; run `python -m benchmarks.fixtures generate`")
+
+    def resolve(self, raw_path: str) -> Optional[bytes]:
+        url = urlsplit(raw_path)
+        if url.path.startswith("/search-companies"):
+            page = int((parse_qs(url.query).get("page") or ["1"])[0])
+            if page >= LAST_PAGE:
+                return self.pages["list/last.html"]
+            # Other pages reuse the recorded ones in turn
+            return self.pages[f"list/page-{self.list_pages[(page - 1) % len(self.list_pages)]}.html"]
+
+        match = _DETAIL_RE.match(url.path)
+        if match:
+            slug = match.group(1)
+            page = self.pages.get(f"detail/{slug}.html")
+            if page is None:
+                page = self.pages.get(f"detail/{slug.split('-', 1)[0]}.html", self.pages.get("detail/typical.html"))
+            return page
+        return None
+
+
+def make_handler(site: FixtureSite):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as two writes on a keep-alive connection: with
+        # Nagle on, the body waits for the client's delayed ACK (~40ms per request)
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if site.delay:
+                time.sleep(site.delay)
+            if self.path.startswith("/logos/"):
+                self._send(404, b"")
+                return
+            body = site.resolve(self.path)
+            self._send(200 if body is not None else 404, body or b"Not found")
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start(port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """Starts the stand-in site on a background thread; port 0 picks a free one."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(FixtureSite(delay=delay)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fixture-site", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+    server = start(args.port, args.delay)
+    print(f"Serving fixtures on http://127.0.0.1:{server.server_port} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,64 +1,335 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import List, Optional
-from src.services.forge_global import ForgeGlobalService
-from src.models.schemas import UnifiedCompanyData, PaginatedResponse, CompanyDetail
-from src.config import SpeedProfile
+import io
+import csv
+import json
+from datetime import datetime, timezone
+from fastapi import APIRouter, Query, HTTPException, Header, Path
+from fastapi.responses import StreamingResponse, FileResponse, Response
+from typing import List, Literal, Optional, Tuple
+from src.services.forge_global import ForgeGlobalService, CatalogIncomplete
+from src.services.crawler import catalog_crawler
+from src.services.prefetch import prefetcher
+from src.services.catalog import catalog_index
+from src.services.jobs import job_manager
+from src.services.snapshot import snapshot_exporter
+from src.services.timeseries import price_history
+from src.services.changes import change_tracker
+from src.services import metrics
+from src.models.schemas import (
+    UnifiedCompanyData, ForgeCompanyData, PaginatedResponse, CompanyDetail, BatchDetailRequest, BatchDetailItem,
+    ScrapeJobRequest, ScrapeJob, SnapshotInfo, PricePoint, PriceHistorySeries, ChangeEvent,
+)
+from src.config import SpeedProfile, BATCH_MAX_SLUGS, HISTORY_MAX_POINTS
 
 router = APIRouter()
 service = ForgeGlobalService()
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list (or *)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def _cached_response(
+    validator: Optional[Tuple[str, int, int]], body: Optional[bytes], if_none_match: Optional[str]
+) -> Optional[Response]:
+    """
+    Response for a cached result: 304 when the client already has this version,
+    otherwise the pre-encoded JSON body as is (no model validation or encoding).
+    Both carry ETag and Cache-Control (max-age = seconds the cache entry stays
+    fresh, stale-while-revalidate = how long it may be served stale after that).
+    None when the result is not cached.
+    """
+    if validator is None or body is None:
+        return None
+    etag, fresh, stale = validator
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={fresh}, stale-while-revalidate={stale}"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/data/forge", response_model=PaginatedResponse)
 async def get_forge_data(
     sector: Optional[str] = Query(None, description="Sector to filter by (e.g., healthcare-biotech-pharma)"),
     valuation: Optional[str] = Query(None, description="Valuation filter (e.g., 500m)"),
     page: int = Query(1, ge=1, description="Page number"),
-    speed: SpeedProfile = Query(SpeedProfile.NORMAL, description="Scraping speed profile")
+    speed: SpeedProfile = Query(SpeedProfile.NORMAL, description="Scraping speed profile"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Scrape Forge Global data with specified filters and speed profile.
-    Returns paginated unified company data structure.
+    Returns paginated unified company data structure. Cached pages are served from
+    their stored JSON with an ETag (304 on If-None-Match) and a Cache-Control
+    based on their remaining TTL. The next page and the top companies are then
+    prefetched in the background.
     """
     try:
-        # Service returns List[UnifiedCompanyData]
+        prefetcher.record_request("list", service.list_cache_key(sector, valuation, page))
+        # Service returns List[UnifiedCompanyData]; pages past the known last page
+        # come back empty without any scrape
         data = await service.scrape(sector=sector, valuation=valuation, page_num=page, speed=speed)
-        
-        # Standard page size is 24 items per page on Forge
-        page_size = len(data)
-        
-        # If we get less than 24, assume we're on the last page
-        # Otherwise, estimate total (this is a limitation without scraping pagination info)
-        if page_size < 24:
-            # Last page - calculate total
-            total = (page - 1) * 24 + page_size
-            total_pages = page
-        else:
-            # Not last page - we'll use a conservative estimate
-            # Forge typically has ~5000+ companies, so we'll use 5237 as default
-            total = 5237  # This matches the user's example
-            total_pages = (total + 23) // 24  # Ceiling division
-        
-        return PaginatedResponse(
-            items=data,
-            total=total,
-            page=page,
-            size=page_size,
-            pages=total_pages
+        cached = _cached_response(
+            service.list_validator(sector, valuation, page),
+            service.encoded_list_page(sector, valuation, page),
+            if_none_match,
         )
+        prefetcher.after_list(sector, valuation, page, data)
+        if cached:
+            return cached
+        return service.build_page(data, sector, valuation, page)
     except Exception as e:
         # In production, log the error
         print(f"Error scraping: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/data/company/{slug}", response_model=CompanyDetail)
-async def get_company_detail(slug: str):
+async def get_company_detail(slug: str, if_none_match: Optional[str] = Header(None)):
     """
     Scrape detailed company information by slug (e.g., discord, spacex).
+    Sent with an ETag (304 on If-None-Match) and a Cache-Control like /data/forge.
     """
     try:
+        prefetcher.record_request("detail", slug)
         data = await service.scrape_company_detail(slug)
         if not data:
             raise HTTPException(status_code=404, detail="Company not found or scraping failed")
+        cached = _cached_response(service.detail_validator(slug), service.encoded_detail(slug), if_none_match)
+        if cached:
+            return cached
         return data
     except Exception as e:
         print(f"Error scraping detail: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/data/companies/batch")
+async def get_company_details_batch(request: BatchDetailRequest):
+    """
+    Fetch many companies in one request. Streams NDJSON, one BatchDetailItem per
+    slug as it finishes: cached companies immediately, misses with bounded parallelism.
+    """
+    async def stream():
+        async for slug, detail, error in service.iter_company_details(request.slugs):
+            if detail:
+                item = BatchDetailItem(slug=slug, status="ok", data=detail)
+            elif error:
+                item = BatchDetailItem(slug=slug, status="error", error=error)
+            else:
+                item = BatchDetailItem(slug=slug, status="not_found", error="Company not found or scraping failed")
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/data/jobs", response_model=ScrapeJob, status_code=202)
+async def submit_scrape_job(request: ScrapeJobRequest):
+    """
+    Queue a list or detail scrape and return its job id right away.
+    Follow it on /data/jobs/{job_id}/events or poll /data/jobs/{job_id}.
+    """
+    return job_manager.submit(request).info()
+
+@router.get("/data/jobs/{job_id}", response_model=ScrapeJob)
+async def get_scrape_job(job_id: str):
+    """
+    Job status, and its result once done. Finished jobs expire after JOB_RESULT_TTL.
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.info()
+
+@router.get("/data/jobs/{job_id}/events")
+async def stream_scrape_job(job_id: str, last_event_id: Optional[int] = Header(None)):
+    """
+    Server-Sent Events for a job: `queue` (position), `stage`, `rows` as they are
+    extracted, then `done` (the full job) or `failed`. Reconnects resume after Last-Event-ID.
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    async def stream():
+        after = last_event_id if last_event_id is not None else -1
+        async for message in job.stream(after):
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, event, data = message
+            yield f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/data/export")
+async def export_catalog(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+    sector: Optional[str] = Query(None, description="Sector to filter by (e.g., healthcare-biotech-pharma)"),
+    valuation: Optional[str] = Query(None, description="Valuation filter (e.g., 500m)"),
+    speed: SpeedProfile = Query(SpeedProfile.NORMAL, description="Scraping speed profile for pages not in cache")
+):
+    """
+    Stream every company for a filter as NDJSON (UnifiedCompanyData per line) or
+    CSV (ForgeCompanyData columns). Rows are written as each page arrives, so the
+    server never holds more than a couple of pages. A page that can't be fetched
+    fails the request (503) or, once streaming, aborts the transfer, so a partial
+    catalog never looks complete.
+    """
+    pages = service.iter_catalog(sector=sector, valuation=valuation, speed=speed)
+
+    # The first page is fetched before answering, so its failure is still a status code
+    try:
+        first = await anext(pages, None)
+    except CatalogIncomplete as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def all_rows():
+        if first is not None:
+            yield first
+            async for row in pages:
+                yield row
+
+    rows = all_rows()
+
+    async def ndjson():
+        async for row in rows:
+            yield row.model_dump_json() + "\n"
+
+    async def csv_rows():
+        columns = list(ForgeCompanyData.model_fields)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        async for row in rows:
+            writer.writerow(row.raw_data)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    filename = f"forge_{sector or 'all'}.{format}"
+    return StreamingResponse(
+        ndjson() if format == "ndjson" else csv_rows(),
+        media_type="application/x-ndjson" if format == "ndjson" else "text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/data/catalog", response_model=PaginatedResponse)
+async def query_catalog(
+    q: Optional[str] = Query(None, description="Company name prefix (matches the full name or any word)"),
+    sector: Optional[List[str]] = Query(None, description="Sector(s), e.g. 'Fintech' or 'enterprise-software'"),
+    subsector: Optional[List[str]] = Query(None, description="Subsector(s)"),
+    round: Optional[List[str]] = Query(None, description="Latest round(s), e.g. 'Series B'"),
+    sort: Optional[Literal["name", "valuation", "price", "price_per_share", "amount_raised"]] = Query(None, description="Sort column (default: name)"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort order"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(24, ge=1, le=5000, description="Page size")
+):
+    """
+    Search, filter and sort every company scraped so far, served from the
+    in-memory catalog index (no browser, no upstream request).
+    Values within one filter are OR'ed, different filters are AND'ed.
+    """
+    items, total = catalog_index.query(
+        q=q,
+        filters={"sector": sector, "subsector": subsector, "round": round},
+        sort=sort,
+        descending=order == "desc",
+        page=page,
+        size=size,
+    )
+    return PaginatedResponse(
+        items=items,
+        total=total,
+        page=page,
+        size=len(items),
+        pages=(total + size - 1) // size
+    )
+
+@router.get("/data/history", response_model=List[PriceHistorySeries])
+async def get_price_history(
+    slug: List[str] = Query(..., max_length=BATCH_MAX_SLUGS, description="Company slug(s), repeat for a whole page"),
+    days: float = Query(30, gt=0, le=3650, description="How far back to look"),
+    points: int = Query(24, ge=1, le=HISTORY_MAX_POINTS, description="Points per series")
+):
+    """
+    Forge Price and valuation history per company, downsampled to `points` evenly
+    spaced samples (last observation at or before each). Served from memory.
+    """
+    series = price_history.query(slug, days, points)
+    return [
+        PriceHistorySeries(
+            slug=s,
+            points=[PricePoint(t=datetime.fromtimestamp(t, tz=timezone.utc), price=price, valuation=valuation)
+                    for t, price, valuation in samples],
+        )
+        for s, samples in series.items()
+    ]
+
+@router.get("/data/changes", response_model=List[ChangeEvent])
+async def get_changes(
+    since: Optional[datetime] = Query(None, description="Only events after this time (ISO 8601, UTC if no offset)"),
+    limit: int = Query(100, ge=1, le=5000, description="Maximum number of events")
+):
+    """
+    Change feed, newest first: companies seen for the first time (`added`) and
+    companies whose price, round, valuation or amount raised moved (`changed`,
+    with old and new values) between two scrapes of their list row.
+    """
+    return change_tracker.feed(since, limit)
+
+def _require_snapshots():
+    if not snapshot_exporter.available:
+        raise HTTPException(status_code=503, detail="Snapshots need pyarrow (install the 'analytics' extra)")
+
+@router.post("/data/snapshots", response_model=SnapshotInfo)
+async def create_snapshot():
+    """
+    Write today's Parquet + Arrow snapshot of the catalog (`companies`) and of
+    every cached company's funding rounds (`funding_rounds`), with typed numeric columns.
+    """
+    _require_snapshots()
+    return await snapshot_exporter.write(catalog_index.rows(), service.cached_details())
+
+@router.get("/data/snapshots", response_model=List[str])
+async def list_snapshots():
+    """
+    Snapshot dates available on disk, newest first.
+    """
+    return snapshot_exporter.dates()
+
+@router.get("/data/snapshots/{date}/{table}")
+async def download_snapshot(
+    date: str = Path(..., pattern=r"^(latest|\d{4}-\d{2}-\d{2})$", description="YYYY-MM-DD or 'latest'"),
+    table: Literal["companies", "funding_rounds"] = Path(..., description="Table to download"),
+    format: Literal["arrow", "parquet"] = Query("arrow", description="Arrow IPC file or Parquet")
+):
+    """
+    Download one snapshot table. Arrow IPC files can be memory-mapped
+    (pyarrow.ipc.open_file / pandas.read_feather) without parsing.
+    """
+    _require_snapshots()
+    path = snapshot_exporter.path(date, table, format)
+    if not path:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    media_type = "application/vnd.apache.arrow.file" if format == "arrow" else "application/vnd.apache.parquet"
+    return FileResponse(path, media_type=media_type, filename=f"{table}.{format}")
+
+@router.get("/data/stats")
+async def get_stats():
+    """
+    Scrape pipeline diagnostics (caches, request coalescing, page pool, crawler, prefetch, jobs, price history).
+    """
+    return {**service.stats(), "crawler": catalog_crawler.stats(), "prefetch": prefetcher.stats(), "jobs": job_manager.stats(), "history": price_history.stats()}
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus metrics: per-stage latency histograms, cache and coalescing counters,
+    browser queue depth, in-flight scrapes, worker pool, rate controller and RSS.
+    """
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
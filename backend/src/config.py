@@ -1,3 +1,4 @@
+import os
 from enum import Enum
 
 class SpeedProfile(str, Enum):
@@ -5,12 +6,135 @@ class SpeedProfile(str, Enum):
     NORMAL = "normal"
     SLOW = "slow"
 
-SLEEP_CONFIG = {
-    SpeedProfile.FAST: (0.1, 0.5),
-    SpeedProfile.NORMAL: (0.5, 1.5),
-    SpeedProfile.SLOW: (1.5, 3.0),
+# Speed profiles cap the request rate to Forge (requests/second)
+SPEED_RATE_CAPS = {
+    SpeedProfile.FAST: 3.0,
+    SpeedProfile.NORMAL: 1.0,
+    SpeedProfile.SLOW: 0.4,
 }
 
+# Adaptive Rate Controller Config (token bucket, AIMD)
+RATE_INITIAL = 1.0  # Starting rate (requests/second)
+RATE_MIN = 0.05  # Floor after repeated back-offs
+RATE_MAX = 3.0  # Ceiling reached by additive increase
+RATE_BURST = 2  # Bucket size: requests allowed back-to-back
+RATE_INCREASE = 0.1  # Added per healthy response
+RATE_DECREASE = 0.5  # Multiplied on throttling, challenges and timeouts
+RATE_SLOW_LATENCY = 8.0  # Responses slower than this (seconds) ease the rate
+RATE_SLOW_FACTOR = 0.9  # Multiplied on a slow response
+RATE_COOLDOWN = 15  # Pause after throttling/challenge (seconds), doubles per repeat
+RATE_COOLDOWN_MAX = 300  # Longest pause
+RATE_MAX_WAIT = 20  # Longest a user request waits for its turn (seconds) before failing
+
+# Site to scrape; point it at a local stand-in (see benchmarks/) to run offline
+FORGE_BASE_URL = os.getenv("FORGE_BASE_URL", "https://forgeglobal.com").rstrip("/")
+
+# Forge shows 24 companies per search page
+PAGE_SIZE = 24
+
 # Concurrency & Caching Config
 MAX_CONCURRENCY = 1  # Strict limit for t3.micro (1GB RAM)
 CACHE_TTL = 3600  # 1 hour cache validation
+
+# HTTP Fast Path Config (list pages are server-rendered, no browser needed)
+HTTP_FAST_PATH = True
+HTTP_MAX_CONCURRENCY = 8  # Plain HTTP requests are cheap, no browser memory
+HTTP_TIMEOUT = 15.0  # Seconds
+HTTP_CHALLENGE_BACKOFF = 300  # After a 403/challenge page over HTTP, go straight to the browser for this long (seconds)
+
+# Browser Page Pool Config
+# Each slot is one pre-routed context + page. Raising it trades memory for parallelism.
+PAGE_POOL_SIZE = MAX_CONCURRENCY
+PAGE_MAX_USES = 50  # Recycle a page after this many leases
+PAGE_RECYCLE_RSS_MB = 600  # While the browser uses more than this, recycle the most used idle page per watchdog pass
+
+# Upstream JSON Capture (structured XHR/fetch payloads first, rendered DOM as fallback)
+# Off by default: the payload mapping (services/forge_json.py) is not yet checked
+# against recorded responses from the live site
+CAPTURE_JSON = os.getenv("CAPTURE_JSON", "false").lower() == "true"
+CAPTURE_GRACE = 1.5  # Seconds to keep waiting for JSON once the DOM is ready
+CAPTURE_MISS_LIMIT = 5  # Misses in a row after which a page kind stops waiting (still listens)
+CAPTURE_MAX_BYTES = 5 * 1024 * 1024  # Larger JSON bodies are not read
+
+# Memory Watchdog (BrowserManager samples browser and API process RSS)
+WATCHDOG_INTERVAL = 10  # Seconds between samples
+WATCHDOG_BROWSER_RSS_MB = 800  # Drain the page pool and restart the browser above this
+WATCHDOG_DRAIN_TIMEOUT = 30  # Seconds leased pages get to come back before the restart goes ahead
+WATCHDOG_GC_GROWTH_MB = 48  # Full gc.collect() once the API process grew this much since the last one
+WATCHDOG_GC_MIN_INTERVAL = 60  # ...but at most this often (seconds)
+
+# Browser Worker Pool (one Camoufox per worker process, fed from a local queue)
+# "off" keeps the single in-process browser, "auto" sizes the pool from available
+# RAM and CPUs, a number pins the worker count
+WORKER_POOL = os.getenv("WORKER_POOL", "off").lower()
+WORKER_MEMORY_MB = 450  # Budget per worker: Camoufox + one pooled page
+WORKER_RESERVED_MB = 350  # Kept for the API process and the OS when sizing
+WORKER_MAX = 16  # Upper bound for "auto"
+WORKER_TASK_TIMEOUT = 120  # Seconds before a stuck worker is killed and replaced
+WORKER_ACQUIRE_TIMEOUT = 60  # Seconds a task waits for an idle worker before failing
+WORKER_MAX_TASKS = 500  # Replace a worker after this many tasks (leak isolation)
+WORKER_RSS_LIMIT_MB = 700  # Replace a worker whose browser tree grew past this
+WORKER_RESTART_BACKOFF_MAX = 60  # Longest wait before respawning after repeated crashes
+
+# Response Compression (GZipMiddleware; SSE streams are left uncompressed)
+GZIP_MIN_SIZE = 1024  # Bytes; smaller bodies go out as is
+GZIP_LEVEL = 5  # Most of level 9's savings on JSON at a fraction of the CPU
+
+# Result Cache Bounds (LRU + TTL, see services/cache.py)
+CACHE_STALE_TTL = 6 * 3600  # Expired entries are still served (and refreshed) for this long
+LIST_CACHE_MAX_ENTRIES = 500
+LIST_CACHE_MAX_BYTES = 16 * 1024 * 1024
+DETAIL_CACHE_MAX_ENTRIES = 5000
+DETAIL_CACHE_MAX_BYTES = 48 * 1024 * 1024
+
+# Persistent Result Store (SQLite in WAL mode, see services/store.py)
+STORE_ENABLED = os.getenv("STORE_ENABLED", "true").lower() == "true"
+STORE_PATH = os.getenv("STORE_PATH", "data/forge.db")
+STORE_WARM_DETAILS = 2000  # Most recently scraped companies loaded back into memory on startup
+
+# Background Catalog Crawler (pre-warms list and detail caches)
+CRAWLER_ENABLED = os.getenv("CRAWLER_ENABLED", "false").lower() == "true"
+CRAWLER_BUDGET_PER_HOUR = int(os.getenv("CRAWLER_BUDGET_PER_HOUR", "600"))  # Actual scrapes, cache hits are free; 0 disables the crawler
+CRAWLER_BURST = 5  # Scrapes allowed back to back before the budget rate applies
+CRAWLER_INTERVAL = 1800  # Seconds between catalog passes
+CRAWLER_MAX_PAGES = 400  # Safety stop for the list walk
+CRAWLER_PAUSE_POLL = 1.0  # Seconds between checks while users are queued
+CRAWLER_MAX_FAILED_PAGES = 3  # List pages in a row that fail to fetch before a pass moves on to details
+CRAWLER_VIEWS_MAX = 2000  # Companies whose detail views are tracked to order the crawl
+CRAWLER_VIEWS_HALF_LIFE = 24 * 3600  # View counts halve this often (and when over the max), so old interest fades
+
+# Predictive Prefetch (next list page and top details after a list page is served)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_DETAILS = 3  # Detail pages prefetched from the top of each served list page
+PREFETCH_BUDGET_PER_MINUTE = int(os.getenv("PREFETCH_BUDGET_PER_MINUTE", "20"))  # Actual scrapes, cache hits are free
+PREFETCH_QUEUE_MAX = 50  # Predictions beyond this are dropped
+PREFETCH_MAX_AGE = 60  # Seconds a prediction may wait in the queue before it is no longer worth it
+PREFETCH_HIT_WINDOW = 600  # Seconds a prefetched page has to be requested to count as a hit
+PREFETCH_PAUSE_POLL = 0.5  # Seconds between checks while users are queued
+
+# Batch Detail Endpoint
+BATCH_MAX_SLUGS = 100
+BATCH_MAX_PARALLEL = PAGE_POOL_SIZE  # Misses scraped at once, one per pooled page (or per worker)
+
+# Async Scrape Jobs (submit, then follow progress over Server-Sent Events)
+JOB_RESULT_TTL = 900  # Seconds a finished job and its result stay retrievable
+JOB_MAX_RETAINED = 1000  # Oldest finished jobs are dropped beyond this
+JOB_HEARTBEAT = 15  # Seconds between SSE keep-alive comments while a job is quiet
+
+# Catalog Export (/data/export streams page by page)
+EXPORT_MAX_PAGES = 400  # Safety stop, well past the ~220 pages of the full catalog
+EXPORT_PAGE_ATTEMPTS = 3  # Tries per list page before an export is aborted as incomplete
+EXPORT_RETRY_DELAY = 5  # Seconds between those tries
+
+# Parquet/Arrow Snapshots (needs the optional "analytics" extra: pyarrow)
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "data/snapshots")
+
+# Price History (packed per-company time series behind /data/history)
+HISTORY_MIN_INTERVAL = 86400  # Unchanged values are recorded again at most once a day
+HISTORY_RETENTION_DAYS = 400
+HISTORY_FLUSH_INTERVAL = 300  # Seconds between writes of changed series to the result store
+HISTORY_MAX_POINTS = 500  # Per series per query
+
+# Incremental Refresh (list row fingerprints decide which details to rescrape)
+DETAIL_MAX_AGE = 7 * 86400  # Unchanged companies are still rescraped this often
+CHANGE_FEED_MAX = 5000  # Change events kept in memory and loaded on startup
@@ -1,18 +1,60 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routes import router
+from fastapi.middleware.gzip import GZipMiddleware
+import asyncio
+from src.api.routes import router, service
 
 from contextlib import asynccontextmanager
 from src.services.browser_manager import browser_manager
+from src.services.http_client import http_client_manager
+from src.services.store import result_store
+from src.services.crawler import catalog_crawler
+from src.services.prefetch import prefetcher
+from src.services.jobs import job_manager
+from src.services.timeseries import price_history
+from src.services.worker_pool import worker_pool
+from src.config import STORE_ENABLED, CRAWLER_ENABLED, PREFETCH_ENABLED, GZIP_MIN_SIZE, GZIP_LEVEL
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Initialize browser
     # Startup: Initialize browser
     # await browser_manager.start()  # Lazy load instead to save memory
+
+    # Startup: Watch browser and process memory (restarts the browser, runs GC on growth)
+    browser_manager.start_watchdog()
+
+    # Startup: Spawn browser worker processes (WORKER_POOL), each with its own browser
+    if worker_pool.enabled:
+        worker_pool.start()
+
+    # Startup: Load the hot set from the result store so restarts start warm
+    # (in the background, so the server accepts requests right away)
+    if STORE_ENABLED:
+        await result_store.open()
+        warm_task = asyncio.create_task(service.warm_from_store())
+        await price_history.start()
+
+    # Startup: Pre-warm every list and detail page in the background
+    if CRAWLER_ENABLED:
+        catalog_crawler.start()
+
+    # Startup: Prefetch the next list page and top companies after each list request
+    if PREFETCH_ENABLED:
+        prefetcher.start()
     yield
-    # Shutdown: Close browser
+    # Shutdown: Stop background work, close browser, HTTP client and result store
+    await catalog_crawler.stop()
+    await prefetcher.stop()
+    await job_manager.stop()
+    await worker_pool.stop()
+    await browser_manager.stop_watchdog()
     await browser_manager.stop()
+    await http_client_manager.stop()
+    if STORE_ENABLED:
+        warm_task.cancel()
+        await service.flush_writes()
+        await price_history.stop()
+        await result_store.close()
 
 app = FastAPI(
     title="Forage Scraper API",
@@ -30,6 +72,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON, NDJSON and CSV responses for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
 app.include_router(router)
 
 if __name__ == "__main__":
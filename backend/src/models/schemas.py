@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, Dict, Any, List, Literal, Union
 from datetime import datetime
+from src.config import BATCH_MAX_SLUGS, SpeedProfile
 
 class UnifiedCompanyData(BaseModel):
     name: str
@@ -21,6 +22,16 @@ class ForgeCompanyData(BaseModel):
     price_per_share: str
     amount_raised: str
     logo_url: Optional[str] = None  # Company logo URL
+    slug: Optional[str] = None  # Detail page slug, e.g. "spacex" for /spacex_stock/
+
+    # Typed values parsed once at ingestion (see services/normalize.py); None when not shown
+    price_usd: Optional[float] = None
+    change_usd: Optional[float] = None
+    change_pct: Optional[float] = None
+    last_matched_price_usd: Optional[float] = None
+    valuation_usd: Optional[float] = None
+    price_per_share_usd: Optional[float] = None
+    amount_raised_usd: Optional[float] = None
 
 class FundingRound(BaseModel):
     date: str
@@ -40,6 +51,12 @@ class FundingRound(BaseModel):
     participation_type: Optional[str] = None # Participating vs Non-participating
     participation_cap: Optional[str] = None
 
+    # Typed values parsed once at ingestion
+    date_iso: Optional[str] = None  # YYYY-MM-DD (month-only dates map to the 1st)
+    amount_raised_usd: Optional[float] = None
+    price_per_share_usd: Optional[float] = None
+    valuation_usd: Optional[float] = None
+
 class KeyPerson(BaseModel):
     name: str
     role: str # e.g. "CEO", "Founder", "Board Member"
@@ -65,6 +82,12 @@ class CompanyDetail(BaseModel):
     price_change: str
     price_change_pct: str
     valuation: str
+
+    # Typed market data parsed once at ingestion
+    price_usd: Optional[float] = None
+    change_usd: Optional[float] = None
+    change_pct: Optional[float] = None
+    valuation_usd: Optional[float] = None
     
     # Deep Data
     funding_history: List[FundingRound]
@@ -80,3 +103,65 @@ class PaginatedResponse(BaseModel):
     page: int
     size: int
     pages: int
+
+class BatchDetailRequest(BaseModel):
+    slugs: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_SLUGS)
+
+class BatchDetailItem(BaseModel):
+    # One NDJSON line per slug, streamed as each one finishes
+    slug: str
+    status: Literal["ok", "not_found", "error"]
+    data: Optional[CompanyDetail] = None
+    error: Optional[str] = None
+
+class ScrapeJobRequest(BaseModel):
+    # "list" takes the /data/forge filters, "detail" takes a slug
+    kind: Literal["list", "detail"]
+    sector: Optional[str] = None
+    valuation: Optional[str] = None
+    page: int = Field(1, ge=1)
+    speed: SpeedProfile = SpeedProfile.NORMAL
+    slug: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_slug(self):
+        if self.kind == "detail" and not self.slug:
+            raise ValueError("slug is required for detail jobs")
+        return self
+
+class ScrapeJob(BaseModel):
+    id: str
+    kind: Literal["list", "detail"]
+    status: Literal["queued", "running", "done", "failed"]
+    stage: str
+    position: Optional[int] = None  # Place in the browser queue while waiting
+    rows: int = 0  # Rows extracted so far
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    result: Optional[Union[PaginatedResponse, CompanyDetail]] = None
+    error: Optional[str] = None
+
+class SnapshotInfo(BaseModel):
+    date: str  # Partition written (YYYY-MM-DD, UTC)
+    tables: Dict[str, int]  # Table -> row count
+
+class PricePoint(BaseModel):
+    t: datetime
+    price: Optional[float] = None  # Forge Price (USD), None before the first observation
+    valuation: Optional[float] = None  # USD
+
+class PriceHistorySeries(BaseModel):
+    slug: str
+    points: List[PricePoint]
+
+class FieldChange(BaseModel):
+    old: str
+    new: str
+
+class ChangeEvent(BaseModel):
+    # One change feed entry: a company seen for the first time or whose list row moved
+    slug: str
+    name: str
+    kind: Literal["added", "changed"]
+    at: datetime
+    changes: Dict[str, FieldChange] = {}
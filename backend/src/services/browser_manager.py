@@ -1,10 +1,63 @@
+import gc
+import time
+import asyncio
+from contextlib import asynccontextmanager
 from camoufox.async_api import AsyncCamoufox
-from typing import Optional
+from typing import Optional, Set
+from src.config import (
+    PAGE_POOL_SIZE, PAGE_MAX_USES, PAGE_RECYCLE_RSS_MB, WATCHDOG_INTERVAL, WATCHDOG_BROWSER_RSS_MB,
+    WATCHDOG_DRAIN_TIMEOUT, WATCHDOG_GC_GROWTH_MB, WATCHDOG_GC_MIN_INTERVAL,
+)
+from src.services.memory import browser_rss_mb, process_rss_mb
+from src.services.metrics import timed
+
+# Block heavy resources to save memory
+async def _block_heavy_resources(route):
+    if route.request.resource_type in ["image", "media", "font", "stylesheet"]:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class PooledPage:
+    """A pre-routed context + page owned by the pool."""
+
+    def __init__(self, context, page, generation: int):
+        self.context = context
+        self.page = page
+        self.generation = generation
+        self.uses = 0
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception as e:
+            print(f"Error closing pooled context: {e}")
 
 class BrowserManager:
     _instance: Optional['BrowserManager'] = None
     _browser = None
 
+    # Page pool state. Slots from an older generation (before a restart) are discarded.
+    _idle: Optional[asyncio.Queue] = None
+    _slot_count = 0
+    _generation = 0
+    _recycled = 0
+    _leased = 0
+    _replacing: Set[asyncio.Task] = set()
+
+    # Memory watchdog state. While a restart drains the pool, new leases wait on _restarting.
+    _watchdog: Optional[asyncio.Task] = None
+    _restarting: Optional[asyncio.Event] = None
+    _restarts = 0
+    _restart_reclaimed_mb = 0.0
+    _last_restart_reason: Optional[str] = None
+    _gc_runs = 0
+    _gc_reclaimed_mb = 0.0
+    _gc_seconds = 0.0
+    _gc_baseline_mb: Optional[float] = None
+    _last_gc = 0.0
+    _browser_rss: Optional[float] = None  # Last sample, read instead of scanning /proc per call
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(BrowserManager, cls).__new__(cls)
@@ -31,17 +84,27 @@ class BrowserManager:
                 "--disable-sync"
             ]
             
-            self._camoufox = AsyncCamoufox(headless=True, args=browser_args)
-            self._browser = await self._camoufox.__aenter__()
+            with timed("browser_start"):
+                self._camoufox = AsyncCamoufox(headless=True, args=browser_args)
+                self._browser = await self._camoufox.__aenter__()
             print("Global browser started.")
+            await self._warm_pool()
 
     async def stop(self):
         """Closes the global browser instance."""
+        # Let page replacements finish against this browser before it goes
+        if self._replacing:
+            await asyncio.gather(*self._replacing, return_exceptions=True)
+        await self._drain_pool()
         if self._browser:
-            await self._browser.close()
+            try:
+                await self._browser.close()
+                if hasattr(self, '_camoufox'):
+                    await self._camoufox.__aexit__(None, None, None)
+            except Exception as e:
+                # A crashed browser can't be closed cleanly; drop it either way
+                print(f"Error closing browser: {e}")
             self._browser = None
-            if hasattr(self, '_camoufox'):
-                await self._camoufox.__aexit__(None, None, None)
             print("Global browser closed.")
 
     async def get_browser(self):
@@ -50,5 +113,274 @@ class BrowserManager:
             await self.start()
         return self._browser
 
+    @asynccontextmanager
+    async def lease_page(self):
+        """
+        Leases a warm, pre-routed page from the pool and returns it afterwards.
+        Pages are recycled after PAGE_MAX_USES leases, and the most used idle one
+        on each watchdog pass while the browser is over PAGE_RECYCLE_RSS_MB.
+        Callers must remove any listeners they add.
+        """
+        slot = await self._acquire_slot()
+        self._leased += 1
+        try:
+            yield slot.page
+        finally:
+            self._leased -= 1
+            await self._release_slot(slot)
+
+    def pool_stats(self) -> dict:
+        """Current pool occupancy for diagnostics."""
+        return {
+            "size": PAGE_POOL_SIZE,
+            "created": self._slot_count,
+            "idle": self._idle.qsize() if self._idle else 0,
+            "recycled": self._recycled,
+            "leased": self._leased,
+        }
+
+    def memory_counters(self) -> dict:
+        """Browser restarts and GC runs by the watchdog, and the memory they gave back."""
+        return {
+            "browser_restarts": self._restarts,
+            "restart_reclaimed_mb": self._restart_reclaimed_mb,
+            "gc_runs": self._gc_runs,
+            "gc_reclaimed_mb": self._gc_reclaimed_mb,
+            "gc_seconds": self._gc_seconds,
+        }
+
+    @property
+    def browser_rss(self) -> Optional[float]:
+        """Browser tree RSS in MB as of the last watchdog sample (None before the first)."""
+        return self._browser_rss
+
+    def memory_stats(self) -> dict:
+        """Current readings plus the watchdog counters, for diagnostics."""
+        browser_rss = self._browser_rss if self._browser is not None else None
+        process_rss = process_rss_mb()
+        return {
+            "browser_rss_mb": round(browser_rss, 1) if browser_rss is not None else None,
+            "process_rss_mb": round(process_rss, 1) if process_rss is not None else None,
+            **{key: round(value, 3) for key, value in self.memory_counters().items()},
+            "last_restart_reason": self._last_restart_reason,
+        }
+
+    def start_watchdog(self):
+        """Starts sampling memory every WATCHDOG_INTERVAL seconds (see _check_memory)."""
+        if self._watchdog is None:
+            self._watchdog = asyncio.create_task(self._watch())
+
+    async def stop_watchdog(self):
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            try:
+                await self._watchdog
+            except asyncio.CancelledError:
+                pass
+            self._watchdog = None
+
+    async def restart(self, reason: str):
+        """
+        Drains the page pool and restarts the browser. New leases wait until the
+        new browser is up; leased pages get WATCHDOG_DRAIN_TIMEOUT to come back
+        (any still out are closed when returned).
+        """
+        if self._browser is None or self._restarting is not None:
+            return
+        self._restarting = asyncio.Event()
+        try:
+            # 1. Let in-flight scrapes finish
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + WATCHDOG_DRAIN_TIMEOUT
+            while self._leased and loop.time() < deadline:
+                await asyncio.sleep(0.1)
+
+            # 2. Restart and measure what it gave back
+            before = await asyncio.to_thread(browser_rss_mb) or 0.0
+            print(f"Restarting browser: {reason} ({self._leased} page(s) still leased)")
+            await self.stop()
+            await self.start()
+            after = await asyncio.to_thread(browser_rss_mb) or 0.0
+            self._browser_rss = after
+            self._restarts += 1
+            self._restart_reclaimed_mb += max(0.0, before - after)
+            self._last_restart_reason = reason
+            print(f"Browser restarted, RSS {before:.0f} MB -> {after:.0f} MB.")
+        except Exception as e:
+            # The next lease starts the browser lazily
+            print(f"Error restarting browser: {e}")
+        finally:
+            restarting, self._restarting = self._restarting, None
+            restarting.set()
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(WATCHDOG_INTERVAL)
+            try:
+                await self._check_memory()
+            except Exception as e:
+                print(f"Memory watchdog error: {e}")
+
+    async def _check_memory(self):
+        """
+        One watchdog pass: samples the browser tree's RSS, restarts a browser that
+        crashed or outgrew WATCHDOG_BROWSER_RSS_MB, recycles the most used idle page
+        above PAGE_RECYCLE_RSS_MB, and runs a full gc.collect() once this process
+        grew WATCHDOG_GC_GROWTH_MB since the last one (at most every
+        WATCHDOG_GC_MIN_INTERVAL seconds) instead of after every scrape.
+        """
+        # 1. Browser
+        self._browser_rss = rss = await asyncio.to_thread(browser_rss_mb)
+        if self._browser is not None and self._restarting is None:
+            if not self._browser.is_connected():
+                await self.restart("browser disconnected")
+            elif rss is not None and rss > WATCHDOG_BROWSER_RSS_MB:
+                await self.restart(f"browser RSS {rss:.0f} MB over {WATCHDOG_BROWSER_RSS_MB} MB")
+            elif rss is not None and rss > PAGE_RECYCLE_RSS_MB:
+                self._recycle_most_used()
+
+        # 2. Python heap
+        rss = process_rss_mb()
+        if rss is None:
+            return
+        if self._gc_baseline_mb is None:
+            self._gc_baseline_mb = rss
+            return
+        now = time.monotonic()
+        if rss - self._gc_baseline_mb < WATCHDOG_GC_GROWTH_MB or now - self._last_gc < WATCHDOG_GC_MIN_INTERVAL:
+            return
+        started = time.perf_counter()
+        collected = gc.collect()
+        self._gc_seconds += time.perf_counter() - started
+        after = process_rss_mb() or rss
+        self._gc_runs += 1
+        self._gc_reclaimed_mb += max(0.0, rss - after)
+        # Freed memory often stays with the allocator, so grow from where we are now
+        self._gc_baseline_mb = after
+        self._last_gc = now
+        print(f"Memory watchdog: gc.collect() freed {collected} objects, process RSS {rss:.0f} MB -> {after:.0f} MB.")
+
+    async def _create_slot(self) -> PooledPage:
+        browser = await self.get_browser()
+        with timed("context_create"):
+            context = await browser.new_context()
+            page = await context.new_page()
+            await page.route("**/*", _block_heavy_resources)
+        return PooledPage(context, page, self._generation)
+
+    async def _warm_pool(self):
+        """Pre-creates every pool slot so the first requests skip context creation."""
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        while self._slot_count < PAGE_POOL_SIZE:
+            self._slot_count += 1
+            try:
+                self._idle.put_nowait(await self._create_slot())
+            except Exception as e:
+                self._slot_count -= 1
+                print(f"Error warming page pool: {e}")
+                break
+        print(f"Page pool warmed with {self._slot_count} page(s).")
+
+    async def _acquire_slot(self) -> PooledPage:
+        while True:
+            # Hold new leases while the watchdog restarts the browser
+            while self._restarting is not None:
+                await self._restarting.wait()
+            await self.get_browser()
+
+            if self._idle is None:
+                self._idle = asyncio.Queue()
+            idle = self._idle
+            try:
+                slot = idle.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._slot_count < PAGE_POOL_SIZE:
+                    self._slot_count += 1
+                    try:
+                        return await self._create_slot()
+                    except Exception:
+                        self._slot_count -= 1
+                        raise
+                slot = await idle.get()
+
+            # None marks room left behind by a slot that could not be replaced
+            if slot is None:
+                continue
+            if slot.generation != self._generation or slot.page.is_closed():
+                await slot.close()
+                continue
+            return slot
+
+    async def _release_slot(self, slot: PooledPage):
+        slot.uses += 1
+
+        # Slot belongs to a browser that has since been stopped
+        if slot.generation != self._generation or self._idle is None:
+            await slot.close()
+            return
+
+        if slot.uses < PAGE_MAX_USES and not slot.page.is_closed():
+            try:
+                # Drop the previous document so idle pages hold no DOM
+                await slot.page.goto("about:blank")
+                self._idle.put_nowait(slot)
+                return
+            except Exception as e:
+                print(f"Error resetting pooled page: {e}")
+
+        self._start_replace(slot)
+
+    def _start_replace(self, slot: PooledPage):
+        # Referenced until done, so the task can't be garbage collected mid-way
+        task = asyncio.create_task(self._replace_slot(slot))
+        self._replacing.add(task)
+        task.add_done_callback(self._replacing.discard)
+
+    def _recycle_most_used(self):
+        """Replaces the idle page with the most uses (one per watchdog pass)."""
+        if self._idle is None:
+            return
+        slots = []
+        while not self._idle.empty():
+            slots.append(self._idle.get_nowait())
+        worn = max((slot for slot in slots if slot is not None), key=lambda slot: slot.uses, default=None)
+        if worn is not None and worn.uses == 0:
+            worn = None
+        for slot in slots:
+            if slot is not worn:
+                self._idle.put_nowait(slot)
+        if worn is not None:
+            self._start_replace(worn)
+
+    async def _replace_slot(self, slot: PooledPage):
+        """Closes a worn-out slot and puts a fresh one in its place."""
+        self._recycled += 1
+        print(f"Recycling pooled page after {slot.uses} use(s).")
+        await slot.close()
+        if slot.generation != self._generation or self._idle is None:
+            return
+        try:
+            self._idle.put_nowait(await self._create_slot())
+        except Exception as e:
+            print(f"Error replacing pooled page: {e}")
+            self._slot_count -= 1
+            self._idle.put_nowait(None)
+
+    async def _drain_pool(self):
+        """Closes every idle slot. Leased slots are closed when they come back."""
+        self._generation += 1
+        idle, self._idle = self._idle, None
+        self._slot_count = 0
+        if idle is None:
+            return
+        while not idle.empty():
+            slot = idle.get_nowait()
+            if slot is not None:
+                await slot.close()
+        # Wake callers blocked on the old queue so they retry against the new pool
+        for _ in range(PAGE_POOL_SIZE):
+            idle.put_nowait(None)
+
 # Global instance
 browser_manager = BrowserManager()
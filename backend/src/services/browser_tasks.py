@@ -0,0 +1,294 @@
+import json
+import time
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from src.config import FORGE_BASE_URL, CAPTURE_JSON, CAPTURE_GRACE, CAPTURE_MISS_LIMIT, CAPTURE_MAX_BYTES
+from src.services.forge_json import map_detail, map_list
+from src.services.forge_parser import slug_from_href, is_challenge_page
+from src.services.metrics import timed
+
+# Reads the search-companies page in the browser: one {"logo_url", "href", "cells"}
+# per table row, plus the result count and page count shown on the page
+LIST_PAGE_JS = """() => {
+    const rows = Array.from(document.querySelectorAll('table tbody tr'));
+    const items = rows.map(row => {
+        const cells = Array.from(row.querySelectorAll('td'));
+        if (cells.length < 8) return null;
+        
+        // Extract logo safely
+        const img = row.querySelector('td:first-child img');
+        const logo = img ? img.src : null;
+        
+        // Detail page link (gives the slug)
+        const link = row.querySelector('a[href*="_stock"]');
+        
+        // Extract text content cleanly
+        const texts = cells.map(c => c.innerText);
+        
+        return {
+            logo_url: logo,
+            href: link ? link.getAttribute('href') : null,
+            cells: texts
+        };
+    }).filter(item => item !== null);
+
+    // "5,237 results" / "5,237 companies" from the results-count element only, and
+    // the highest ?page=N link (a lower bound, see forge_parser.parse_search_page)
+    let countMatch = null;
+    for (const el of document.querySelectorAll('[class*="results-count"], [class*="result-count"], [class*="resultsCount"]')) {
+        countMatch = (el.innerText || '').match(/^\\s*([\\d,]+)\\s+(?:results|companies)\\s*$/i);
+        if (countMatch) break;
+    }
+    let pages = null;
+    for (const a of document.querySelectorAll('a[href*="page="]')) {
+        const m = a.getAttribute('href').match(/[?&]page=(\\d+)/);
+        if (m) pages = Math.max(pages || 0, parseInt(m[1], 10));
+    }
+    return {
+        rows: items,
+        total: countMatch ? parseInt(countMatch[1].replace(/,/g, ''), 10) : null,
+        pages: pages
+    };
+}"""
+
+# Collects everything scrape_company_detail needs in one page.evaluate round trip.
+# Hidden tr.detail rows are read straight from the DOM (textContent), no clicking.
+DETAIL_SNAPSHOT_JS = """() => {
+    const text = el => el ? (el.innerText || el.textContent || '').trim() : '';
+    const raw = el => el ? (el.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+
+    // 1. Header (name + logo next to the h1)
+    const h1 = document.querySelector('h1');
+    const headerImg = h1 && h1.parentElement ? h1.parentElement.querySelector('img') : null;
+
+    // 2. Market data
+    let priceText = '', changeText = '';
+    for (const dg of document.querySelectorAll('.dg')) {
+        const label = dg.querySelector('.dl');
+        if (label && text(label).includes('Forge Price')) {
+            const value = dg.querySelector('.dv1');
+            priceText = text(value);
+            changeText = value ? text(value.querySelector('.positive, .negative')) : '';
+            break;
+        }
+    }
+    const valItem = Array.from(document.querySelectorAll('.fp-info-item'))
+        .find(el => raw(el).toLowerCase().includes('forge price valuation'));
+
+    // 3. Company facts (.col label/value pairs)
+    const facts = [];
+    for (const col of document.querySelectorAll('.col')) {
+        const label = col.querySelector('.label');
+        const value = col.querySelector('.value');
+        if (label && value) facts.push([text(label), text(value)]);
+    }
+
+    // 4. Funding rounds with their (hidden) detail rows
+    const rounds = Array.from(document.querySelectorAll('tr.overview')).map(row => {
+        const idx = row.getAttribute('data-index');
+        const detail = idx !== null ? document.querySelector(`tr.detail[data-index="${idx}"]`) : null;
+        const details = [];
+        if (detail) {
+            for (const div of detail.querySelectorAll('div')) {
+                const own = Array.from(div.childNodes).find(n => n.nodeType === 3 && n.textContent.trim());
+                if (!own) continue;
+                let sib = div.nextElementSibling;
+                while (sib && sib.tagName !== 'DIV') sib = sib.nextElementSibling;
+                if (sib) details.push([own.textContent.trim().toLowerCase(), raw(sib)]);
+            }
+        }
+        return {
+            cells: Array.from(row.querySelectorAll('td')).map(td => td.textContent),
+            details: details
+        };
+    });
+
+    const web = document.querySelector('.website-url a');
+    return {
+        name: text(h1),
+        logo_url: headerImg ? headerImg.getAttribute('src') : null,
+        price_text: priceText,
+        change_text: changeText,
+        valuation_text: valItem ? text(valItem.querySelector('.value')) : '',
+        facts: facts,
+        description: text(document.querySelector('.desc')),
+        website: web ? web.getAttribute('href') : null,
+        rounds: rounds
+    };
+}"""
+
+# Element that shows a page is rendered, and how long to wait for it
+READY_SELECTORS = {"list": ("table tbody tr", 10000), "detail": ("h1", 15000)}
+
+# Start of the rendered document, for is_challenge_page
+DOCUMENT_HEAD_JS = "() => document.documentElement.outerHTML.slice(0, 20000)"
+
+_SITE = (urlsplit(FORGE_BASE_URL).hostname or "").removeprefix("www.")
+
+# Per page kind, captures in a row that found no usable JSON (this process)
+_capture_misses = {"list": 0, "detail": 0}
+
+def new_outcome(error: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Result of one browser task: the navigation's HTTP status and latency (None if
+    it never completed), whether it timed out or landed on a challenge page, the
+    extracted data, where it came from ("json" or "dom") and any error.
+    """
+    return {
+        "status": None, "latency": None, "timeout": False, "challenge": False,
+        "data": None, "source": None, "error": error,
+    }
+
+class JsonCapture:
+    """
+    Collects the JSON bodies of the site's own XHR/fetch responses while a page
+    loads and maps them (see forge_json) as they arrive. `complete` is set once
+    they hold everything the page kind needs for the page at `url` (that company,
+    or that page of results).
+    """
+
+    def __init__(self, kind: str, url: str):
+        self.kind = kind
+        self.slug = slug_from_href(url)
+        self.page_num = int((parse_qs(urlsplit(url).query).get("page") or ["1"])[0])
+        self.payloads: List[Tuple[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.complete = asyncio.Event()
+        self.render_error: Optional[BaseException] = None  # Ready selector timed out
+
+    async def on_response(self, response):
+        if self.complete.is_set() or response.request.resource_type not in ("xhr", "fetch"):
+            return
+        host = urlsplit(response.url).hostname or ""
+        if host != _SITE and not host.endswith("." + _SITE):
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        try:
+            body = await response.body()
+            if len(body) > CAPTURE_MAX_BYTES:
+                return
+            self.payloads.append((response.url, json.loads(body)))
+        except Exception:
+            # Body gone (page navigated away) or not JSON after all
+            return
+        if self.kind == "list":
+            result = map_list(self.payloads, self.page_num)
+        else:
+            result = map_detail(self.payloads, self.slug)
+        if result["complete"]:
+            self.result = result
+            self.complete.set()
+
+    async def wait(self, page) -> Optional[Dict[str, Any]]:
+        """
+        Waits for complete JSON or the rendered page, whichever comes first. Once the
+        page is rendered, JSON still gets CAPTURE_GRACE seconds, unless this page kind
+        came up empty CAPTURE_MISS_LIMIT times in a row. Returns the mapped data or
+        None (fall back to the DOM, which has then rendered or hit render_error).
+        """
+        selector, timeout = READY_SELECTORS[self.kind]
+        captured = asyncio.create_task(self.complete.wait())
+        rendered = asyncio.create_task(page.wait_for_selector(selector, timeout=timeout))
+        try:
+            await asyncio.wait({captured, rendered}, return_when=asyncio.FIRST_COMPLETED)
+            if not captured.done() and _capture_misses[self.kind] < CAPTURE_MISS_LIMIT:
+                try:
+                    await asyncio.wait_for(asyncio.shield(captured), CAPTURE_GRACE)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in (captured, rendered):
+                task.cancel()
+            render_result = (await asyncio.gather(rendered, return_exceptions=True))[0]
+            if isinstance(render_result, Exception):
+                self.render_error = render_result
+
+        if self.result is None:
+            _capture_misses[self.kind] += 1
+            return None
+        _capture_misses[self.kind] = 0
+        return self.result
+
+async def run_page_task(page, kind: str, url: str, report: Callable[..., None]) -> Dict[str, Any]:
+    """
+    Navigates a leased page to `url` and extracts it. With CAPTURE_JSON, the site's
+    own JSON responses are mapped (see JsonCapture, forge_json) and navigation ends
+    as soon as they are complete; otherwise, or when they don't show up, the page
+    is read in one page.evaluate round trip: kind "list" returns LIST_PAGE_JS output,
+    "detail" DETAIL_SNAPSHOT_JS output. Runs in the API process or in a worker
+    process (see worker_pool), so it only takes and returns plain data. A bot
+    check page comes back as an error with "challenge" set. Progress goes to
+    report(stage, **data).
+    """
+    outcome = new_outcome()
+    capture = JsonCapture(kind, url) if CAPTURE_JSON else None
+    if capture:
+        page.on("response", capture.on_response)
+    try:
+        report("navigating", url=url)
+        started = time.monotonic()
+        try:
+            with timed("goto"):
+                # With capture, extraction starts as soon as the document response is in
+                response = await page.goto(
+                    url, wait_until="commit" if capture else "domcontentloaded", timeout=60000
+                )
+        except PlaywrightTimeoutError:
+            outcome["timeout"] = True
+            raise
+        outcome["latency"] = time.monotonic() - started
+        outcome["status"] = response.status if response else None
+
+        with timed("evaluate"):
+            if capture:
+                data = await capture.wait(page)
+                if data is not None:
+                    report("extracting")
+                    outcome["data"], outcome["source"] = data, "json"
+                    return outcome
+
+            outcome["source"] = "dom"
+            selector, timeout = READY_SELECTORS[kind]
+            if kind == "list":
+                # Wait for the table to render instead of a fixed sleep
+                # (a filter with no results never shows rows)
+                if not capture:
+                    try:
+                        await page.wait_for_selector(selector, timeout=timeout)
+                    except PlaywrightTimeoutError:
+                        pass
+
+                print("Extracting table data entries...")
+                report("extracting")
+                outcome["data"] = await page.evaluate(LIST_PAGE_JS)
+            else:
+                # Wait for main content (already awaited by the capture)
+                if capture and capture.render_error:
+                    raise capture.render_error
+                if not capture:
+                    await page.wait_for_selector(selector, timeout=timeout)
+
+                # One IPC round trip for header, market data, facts and all funding rounds
+                report("extracting")
+                outcome["data"] = await page.evaluate(DETAIL_SNAPSHOT_JS)
+    except Exception as e:
+        outcome["error"] = str(e)
+    finally:
+        # The page goes back to the pool; it must not keep feeding this capture
+        if capture:
+            page.remove_listener("response", capture.on_response)
+
+    # A bot check renders no table and no h1: its empty extraction is not data
+    if outcome["latency"] is not None and outcome["source"] != "json":
+        try:
+            head = await page.evaluate(DOCUMENT_HEAD_JS)
+        except Exception:
+            head = ""
+        if is_challenge_page(outcome["status"], head):
+            outcome["challenge"] = True
+            outcome["data"] = None
+            outcome["error"] = f"Challenge page (status {outcome['status']})"
+    return outcome
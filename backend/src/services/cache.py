@@ -0,0 +1,194 @@
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+class CacheEntry:
+    __slots__ = ("value", "stored_at", "size", "etag", "encoded")
+
+    def __init__(
+        self, value: Any, stored_at: float, size: int, etag: Optional[str] = None, encoded: Optional[bytes] = None
+    ):
+        self.value = value
+        self.stored_at = stored_at
+        self.size = size
+        self.etag = etag  # Content hash of the encoded value, None without `encode`
+        self.encoded = encoded  # encode(value), kept so hits can be served without re-encoding
+
+class TTLCache:
+    """
+    Bounded in-memory cache with LRU eviction, a TTL and stale-while-revalidate.
+
+    Entries younger than `ttl` are fresh. Entries between `ttl` and `ttl + stale_ttl`
+    are served immediately while a single background refresh runs. Older entries
+    are dropped. The cache is bounded by entry count and by approximate bytes:
+    the length of `encode(value)`. The encoded bytes are kept with the entry
+    (e.g. a ready-made JSON response body) and hashed into its ETag.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_ttl: float = 0,
+        max_entries: int = 1000,
+        max_bytes: int = 0,
+        encode: Optional[Callable[[Any], bytes]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # 0 disables the byte bound
+        self._encode = encode
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+        # Counters for diagnostics
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.peek(key) is not None
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Returns the entry (fresh or stale) without touching LRU order or counters."""
+        entry = self._entries.get(key)
+        if entry is None or self.age(entry) >= self.ttl + self.stale_ttl:
+            return None
+        return entry
+
+    def age(self, entry: CacheEntry) -> float:
+        return time.time() - entry.stored_at
+
+    def remaining(self, entry: CacheEntry) -> Tuple[int, int]:
+        """Seconds the entry stays fresh, then how long after that it may be served stale."""
+        age = self.age(entry)
+        fresh = max(0, int(self.ttl - age))
+        stale = max(0, int(self.ttl + self.stale_ttl - max(age, self.ttl)))
+        return fresh, stale
+
+    def is_fresh(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and self.age(entry) < self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns a fresh value or None. Stale entries count as misses here."""
+        entry = self._lookup(key)
+        if entry is None or self.age(entry) >= self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """Stores a value. `stored_at` lets persisted entries keep their original scrape time."""
+        previous = self._entries.get(key)
+        if previous is not None and previous.value is value:
+            # Same object stored again (revalidated): keep its encoding
+            encoded, etag = previous.encoded, previous.etag
+        elif self._encode is not None:
+            encoded = self._encode(value)
+            etag = hashlib.blake2b(encoded, digest_size=12).hexdigest()
+        else:
+            encoded, etag = None, None
+        self._remove(key)
+        entry = CacheEntry(value, stored_at or time.time(), len(encoded) if encoded else 0, etag, encoded)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._evict()
+
+    def items(self) -> List[Tuple[str, Any, float]]:
+        """(key, value, stored_at) for every live entry, oldest first. Does not touch LRU order."""
+        limit = self.ttl + self.stale_ttl
+        now = time.time()
+        return [
+            (key, entry.value, entry.stored_at)
+            for key, entry in self._entries.items()
+            if now - entry.stored_at < limit
+        ]
+
+    def delete(self, key: str):
+        self._remove(key)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Serves from cache when possible. A stale entry is returned at once and
+        refreshed in the background; a miss awaits `loader`. Empty results are not cached.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            if self.age(entry) < self.ttl:
+                self.hits += 1
+                print(f"CACHE HIT for {self.name}: {key}")
+                return entry.value
+
+            self.stale_hits += 1
+            print(f"STALE HIT for {self.name}: {key}, refreshing in background")
+            self._refresh_in_background(key, loader)
+            return entry.value
+
+        self.misses += 1
+        value = await loader()
+        if value:
+            self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                value = await loader()
+                if value:
+                    self.set(key, value)
+            except Exception as e:
+                print(f"Background refresh failed for {self.name}: {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.age(entry) >= self.ttl + self.stale_ttl:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refreshing": len(self._refreshing),
+        }
@@ -0,0 +1,191 @@
+from bisect import bisect_left, insort
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from src.models.schemas import UnifiedCompanyData
+from src.services.forge_parser import slugify
+
+# Sortable numeric columns -> typed raw_data field (filled at ingestion, see normalize.py)
+NUMERIC_COLUMNS: Dict[str, str] = {
+    "valuation": "valuation_usd",
+    "price": "price_usd",
+    "price_per_share": "price_per_share_usd",
+    "amount_raised": "amount_raised_usd",
+}
+
+# Filterable columns -> raw_data field (matched on slugified value, so
+# "Enterprise Software" and "enterprise-software" both match)
+FILTER_COLUMNS: Dict[str, str] = {
+    "sector": "sector",
+    "subsector": "subsector",
+    "round": "round",
+}
+
+class CatalogIndex:
+    """
+    In-memory index over every scraped list row, keyed by company slug.
+
+    - Secondary indexes (value -> slugs) for sector, subsector and round
+    - Sorted (value, slug) lists for each numeric column
+    - Sorted name tokens for prefix search
+    Queries never touch the browser.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, UnifiedCompanyData] = {}
+        self._filters: Dict[str, Dict[str, Set[str]]] = {col: {} for col in FILTER_COLUMNS}
+        self._numeric: Dict[str, List[Tuple[float, str]]] = {col: [] for col in NUMERIC_COLUMNS}
+        self._values: Dict[str, Dict[str, float]] = {col: {} for col in NUMERIC_COLUMNS}
+        self._tokens: List[Tuple[str, str]] = []
+        self._by_name: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def upsert_rows(self, rows: Iterable[UnifiedCompanyData]):
+        for row in rows:
+            slug = row.raw_data.get("slug") or slugify(row.name)
+            if slug in self._rows:
+                self._remove(slug)
+            self._add(slug, row)
+
+    def get(self, slug: str) -> Optional[UnifiedCompanyData]:
+        return self._rows.get(slug)
+
+    def slugs(self) -> List[str]:
+        return list(self._rows)
+
+    def rows(self) -> List[UnifiedCompanyData]:
+        return list(self._rows.values())
+
+    def _add(self, slug: str, row: UnifiedCompanyData):
+        raw = row.raw_data
+        self._rows[slug] = row
+
+        for col, field in FILTER_COLUMNS.items():
+            value = slugify(raw.get(field) or "")
+            if value:
+                self._filters[col].setdefault(value, set()).add(slug)
+
+        for col, typed in NUMERIC_COLUMNS.items():
+            value = raw.get(typed)
+            if value is not None:
+                self._values[col][slug] = value
+                insort(self._numeric[col], (value, slug))
+
+        name = row.name.lower()
+        insort(self._by_name, (name, slug))
+        for token in set(name.split()) | {name}:
+            insort(self._tokens, (token, slug))
+
+    def _remove(self, slug: str):
+        row = self._rows.pop(slug)
+        raw = row.raw_data
+
+        for col, field in FILTER_COLUMNS.items():
+            value = slugify(raw.get(field) or "")
+            slugs = self._filters[col].get(value)
+            if slugs is not None:
+                slugs.discard(slug)
+                if not slugs:
+                    del self._filters[col][value]
+
+        for col in NUMERIC_COLUMNS:
+            value = self._values[col].pop(slug, None)
+            if value is not None:
+                _discard_sorted(self._numeric[col], (value, slug))
+
+        name = row.name.lower()
+        _discard_sorted(self._by_name, (name, slug))
+        for token in set(name.split()) | {name}:
+            _discard_sorted(self._tokens, (token, slug))
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        """Slugs whose full name or any name word starts with `prefix`."""
+        prefix = prefix.lower().strip()
+        matches: Set[str] = set()
+        i = bisect_left(self._tokens, (prefix, ""))
+        while i < len(self._tokens) and self._tokens[i][0].startswith(prefix):
+            matches.add(self._tokens[i][1])
+            i += 1
+        return matches
+
+    def query(
+        self,
+        q: Optional[str] = None,
+        filters: Optional[Dict[str, List[str]]] = None,
+        sort: Optional[str] = None,
+        descending: bool = False,
+        page: int = 1,
+        size: int = 24,
+    ) -> Tuple[List[UnifiedCompanyData], int]:
+        """
+        Returns (rows for the requested page, total matching rows).
+        Values within one filter are OR'ed, different filters are AND'ed.
+        """
+        candidates: Optional[Set[str]] = None
+
+        def narrow(matches: Set[str]):
+            nonlocal candidates
+            candidates = matches if candidates is None else candidates & matches
+
+        # Smallest sets first keeps the intersections cheap
+        sets: List[Set[str]] = []
+        for col, values in (filters or {}).items():
+            if col not in self._filters or not values:
+                continue
+            union: Set[str] = set()
+            for value in values:
+                union |= self._filters[col].get(slugify(value), set())
+            sets.append(union)
+        if q:
+            sets.append(self._prefix_matches(q))
+        for matches in sorted(sets, key=len):
+            narrow(matches)
+
+        total = len(self._rows) if candidates is None else len(candidates)
+        start, stop = (page - 1) * size, page * size
+        if start >= total:
+            return [], total
+
+        # Few matches: sorting them directly beats scanning a full sorted column
+        if candidates is not None and len(candidates) * 8 < len(self._rows):
+            # Same order as the scan below: ties by slug, rows without a value last by name
+            by_name = lambda s: (self._rows[s].name.lower(), s)
+            if sort in NUMERIC_COLUMNS:
+                values = self._values[sort]
+                present = sorted((s for s in candidates if s in values), key=lambda s: (values[s], s), reverse=descending)
+                ordered_slugs = present + sorted((s for s in candidates if s not in values), key=by_name)
+            else:
+                ordered_slugs = sorted(candidates, key=by_name, reverse=descending)
+            return [self._rows[s] for s in ordered_slugs[start:stop]], total
+
+        accept: Callable[[str], bool] = (lambda slug: True) if candidates is None else candidates.__contains__
+        if sort in NUMERIC_COLUMNS:
+            ordered = self._numeric[sort]
+            slugs = (slug for _, slug in (reversed(ordered) if descending else ordered))
+            # Rows without a numeric value go last, by name
+            missing = (slug for _, slug in self._by_name if slug not in self._values[sort])
+            stream = chain(slugs, missing)
+        else:
+            ordered = self._by_name
+            stream = (slug for _, slug in (reversed(ordered) if descending else ordered))
+
+        page_rows: List[UnifiedCompanyData] = []
+        seen = 0
+        for slug in stream:
+            if not accept(slug):
+                continue
+            if seen >= start:
+                page_rows.append(self._rows[slug])
+                if seen + 1 >= stop:
+                    break
+            seen += 1
+        return page_rows, total
+
+def _discard_sorted(items: list, item: tuple):
+    i = bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
+
+# Global instance
+catalog_index = CatalogIndex()
@@ -0,0 +1,134 @@
+import json
+import time
+import hashlib
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from src.config import CHANGE_FEED_MAX
+from src.models.schemas import UnifiedCompanyData, ChangeEvent, FieldChange
+
+# List row fields that matter for the detail page; a change in any of them
+# means the company's detail (funding history, valuation) needs a rescrape
+FINGERPRINT_FIELDS = ("forge_price", "round", "post_money_valuation", "amount_raised")
+
+# The fingerprint is taken from the typed values where there are some, so the same
+# numbers shown differently ("$180B" in the table, 180000000000 in JSON) don't count
+# as a move: (typed field, format) per fingerprint field. Valuations and raises are
+# shown rounded, so only their first 3 significant digits count.
+TYPED_FIELDS = (("price_usd", "{:.2f}"), None, ("valuation_usd", "{:.3g}"), ("amount_raised_usd", "{:.3g}"))
+
+def row_fields(row: UnifiedCompanyData) -> Tuple[str, ...]:
+    return tuple((row.raw_data.get(field) or "").strip() for field in FINGERPRINT_FIELDS)
+
+def fingerprint(row: UnifiedCompanyData, fields: Tuple[str, ...]) -> str:
+    values = []
+    for display, typed in zip(fields, TYPED_FIELDS):
+        value = row.raw_data.get(typed[0]) if typed else None
+        values.append(typed[1].format(value) if value is not None else " ".join(display.lower().split()))
+    return hashlib.blake2b("\x1f".join(values).encode(), digest_size=8).hexdigest()
+
+class RowState:
+    __slots__ = ("fingerprint", "fields", "changed_at", "seen_at")
+
+    def __init__(self, fingerprint: str, fields: Tuple[str, ...], changed_at: float, seen_at: float):
+        self.fingerprint = fingerprint
+        self.fields = fields
+        self.changed_at = changed_at  # When the fingerprint last moved (or was first seen)
+        self.seen_at = seen_at  # Last scrape of the row
+
+class ChangeTracker:
+    """
+    Remembers a fingerprint of every company's list row and compares it with each
+    new scrape of that row. Moves are recorded in a bounded change feed and decide
+    whether a cached company detail can be revalidated instead of rescraped.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, RowState] = {}
+        self._feed: Deque[ChangeEvent] = deque(maxlen=CHANGE_FEED_MAX)
+
+        # Diagnostics
+        self.observed = 0
+        self.changed = 0
+        self.added = 0
+
+    def observe_rows(self, rows: Iterable[UnifiedCompanyData], now: Optional[float] = None) -> List[ChangeEvent]:
+        """Compares freshly scraped rows with the last seen ones; returns new feed events."""
+        now = now or time.time()
+        at = datetime.fromtimestamp(now, tz=timezone.utc)
+        events = []
+        for row in rows:
+            slug = row.raw_data.get("slug")
+            if not slug:
+                continue
+            self.observed += 1
+            fields = row_fields(row)
+            fp = fingerprint(row, fields)
+            state = self._rows.get(slug)
+            if state is None:
+                # First sighting says nothing about when the company last moved: it may
+                # have moved right before, so it never confirms an older detail
+                self._rows[slug] = RowState(fp, fields, now, now)
+                self.added += 1
+                events.append(ChangeEvent(slug=slug, name=row.name, kind="added", at=at))
+            elif state.fingerprint != fp:
+                changes = {
+                    field: FieldChange(old=old, new=new)
+                    for field, old, new in zip(FINGERPRINT_FIELDS, state.fields, fields)
+                    if old != new
+                }
+                self._rows[slug] = RowState(fp, fields, now, now)
+                self.changed += 1
+                events.append(ChangeEvent(slug=slug, name=row.name, kind="changed", at=at, changes=changes))
+            else:
+                state.seen_at = now
+        self._feed.extend(events)
+        return events
+
+    def confirms(self, slug: str, scraped_at: float, validated_at: float) -> bool:
+        """
+        True when the company's list row has been scraped again since `validated_at`
+        and has not changed since the detail was scraped at `scraped_at`.
+        """
+        state = self._rows.get(slug)
+        return state is not None and state.seen_at > validated_at and state.changed_at < scraped_at
+
+    def feed(self, since: Optional[datetime] = None, limit: int = 100) -> List[ChangeEvent]:
+        """Feed events newer than `since`, newest first."""
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        events = []
+        for event in reversed(self._feed):
+            if since is not None and event.at <= since:
+                break
+            events.append(event)
+            if len(events) >= limit:
+                break
+        return events
+
+    def rows_state(self, slugs: Iterable[str]) -> List[Tuple[str, str, str, float, float]]:
+        """(slug, fingerprint, fields JSON, changed_at, seen_at) for persisting."""
+        return [
+            (slug, state.fingerprint, json.dumps(state.fields), state.changed_at, state.seen_at)
+            for slug in slugs
+            if (state := self._rows.get(slug)) is not None
+        ]
+
+    def load(self, rows: List[Tuple[str, str, str, float, float]], events: List[ChangeEvent]):
+        """Restores persisted fingerprints and feed events (oldest first)."""
+        for slug, fp, fields, changed_at, seen_at in rows:
+            self._rows.setdefault(slug, RowState(fp, tuple(json.loads(fields)), changed_at, seen_at))
+        room = self._feed.maxlen - len(self._feed)
+        self._feed.extendleft(reversed(events[-room:] if room else []))
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._rows),
+            "observed": self.observed,
+            "changed": self.changed,
+            "added": self.added,
+            "feed": len(self._feed),
+        }
+
+# Global instance
+change_tracker = ChangeTracker()
@@ -0,0 +1,156 @@
+import time
+import asyncio
+from typing import Dict, List, Optional
+from src.config import (
+    CRAWLER_BUDGET_PER_HOUR, CRAWLER_BURST, CRAWLER_INTERVAL,
+    CRAWLER_MAX_PAGES, CRAWLER_PAUSE_POLL, CRAWLER_MAX_FAILED_PAGES, SpeedProfile,
+)
+from src.services.forge_global import ForgeGlobalService, background_scrape
+
+class CatalogCrawler:
+    """
+    Background task that walks every search-companies page and then the detail
+    page of each discovered company, so user requests are served from cache.
+
+    - Only real scrapes (cache misses) spend the hourly request budget.
+    - Detail pages are visited most-viewed first, then in catalog order.
+    - Work pauses whenever a user request is queued for the browser.
+    """
+
+    def __init__(self):
+        self.service = ForgeGlobalService()
+        self._task: Optional[asyncio.Task] = None
+
+        # Token bucket for the request budget
+        self._tokens = float(CRAWLER_BURST)
+        self._last_refill = time.monotonic()
+
+        # Slugs in catalog order, as discovered on list pages
+        self._slugs: Dict[str, None] = {}
+
+        # Diagnostics
+        self.passes = 0
+        self.list_scrapes = 0
+        self.list_failures = 0
+        self.detail_scrapes = 0
+        self.detail_revalidations = 0
+        self.pauses = 0
+        self.state = "idle"
+        self._phase = "idle"
+
+    def start(self):
+        if CRAWLER_BUDGET_PER_HOUR <= 0:
+            print("Catalog crawler disabled: CRAWLER_BUDGET_PER_HOUR is 0.")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print("Catalog crawler started.")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            print("Catalog crawler stopped.")
+
+    async def _run(self):
+        # Everything scraped from this task yields to interactive traffic
+        background_scrape.set(True)
+        while True:
+            try:
+                await self.crawl_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Catalog crawl error: {e}")
+            self._phase = self.state = "sleeping"
+            await asyncio.sleep(CRAWLER_INTERVAL)
+
+    async def crawl_once(self):
+        """One full pass: every list page, then every known detail page."""
+        self._phase = self.state = "lists"
+        failed = 0
+        for page_num in range(1, CRAWLER_MAX_PAGES + 1):
+            if not self.service.is_list_fresh(None, None, page_num):
+                await self._wait_turn()
+                self.list_scrapes += 1
+            # Walks until a fetch shows the end (page counts shown on the site are not trusted)
+            rows = await self.service.scrape(page_num=page_num, speed=SpeedProfile.NORMAL)
+            if not rows:
+                if self.service.list_end_confirmed(None, None, page_num):
+                    break
+                # Failed or rate limited: skip it, unless the site keeps failing
+                self.list_failures += 1
+                failed += 1
+                if failed >= CRAWLER_MAX_FAILED_PAGES:
+                    print(f"Catalog crawl: {failed} list pages in a row failed, moving on to details.")
+                    break
+                continue
+            failed = 0
+            for row in rows:
+                slug = row.raw_data.get("slug")
+                if slug:
+                    self._slugs.setdefault(slug, None)
+
+        self._phase = self.state = "details"
+        for slug in self._detail_order():
+            if self.service.is_detail_fresh(slug):
+                continue
+            # Unchanged since its last scrape: confirm the cached detail instead
+            if self.service.revalidate_detail(slug):
+                self.detail_revalidations += 1
+                continue
+            await self._wait_turn()
+            self.detail_scrapes += 1
+            await self.service.scrape_company_detail(slug)
+
+        self.passes += 1
+        print(f"Catalog crawl pass {self.passes} done: {len(self._slugs)} companies known.")
+
+    def _detail_order(self) -> List[str]:
+        """Most viewed first, then the rest in catalog order."""
+        ordered = dict.fromkeys(self.service.most_viewed())
+        ordered.update(self._slugs)
+        return list(ordered)
+
+    async def _wait_turn(self):
+        """Blocks until users aren't queued for the browser and the budget allows a scrape."""
+        paused = False
+        while self.service.interactive_waiting() > 0:
+            if not paused:
+                paused = True
+                self.pauses += 1
+                self.state = "paused"
+            await asyncio.sleep(CRAWLER_PAUSE_POLL)
+
+        rate = CRAWLER_BUDGET_PER_HOUR / 3600
+        while True:
+            now = time.monotonic()
+            self._tokens = min(CRAWLER_BURST, self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.state = self._phase
+                return
+            self.state = "throttled"
+            await asyncio.sleep((1 - self._tokens) / rate)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "state": self.state,
+            "passes": self.passes,
+            "known_companies": len(self._slugs),
+            "list_scrapes": self.list_scrapes,
+            "list_failures": self.list_failures,
+            "detail_scrapes": self.detail_scrapes,
+            "detail_revalidations": self.detail_revalidations,
+            "pauses": self.pauses,
+            "budget_per_hour": CRAWLER_BUDGET_PER_HOUR,
+        }
+
+# Global instance
+catalog_crawler = CatalogCrawler()
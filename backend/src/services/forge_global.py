@@ -1,29 +1,172 @@
+import re
 import time
+from datetime import datetime, timezone
 import asyncio
-import random
-from typing import List, Dict, Optional
+import contextvars
+import httpx
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Any, Callable, Tuple, AsyncIterator
 from src.services.base import ScraperService
-from src.config import SpeedProfile, SLEEP_CONFIG
-from src.models.schemas import UnifiedCompanyData, ForgeCompanyData, CompanyDetail
-import gc
+from src.config import (
+    SpeedProfile, FORGE_BASE_URL, HTTP_FAST_PATH, HTTP_MAX_CONCURRENCY, HTTP_CHALLENGE_BACKOFF,
+    CACHE_TTL, CACHE_STALE_TTL, LIST_CACHE_MAX_ENTRIES, LIST_CACHE_MAX_BYTES,
+    DETAIL_CACHE_MAX_ENTRIES, DETAIL_CACHE_MAX_BYTES, STORE_WARM_DETAILS, PAGE_SIZE,
+    BATCH_MAX_PARALLEL, EXPORT_MAX_PAGES, EXPORT_PAGE_ATTEMPTS, EXPORT_RETRY_DELAY, DETAIL_MAX_AGE, CHANGE_FEED_MAX, RATE_MAX_WAIT,
+    CRAWLER_VIEWS_MAX, CRAWLER_VIEWS_HALF_LIFE,
+)
+from src.models.schemas import UnifiedCompanyData, ForgeCompanyData, CompanyDetail, FundingRound, PaginatedResponse
 from src.services.browser_manager import browser_manager
+from src.services.http_client import http_client_manager
+from src.services.forge_parser import parse_search_page, is_challenge_page, slug_from_href, slugify
+from src.services.singleflight import SingleFlight, Flight, current_flight
+from src.services.cache import TTLCache, CacheEntry
+from src.services.store import result_store
+from src.services.catalog import catalog_index
+from src.services.normalize import normalize_companies, normalize_detail
+from src.services.timeseries import price_history
+from src.services.changes import change_tracker
+from src.services.rate_controller import rate_controller, RateLimitExceeded
+from src.services.browser_tasks import run_page_task
+from src.services.worker_pool import worker_pool
+from src.services.metrics import timed, observe_stage, SCRAPES, EXTRACTIONS
+
+# Set by background jobs (crawler) so their scrapes yield to interactive traffic
+background_scrape = contextvars.ContextVar("background_scrape", default=False)
+
+# Set by scrape jobs to receive progress: called as reporter(stage, data)
+scrape_progress = contextvars.ContextVar("scrape_progress", default=None)
+
+def _reporters(flight: Optional[Flight]) -> List[Callable[[str, Dict[str, Any]], None]]:
+    """Progress reporters of everyone waiting on a scrape (all callers of its flight)."""
+    reporters = flight.values(scrape_progress) if flight else [scrape_progress.get()]
+    return [reporter for reporter in reporters if reporter is not None]
+
+class CatalogIncomplete(Exception):
+    """A list page could not be fetched, so the rows yielded so far are not the whole catalog."""
+
+def _rate_wait() -> Optional[float]:
+    """How long the current scrape may wait for a rate token: background work waits as long as needed."""
+    flight = current_flight.get()
+    background = all(flight.values(background_scrape)) if flight else background_scrape.get()
+    return None if background else RATE_MAX_WAIT
+
+def report_progress(stage: str, **data):
+    """Forwards a progress event to every job waiting on the current scrape, if any."""
+    for reporter in _reporters(current_flight.get()):
+        reporter(stage, data)
+
+class _SlotWaiter:
+    """
+    A scrape queued for a browser slot. Who it is for is read from its flight at
+    any time, so a user joining a background scrape already in the queue makes it
+    interactive and gets its queue position.
+    """
+    __slots__ = ("flight", "background", "reporter")
+
+    def __init__(self):
+        # Outside a flight (not coalesced), the current caller is the only one
+        self.flight = current_flight.get()
+        self.background = background_scrape.get()
+        self.reporter = scrape_progress.get()
+
+    def is_background(self) -> bool:
+        if self.flight is None:
+            return self.background
+        return all(self.flight.values(background_scrape))
+
+    def report(self, stage: str, data: Dict[str, Any]):
+        reporters = _reporters(self.flight) if self.flight else [self.reporter] if self.reporter else []
+        for reporter in reporters:
+            reporter(stage, data)
+
+class _ViewCounts:
+    """
+    Detail views per company, halved every CRAWLER_VIEWS_HALF_LIFE seconds and
+    whenever more than CRAWLER_VIEWS_MAX companies are tracked (single views drop
+    out), so it stays bounded and follows current interest.
+    """
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._decayed_at = time.monotonic()
+
+    def add(self, slug: str):
+        if time.monotonic() - self._decayed_at >= CRAWLER_VIEWS_HALF_LIFE:
+            self._decay()
+        self._counts[slug] += 1
+        if len(self._counts) > CRAWLER_VIEWS_MAX:
+            self._decay()
+
+    def most_common(self, limit: Optional[int] = None) -> List[str]:
+        return [slug for slug, _ in self._counts.most_common(limit)]
+
+    def _decay(self):
+        self._counts = Counter({slug: count // 2 for slug, count in self._counts.items() if count > 1})
+        self._decayed_at = time.monotonic()
 
 class ForgeGlobalService(ScraperService):
-    BASE_URL = "https://forgeglobal.com/search-companies/"
-    # Simple in-memory cache: slug -> (data, timestamp)
-    _detail_cache: Dict[str, tuple[CompanyDetail, float]] = {}
+    BASE_URL = f"{FORGE_BASE_URL}/search-companies/"
+    # Detail Cache: slug -> CompanyDetail (kept with its JSON, served as is on hits)
+    _detail_cache = TTLCache(
+        "detail",
+        ttl=CACHE_TTL,
+        stale_ttl=CACHE_STALE_TTL,
+        max_entries=DETAIL_CACHE_MAX_ENTRIES,
+        max_bytes=DETAIL_CACHE_MAX_BYTES,
+        encode=lambda detail: detail.model_dump_json().encode(),
+    )
     
-    # List API Cache: key -> (data, timestamp)
+    # List API Cache: key -> List[UnifiedCompanyData] (kept with the JSON array of the rows)
     # Key format: f"{sector}:{valuation}:{page_num}"
-    _list_cache: Dict[str, tuple[List[UnifiedCompanyData], float]] = {}
-    
-    CACHE_TTL = 3600  # 1 hour
+    _list_cache = TTLCache(
+        "list",
+        ttl=CACHE_TTL,
+        stale_ttl=CACHE_STALE_TTL,
+        max_entries=LIST_CACHE_MAX_ENTRIES,
+        max_bytes=LIST_CACHE_MAX_BYTES,
+        encode=lambda rows: b"[" + b",".join(row.model_dump_json().encode() for row in rows) + b"]",
+    )
+
+    # Pagination Cache: f"{sector}:{valuation}" -> {"total", "pages"}
+    _meta_cache = TTLCache(
+        "meta",
+        ttl=CACHE_TTL,
+        stale_ttl=CACHE_STALE_TTL,
+        max_entries=LIST_CACHE_MAX_ENTRIES,
+    )
 
     # Concurrency control to prevent OOM on 1GB RAM (t3.micro)
     # We use a Semaphore to queue requests instead of a Lock
     # This limits ACTIVE browsers, but allows queuing
     from src.config import MAX_CONCURRENCY
-    _sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    # With the worker pool enabled, each worker process takes one browser task at a time
+    _browser_slots = worker_pool.size or MAX_CONCURRENCY
+    _sem = asyncio.Semaphore(_browser_slots)
+
+    # Scrapes queued on _sem, in arrival order (queue positions; background work
+    # pauses while any of them is for a user)
+    _sem_queue: List[_SlotWaiter] = []
+
+    # Detail page views by users, used to prioritise background work
+    _views = _ViewCounts()
+
+    # The HTTP fast path holds no browser memory, so it gets its own, wider limit
+    _http_sem = asyncio.Semaphore(HTTP_MAX_CONCURRENCY)
+
+    # Background writes to the result store (kept referenced until done)
+    _pending_writes: set = set()
+
+    # Stale details confirmed current by an unchanged list row instead of rescraped
+    _detail_revalidations = 0
+
+    # The HTTP fast path is skipped until then after it got a challenge page
+    _http_skip_until = 0.0
+    _http_challenges = 0
+
+    # Concurrent misses for the same key share one scrape
+    _list_flights = SingleFlight("list")
+    _detail_flights = SingleFlight("detail")
     
     async def scrape(
         self, 
@@ -34,20 +177,290 @@ class ForgeGlobalService(ScraperService):
     ) -> List[UnifiedCompanyData]:
         """
         Scrapes Forge Global data with caching and concurrency protection.
+        Tries a plain HTTP fetch first and only falls back to the browser
+        when the page is a challenge or the table comes back empty.
         """
-        # 1. Check Cache
-        cache_key = f"{sector}:{valuation}:{page_num}"
-        current_time = time.time()
-        
-        if cache_key in self._list_cache:
-            data, timestamp = self._list_cache[cache_key]
-            if current_time - timestamp < self.CACHE_TTL:
-                print(f"CACHE HIT for list: {cache_key}")
-                return data
-            else:
-                del self._list_cache[cache_key]
+        return await self._list_page(sector, valuation, page_num, speed, serve_stale=True)
+
+    async def _list_page(
+        self,
+        sector: Optional[str],
+        valuation: Optional[str],
+        page_num: int,
+        speed: SpeedProfile,
+        serve_stale: bool
+    ) -> List[UnifiedCompanyData]:
+        """
+        One list page, from the cache or scraped. Without serve_stale, a stale page
+        is scraped again and waited for (its stale copy is only the fallback when
+        that scrape fails).
+        """
+        # 1. Pages past an end confirmed by an actual fetch (empty or short page) are
+        # known to be empty. Counts read off the page are not trusted for this.
+        meta = self.get_list_meta(sector, valuation)
+        if meta and meta.get("end") is not None and page_num > meta["end"]:
+            print(f"Page {page_num} is past the last page ({meta['end']}) for {sector}:{valuation}")
+            return []
+
+        # 2. Check Cache (stale entries are served while refreshing in the background)
+        # 3. Coalesce concurrent misses for the same page into one scrape
+        cache_key = self.list_cache_key(sector, valuation, page_num)
+        meta_key = self.list_meta_key(sector, valuation)
+        url = self._build_list_url(sector, valuation, page_num)
+
+        def load():
+            return self._list_flights.do(
+                cache_key, lambda: self._scrape_list_uncached(cache_key, meta_key, page_num, url, speed)
+            )
+
+        if serve_stale:
+            return await self._list_cache.get_or_load(cache_key, load)
+
+        rows = self._list_cache.get(cache_key)
+        if rows is not None:
+            return rows
+        stale = self._list_cache.peek(cache_key)
+        rows = await load()
+        if rows:
+            self._list_cache.set(cache_key, rows)
+            return rows
+        return stale.value if stale is not None else rows
+
+    async def iter_catalog(
+        self,
+        sector: Optional[str] = None,
+        valuation: Optional[str] = None,
+        speed: SpeedProfile = SpeedProfile.NORMAL
+    ) -> AsyncIterator[UnifiedCompanyData]:
+        """
+        Yields every company for a filter, page by page. Fresh pages come from the
+        cache; missing and stale pages are scraped (and waited for). The next page
+        is fetched while the current one is consumed, so at most two pages are held
+        in memory. Stops at the end a fetch confirmed; a page that still can't be
+        fetched after EXPORT_PAGE_ATTEMPTS tries raises CatalogIncomplete.
+        """
+        async def fetch(page_num: int) -> List[UnifiedCompanyData]:
+            for attempt in range(EXPORT_PAGE_ATTEMPTS):
+                if attempt:
+                    await asyncio.sleep(EXPORT_RETRY_DELAY)
+                rows = await self._list_page(sector, valuation, page_num, speed, serve_stale=False)
+                if rows:
+                    return rows
+                # Empty is only the end when a fetch showed it (not a failed or rate limited one)
+                if self.list_end_confirmed(sector, valuation, page_num):
+                    return []
+            raise CatalogIncomplete(f"List page {page_num} for {sector}:{valuation} could not be fetched")
+
+        next_page = None
+        try:
+            page_num = 1
+            next_page = asyncio.create_task(fetch(page_num))
+            while next_page is not None:
+                rows = await next_page
+                next_page = None
+                if not rows:
+                    break
+
+                # A full page may have a next one (_list_page knows the confirmed end)
+                if page_num < EXPORT_MAX_PAGES and len(rows) >= PAGE_SIZE:
+                    page_num += 1
+                    next_page = asyncio.create_task(fetch(page_num))
+
+                for row in rows:
+                    yield row
+        finally:
+            # Consumer stopped early: don't leave the lookahead running
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _scrape_list_uncached(
+        self,
+        cache_key: str,
+        meta_key: str,
+        page_num: int,
+        url: str,
+        speed: SpeedProfile
+    ) -> List[UnifiedCompanyData]:
+        """
+        Scrapes one list page, HTTP first with browser fallback, and persists it
+        together with the filter's result and page counts.
+        """
+        # 1. HTTP Fast Path (no browser, no global semaphore)
+        results: List[UnifiedCompanyData] = []
+        counts: Dict[str, Optional[int]] = {}
+        if HTTP_FAST_PATH and time.monotonic() >= self._http_skip_until:
+            results, counts = await self._scrape_list_http(url, speed)
+
+        # 2. Browser Fallback
+        if not results:
+            results, counts = await self._scrape_list_browser(url, speed)
+
+        # 3. Remember pagination totals for this sector/valuation filter. Only an
+        # extraction that ran and found no rows (not a failed one) says the page is empty
+        extracted_empty = not results and "rows" in counts and not counts["rows"]
+        meta = self._build_list_meta(
+            counts, page_num, len(results), extracted_empty, self._meta_cache.peek(meta_key)
+        )
+        if meta:
+            self._meta_cache.set(meta_key, meta)
+            self._persist(result_store.save_meta(meta_key, meta, time.time()))
+
+        # 4. Index for catalog queries and persist so restarts start warm
+        if results:
+            catalog_index.upsert_rows(results)
+            price_history.record_rows(results)
+            # 5. Compare with the previous scrape of these rows (drives incremental detail refresh)
+            changes = change_tracker.observe_rows(results)
+            slugs = [row.raw_data.get("slug") for row in results]
+            self._persist(result_store.save_fingerprints(change_tracker.rows_state(slugs)))
+            if changes:
+                self._persist(result_store.save_changes(changes))
+            self._persist(result_store.save_list(cache_key, results, time.time()))
         
-        # Construct URL
+        return results
+
+    def _build_list_meta(
+        self,
+        counts: Dict[str, Any],
+        page_num: int,
+        row_count: int,
+        extracted_empty: bool,
+        previous: Optional[CacheEntry],
+    ) -> Optional[Dict[str, int]]:
+        """
+        Derives {"total", "pages"} for a filter, plus "end" once an actual fetch has
+        shown where the pages stop (every page past "end" is empty): a short page, or
+        an empty one. The result count gives pages = ceil(total / PAGE_SIZE); page
+        links and pages seen full are lower bounds only (pagination may be windowed),
+        and the count gives way to them.
+        """
+        known = previous.value if previous else {}
+        end = known.get("end")
+
+        if extracted_empty:
+            end = page_num - 1 if end is None else min(end, page_num - 1)
+            pages = min(known.get("pages", end), end)
+            return {"total": min(known.get("total", end * PAGE_SIZE), end * PAGE_SIZE), "pages": pages, "end": end}
+        if row_count == 0:
+            # Failed fetch: says nothing
+            return None
+        if row_count < PAGE_SIZE:
+            return {"total": (page_num - 1) * PAGE_SIZE + row_count, "pages": page_num, "end": page_num}
+
+        # A full page
+        if end is not None and page_num >= end:
+            # Rows at or past the recorded end: the catalog grew
+            end = None
+        total = counts.get("total")
+        pages = max(page_num, counts.get("pages") or 0, known.get("pages", 0))
+        if total is not None:
+            pages = max(pages, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+            total = max(total, (pages - 1) * PAGE_SIZE + 1)
+        else:
+            # Nothing says how full the last page is
+            total = pages * PAGE_SIZE
+        if end is None:
+            return {"total": total, "pages": pages}
+        pages = min(pages, end)
+        return {"total": min(total, end * PAGE_SIZE), "pages": pages, "end": end}
+
+    def build_page(
+        self, data: List[UnifiedCompanyData], sector: Optional[str], valuation: Optional[str], page: int
+    ) -> PaginatedResponse:
+        """
+        Wraps one scraped list page with pagination totals (shared by /data/forge and scrape jobs).
+        """
+        total, total_pages = self._page_totals(len(data), sector, valuation, page)
+        # Rows were validated when built (or loaded from the store)
+        return PaginatedResponse.model_construct(
+            items=data,
+            total=total,
+            page=page,
+            size=len(data),
+            pages=total_pages
+        )
+
+    def encoded_list_page(self, sector: Optional[str], valuation: Optional[str], page: int) -> Optional[bytes]:
+        """
+        The /data/forge JSON body for a cached page, spliced from the rows' cached
+        encoding (same output as build_page(...).model_dump_json()). None when not cached.
+        """
+        entry = self._list_cache.peek(self.list_cache_key(sector, valuation, page))
+        if entry is None or entry.encoded is None:
+            return None
+        size = len(entry.value)
+        total, total_pages = self._page_totals(size, sector, valuation, page)
+        tail = f',"total":{total},"page":{page},"size":{size},"pages":{total_pages}}}'
+        return b'{"items":' + entry.encoded + tail.encode()
+
+    def encoded_detail(self, slug: str) -> Optional[bytes]:
+        """The /data/company/{slug} JSON body for a cached company. None when not cached."""
+        entry = self._detail_cache.peek(slug)
+        return entry.encoded if entry else None
+
+    def _page_totals(
+        self, page_size: int, sector: Optional[str], valuation: Optional[str], page: int
+    ) -> Tuple[int, int]:
+        """(total, pages) reported with a list page."""
+        # Real totals as shown on the search page, cached per sector/valuation filter
+        meta = self.get_list_meta(sector, valuation)
+        if meta:
+            return meta["total"], meta["pages"]
+        if page_size < PAGE_SIZE:
+            # Last page - calculate total
+            return (page - 1) * PAGE_SIZE + page_size, page
+        # Totals unknown: report what we know exists (at least one more page)
+        return page * PAGE_SIZE, page + 1
+
+    def list_validator(
+        self, sector: Optional[str], valuation: Optional[str], page_num: int
+    ) -> Optional[Tuple[str, int, int]]:
+        """
+        (ETag, seconds fresh, seconds servable stale) of a cached list page, for HTTP
+        caching. The ETag covers the rows and the pagination totals sent with them.
+        """
+        entry = self._list_cache.peek(self.list_cache_key(sector, valuation, page_num))
+        if entry is None or entry.etag is None:
+            return None
+        meta = self.get_list_meta(sector, valuation)
+        version = f"{entry.etag}.{meta['total']}.{meta['pages']}" if meta else entry.etag
+        return (f'W/"{version}"', *self._list_cache.remaining(entry))
+
+    def detail_validator(self, slug: str) -> Optional[Tuple[str, int, int]]:
+        """(ETag, seconds fresh, seconds servable stale) of a cached company detail."""
+        entry = self._detail_cache.peek(slug)
+        if entry is None or entry.etag is None:
+            return None
+        return (f'W/"{entry.etag}"', *self._detail_cache.remaining(entry))
+
+    def is_list_fresh(self, sector: Optional[str], valuation: Optional[str], page_num: int) -> bool:
+        """Whether a list page is cached and within its TTL (a request would not scrape it)."""
+        return self._list_cache.is_fresh(self.list_cache_key(sector, valuation, page_num))
+
+    def is_detail_fresh(self, slug: str) -> bool:
+        """Whether a company detail is cached and within its TTL."""
+        return self._detail_cache.is_fresh(slug)
+
+    def list_end_confirmed(self, sector: Optional[str], valuation: Optional[str], page_num: int) -> bool:
+        """Whether a fetch showed that the filter's pages end before page_num."""
+        end = (self.get_list_meta(sector, valuation) or {}).get("end")
+        return end is not None and page_num > end
+
+    def get_list_meta(self, sector: Optional[str], valuation: Optional[str]) -> Optional[Dict[str, int]]:
+        """Cached {"total", "pages"} for a sector/valuation filter, if known."""
+        entry = self._meta_cache.peek(self.list_meta_key(sector, valuation))
+        return entry.value if entry else None
+
+    @staticmethod
+    def list_cache_key(sector: Optional[str], valuation: Optional[str], page_num: int) -> str:
+        return f"{sector}:{valuation}:{page_num}"
+
+    @staticmethod
+    def list_meta_key(sector: Optional[str], valuation: Optional[str]) -> str:
+        return f"{sector}:{valuation}"
+
+    def _build_list_url(self, sector: Optional[str], valuation: Optional[str], page_num: int) -> str:
+        """Builds the search-companies URL for the given filters."""
         url = self.BASE_URL
         if sector:
             if not url.endswith("/"):
@@ -62,442 +475,569 @@ class ForgeGlobalService(ScraperService):
         
         if query_params:
             url += "?" + "&".join(query_params)
+        return url
 
-        print(f"Scraping URL: {url} with speed profile: {speed}")
-        
-        # 2. Acquire Semaphore (Queue)
-        async with self._sem:
-            context = None
+    def _build_list_rows(self, table_data: List[Dict[str, Any]]) -> List[UnifiedCompanyData]:
+        """
+        Converts raw table rows ({"logo_url", "href", "cells"}) into UnifiedCompanyData.
+        Shared by the HTTP and browser extraction paths.
+        """
+        companies = []
+        for item in table_data:
             try:
-                min_sleep, max_sleep = SLEEP_CONFIG[speed]
-                results = []
-                
-                # Singleton Browser Usage
-                browser = await browser_manager.get_browser()
-                context = await browser.new_context()
+                cells = item['cells']
+                logo_url = item['logo_url']
                 
-                # Block heavy resources to save memory
-                async def route_handler(route):
-                    if route.request.resource_type in ["image", "media", "font", "stylesheet"]:
-                        await route.abort()
-                    else:
-                        await route.continue_()
-
-                # Create page and apply routing
-                page = await context.new_page()
-                await page.route("**/*", route_handler)
+                if not cells or len(cells) < 8:
+                    continue
+
+                if logo_url and not logo_url.startswith("http"):
+                    logo_url = f"{FORGE_BASE_URL}{logo_url}"
+
+                company_name = cells[1].strip()
+                sector_text = cells[2]
                 
-                try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                    
-                    # Sleep based on speed profile
-                    sleep_time = random.uniform(min_sleep, max_sleep)
-                    await asyncio.sleep(sleep_time)
+                # Handle newlines in sector
+                if '\\n' in sector_text:
+                    sector_main, subsector = sector_text.split('\\n', 1)
+                elif '\n' in sector_text:
+                     sector_main, subsector = sector_text.split('\n', 1)
+                else:
+                    sector_main = sector_text
+                    subsector = ""
+                sector_main = sector_main.strip()
+                subsector = subsector.strip()
                     
-                    # New Extraction Logic
-                    print("Extracting table data entries...")
-                    try:
-                        table_data = await page.evaluate("""() => {
-                            const rows = Array.from(document.querySelectorAll('table tbody tr'));
-                            return rows.map(row => {
-                                const cells = Array.from(row.querySelectorAll('td'));
-                                if (cells.length < 8) return null;
-                                
-                                // Extract logo safely
-                                const img = row.querySelector('td:first-child img');
-                                const logo = img ? img.src : null;
-                                
-                                // Extract text content cleanly
-                                const texts = cells.map(c => c.innerText);
-                                
-                                return {
-                                    logo_url: logo,
-                                    cells: texts
-                                };
-                            }).filter(item => item !== null);
-                        }""")
-                        
-                        print(f"Extracted {len(table_data)} rows successfully.")
-                        
-                        if not table_data:
-                            print("No valid rows found in table.")
-                            return []
-
-                        for item in table_data:
-                            try:
-                                cells = item['cells']
-                                logo_url = item['logo_url']
-                                
-                                if not cells or len(cells) < 8:
-                                    continue
-    
-                                if logo_url and not logo_url.startswith("http"):
-                                    logo_url = f"https://forgeglobal.com{logo_url}"
-    
-                                company_name = cells[1].strip()
-                                sector_text = cells[2]
-                                
-                                # Handle newlines in sector
-                                if '\\n' in sector_text:
-                                    sector_main, subsector = sector_text.split('\\n', 1)
-                                elif '\n' in sector_text:
-                                     sector_main, subsector = sector_text.split('\n', 1)
-                                else:
-                                    sector_main = sector_text
-                                    subsector = ""
-                                sector_main = sector_main.strip()
-                                subsector = subsector.strip()
-                                    
-                                forge_data = ForgeCompanyData(
-                                    company=company_name,
-                                    sector=sector_main,
-                                    subsector=subsector,
-                                    forge_price=cells[3].strip(),
-                                    last_matched_price=cells[4].strip() if cells[4].strip() else None,
-                                    round=cells[5].strip(),
-                                    post_money_valuation=cells[6].strip(),
-                                    price_per_share=cells[7].strip(),
-                                    amount_raised=cells[8].strip() if len(cells) > 8 else "",
-                                    logo_url=logo_url
-                                )
-                                
-                                unified_data = UnifiedCompanyData(
-                                    name=company_name,
-                                    sector=sector_main,
-                                    valuation=forge_data.post_money_valuation,
-                                    source="forge_global",
-                                    raw_data=forge_data.model_dump()
-                                )
-                                
-                                results.append(unified_data)
-                            except Exception as e:
-                                print(f"Error parsing row item: {e}")
-                                continue
-                            
-                    except Exception as e:
-                        print(f"Error executing batch extraction: {e}")
-                        
-                except Exception as e:
-                    print(f"Navigation error: {e}")
+                forge_data = ForgeCompanyData(
+                    company=company_name,
+                    sector=sector_main,
+                    subsector=subsector,
+                    forge_price=cells[3].strip(),
+                    last_matched_price=cells[4].strip() if cells[4].strip() else None,
+                    round=cells[5].strip(),
+                    post_money_valuation=cells[6].strip(),
+                    price_per_share=cells[7].strip(),
+                    amount_raised=cells[8].strip() if len(cells) > 8 else "",
+                    logo_url=logo_url,
+                    slug=slug_from_href(item.get('href')) or slugify(company_name)
+                )
+                companies.append(forge_data)
+            except Exception as e:
+                print(f"Error parsing row item: {e}")
+                continue
 
-                # 3. Update Cache if successful
-                if results:
-                    self._list_cache[cache_key] = (results, time.time())
-                
-                return results
+        # Parse prices, valuations and raises for the whole page in one pass
+        normalize_companies(companies)
+        return self._wrap_rows(companies)
 
-            finally:
-                if context:
-                    await context.close()
-                
-                # We KEEP the browser open for performance.
-                # Only close context (tab) to free page resources.
-                
-                gc.collect()
+    def _build_list_rows_from_json(self, rows: List[Dict[str, Any]]) -> List[UnifiedCompanyData]:
+        """
+        Converts search results captured as JSON (ForgeCompanyData fields with typed
+        values already set, see forge_json.map_list) into UnifiedCompanyData.
+        """
+        companies = []
+        for fields in rows:
+            try:
+                if not fields["company"]:
+                    continue
+                logo_url = fields.get("logo_url")
+                if logo_url and not logo_url.startswith("http"):
+                    fields["logo_url"] = f"{FORGE_BASE_URL}{logo_url}"
+                fields["slug"] = fields.get("slug") or slugify(fields["company"])
+                companies.append(ForgeCompanyData(**fields))
+            except Exception as e:
+                print(f"Error parsing captured row: {e}")
+        return self._wrap_rows(companies)
+
+    def _wrap_rows(self, companies: List[ForgeCompanyData]) -> List[UnifiedCompanyData]:
+        # ForgeCompanyData is validated already; wrapping it needs no second validation.
+        # Jobs get each row as it is built, before indexing and persisting the page
+        scraped_at = datetime.utcnow()
+        reporting = bool(_reporters(current_flight.get()))
+        rows = []
+        for forge_data in companies:
+            row = UnifiedCompanyData.model_construct(
+                name=forge_data.company,
+                sector=forge_data.sector,
+                valuation=forge_data.post_money_valuation,
+                date_scraped=scraped_at,
+                source="forge_global",
+                raw_data=forge_data.model_dump()
+            )
+            if reporting:
+                report_progress("rows", rows=[row.model_dump(mode="json")])
+            rows.append(row)
+        return rows
+
+    async def _scrape_list_http(self, url: str, speed: SpeedProfile) -> Tuple[List[UnifiedCompanyData], Dict[str, Optional[int]]]:
+        """
+        Fetches the search page over plain HTTP and parses it with lxml.
+        Returns (rows, counts); rows are empty when the browser is needed
+        (challenge, empty table, error).
+        """
+        print(f"Fetching URL over HTTP: {url}")
+        report_progress("fetching", url=url)
+        try:
+            await rate_controller.acquire(speed, _rate_wait())
+        except RateLimitExceeded as e:
+            print(f"HTTP fast path rate limited: {e}")
+            SCRAPES.labels("http", "rate_limited").inc()
+            return [], {}
+        async with self._http_sem:
+            try:
+                client = await http_client_manager.get_client()
+                started = time.monotonic()
+                try:
+                    with timed("http_fetch"):
+                        response = await client.get(url)
+                except httpx.TimeoutException:
+                    rate_controller.record_failure("timeout")
+                    raise
+                page_html = response.text
+                challenged = is_challenge_page(response.status_code, page_html)
+                if challenged and response.status_code != 429:
+                    # A bot check only a browser passes, not throttling: the browser
+                    # fallback goes ahead at the shared rate and only this path backs off
+                    ForgeGlobalService._http_challenges += 1
+                    ForgeGlobalService._http_skip_until = time.monotonic() + HTTP_CHALLENGE_BACKOFF
+                    print(
+                        f"HTTP fast path hit a challenge page (status {response.status_code}), "
+                        f"using the browser for the next {HTTP_CHALLENGE_BACKOFF}s"
+                    )
+                    SCRAPES.labels("http", "challenge").inc()
+                    return [], {}
+                rate_controller.record_status(response.status_code, time.monotonic() - started)
+                if challenged:
+                    print("HTTP fast path throttled (429), falling back to browser")
+                    SCRAPES.labels("http", "throttled").inc()
+                    return [], {}
+
+                with timed("http_parse"):
+                    parsed = parse_search_page(page_html)
+                if not parsed["rows"]:
+                    print("HTTP fast path found an empty table, falling back to browser")
+                    SCRAPES.labels("http", "empty").inc()
+                    return [], {}
+
+                with timed("build_models"):
+                    results = self._build_list_rows(parsed["rows"])
+                print(f"Extracted {len(results)} rows over HTTP.")
+                SCRAPES.labels("http", "ok").inc()
+                return results, parsed
+            except Exception as e:
+                print(f"HTTP fast path error: {e}")
+                SCRAPES.labels("http", "error").inc()
+                return [], {}
+
+    async def _scrape_list_browser(self, url: str, speed: SpeedProfile) -> Tuple[List[UnifiedCompanyData], Dict[str, Optional[int]]]:
+        """
+        Scrapes the search page in the browser (in-process or on a worker).
+        Returns (rows, counts).
+        """
+        print(f"Scraping URL: {url} with speed profile: {speed}")
+        parsed = await self._browse("list", url, speed)
+        if parsed is None:
+            return [], {}
+
+        table_data = parsed["rows"]
+        print(f"Extracted {len(table_data)} rows successfully.")
+        if not table_data:
+            print("No valid rows found in table.")
+            return [], parsed
+
+        with timed("build_models"):
+            if parsed.get("source") == "json":
+                return self._build_list_rows_from_json(table_data), parsed
+            return self._build_list_rows(table_data), parsed
+
+    async def _browse(self, kind: str, url: str, speed: SpeedProfile) -> Optional[Dict[str, Any]]:
+        """
+        Runs one browser navigation + extraction (see browser_tasks.run_page_task):
+        on a worker process when the worker pool is enabled, otherwise on this
+        process's page pool. Feeds the outcome to the rate controller and returns
+        the extracted data (None on failure).
+        """
+        # Rate token first, so a cooldown holds no slot, page or worker
+        try:
+            await rate_controller.acquire(speed, _rate_wait())
+        except RateLimitExceeded as e:
+            print(f"Browser {kind} rate limited for {url}: {e}")
+            SCRAPES.labels(kind, "rate_limited").inc()
+            return None
+
+        # Acquire Semaphore (Queue)
+        async with self._browser_slot():
+            if worker_pool.enabled:
+                outcome = await worker_pool.run(kind, url, report_progress)
+            else:
+                # Warm, pre-routed page from the shared browser's pool. The page goes back
+                # to the pool and the browser stays open; the memory watchdog restarts it
+                # and runs GC when memory grows (see BrowserManager._check_memory).
+                async with browser_manager.lease_page() as page:
+                    outcome = await run_page_task(page, kind, url, report_progress)
+
+        # Stage timings measured in a worker process
+        for stage, seconds in outcome.get("stages", ()):
+            observe_stage(stage, seconds)
+
+        if outcome["timeout"]:
+            rate_controller.record_failure("timeout")
+        elif outcome["latency"] is not None:
+            rate_controller.record_status(outcome["status"], outcome["latency"], challenge=outcome["challenge"])
+
+        if outcome["error"]:
+            print(f"Browser {kind} error for {url}: {outcome['error']}")
+            SCRAPES.labels(kind, "error").inc()
+            return None
+        SCRAPES.labels(kind, "ok").inc()
+        EXTRACTIONS.labels(kind, outcome["source"] or "dom").inc()
+        return outcome["data"]
 
     async def scrape_company_detail(self, slug: str) -> Optional[CompanyDetail]:
         """
         Scrapes detailed company information from a specific company page.
+        Everything is read in a single page.evaluate round trip (see DETAIL_SNAPSHOT_JS).
         """
-        from src.models.schemas import CompanyDetail, FundingRound, KeyPerson
-        from datetime import datetime
-        
-        # Check Cache
-        current_time = time.time()
-        if slug in self._detail_cache:
-            data, timestamp = self._detail_cache[slug]
-            if current_time - timestamp < self.CACHE_TTL:
-                print(f"Adding cached result for {slug}")
-                return data
+        # An unchanged list row makes a stale detail fresh again without a scrape
+        if not self._detail_cache.is_fresh(slug):
+            self.revalidate_detail(slug)
+
+        # Check Cache (stale entries are served while refreshing in the background)
+        # and coalesce concurrent misses for the same company into one scrape
+        detail = await self._detail_cache.get_or_load(
+            slug,
+            lambda: self._detail_flights.do(slug, lambda: self._scrape_detail_uncached(slug)),
+        )
+        # Only companies that exist count as views (not typos, 404s or failed scrapes)
+        if detail is not None and not background_scrape.get():
+            self._views.add(slug)
+        return detail
+
+    async def iter_company_details(
+        self, slugs: List[str]
+    ) -> AsyncIterator[Tuple[str, Optional[CompanyDetail], Optional[str]]]:
+        """
+        Yields (slug, detail, error) for each slug as soon as it is ready:
+        cached companies first, then misses scraped BATCH_MAX_PARALLEL (or one per
+        browser worker, if more) at a time.
+        """
+        misses = []
+        for slug in dict.fromkeys(slugs):
+            if self._detail_cache.peek(slug) is not None:
+                yield slug, await self.scrape_company_detail(slug), None
             else:
-                del self._detail_cache[slug]
-        
-        url = f"https://forgeglobal.com/{slug}_stock/"
-        print(f"Scraping Company Detail URL: {url}")
-        
-        async with self._sem:
-            context = None
-            try:
-                # Singleton Browser Usage
-                browser = await browser_manager.get_browser()
-                context = await browser.new_context()
-                
-                # Block heavy resources to save memory
-                async def route_handler(route):
-                    if route.request.resource_type in ["image", "media", "font", "stylesheet"]:
-                        await route.abort()
-                    else:
-                        await route.continue_()
-
-                # Create page and apply routing
-                page = await context.new_page()
-                await page.route("**/*", route_handler)
-    
+                misses.append(slug)
+
+        limit = asyncio.Semaphore(max(BATCH_MAX_PARALLEL, self._browser_slots))
+
+        async def fetch(slug: str):
+            async with limit:
                 try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                    # Wait for main content
-                    await page.wait_for_selector("h1", timeout=15000)
-                    
-                    # 1. Header Info (Name, Logo)
-                    name = "Unknown"
-                    ticker = slug.upper()[:4]
-                    logo_url = None
-                    
-                    try:
-                        h1 = page.locator("h1").first
-                        if await h1.count() > 0:
-                            raw_name = await h1.inner_text()
-                            name = raw_name.strip().replace(" stock", "").replace(" Stock", "")
-                            
-                            # Logo is often in a picture element next to H1
-                            # Structure: .d-flex.align-items-center > picture > img
-                            header_container = h1.locator("..")
-                            logo_img = header_container.locator("img").first
-                            if await logo_img.count() > 0:
-                                logo_url = await logo_img.get_attribute("src")
-                                if logo_url and not logo_url.startswith("http"):
-                                    # Make absolute URL if relative
-                                    logo_url = f"https://forgeglobal.com{logo_url}"
-                    except Exception as e:
-                        print(f"Error extracting header: {e}")
-    
-                    # 2. Market Data (Price, Valuation)
-                    price = "N/A"
-                    change = "N/A" 
-                    change_pct = "N/A"
-                    valuation = "N/A"
-                    
-                    try:
-                        # Price and Change: Look for the header section with class="dg" containing "Forge Price"
-                        # Structure: <div class="dg"><div class="dl">Forge Price</div><div class="dv1">$580.41 <span class="positive">+$17.81 (3.17%)</span></div>
-                        
-                        # Find all .dg containers
-                        dg_containers = await page.locator(".dg").all()
-                        
-                        for container in dg_containers:
-                            try:
-                                # Check if this container has "Forge Price" label
-                                label_el = container.locator(".dl").first
-                                if await label_el.count() > 0:
-                                    label_text = await label_el.inner_text()
-                                    if "Forge Price" in label_text:
-                                        # Found the right container, now get the value
-                                        value_container = container.locator(".dv1").first
-                                        if await value_container.count() > 0:
-                                            full_text = (await value_container.inner_text()).strip()
-                                            # Extract price: first $XXX.XX pattern
-                                            import re
-                                            price_match = re.search(r'\$[\d,]+\.?\d*', full_text)
-                                            if price_match:
-                                                price = price_match.group(0)
-                                            
-                                            # Extract change from .positive or .negative span
-                                            change_span = value_container.locator(".positive, .negative").first
-                                            if await change_span.count() > 0:
-                                                change_text = (await change_span.inner_text()).strip()
-                                                # "+$17.81 (3.17%)" or "-$10.00 (-2.5%)"
-                                                parts = change_text.split(" ")
-                                                if len(parts) >= 2:
-                                                    change = parts[0]  # e.g., "+$17.81"
-                                                    change_pct = parts[1].replace("(", "").replace(")", "")  # e.g., "3.17%"
-                                            break  # Found it, exit loop
-                            except Exception as e:
-                                continue
-                                
-                        # Valuation: look for .fp-info-item with label "Forge Price valuation"
-                        val_item = page.locator(".fp-info-item").filter(has_text="Forge Price valuation").first
-                        if await val_item.count() > 0:
-                            val_text = (await val_item.locator(".value").inner_text()).strip()
-                            # Clean up "none" if present (seen in dump as class="value none")
-                            if val_text.lower() != "none" and "$" in val_text:
-                                valuation = val_text
-                            elif "$" in val_text:
-                                 valuation = val_text
-                            
-                    except Exception as e:
-                        print(f"Error extracting market data: {e}")
-    
-                    # 3. Funding History
-                    funding_history = []
-                    try:
-                        # Use tr.overview selector we found inside #funding table if possible, or just global tr.overview
-                        # The dump showed tr.overview at root level of find, so global is fine
-                        rows = await page.locator("tr.overview").all()
-                        
-                        for row in rows:
-                            cells = await row.locator("td").all_text_contents()
-                            # Cells: [toggle, Date, Rounds, Amount, Price, Valuation, Investors]
-                            if len(cells) >= 7:
-                                # Basic info
-                                date_str = cells[1].strip()
-                                round_label = cells[2].strip()
-                                amount_raised = cells[3].strip()
-                                price_per_share = cells[4].strip()
-                                valuation = cells[5].strip()
-                                investors_list = [inv.strip() for inv in cells[6].split(",")] if cells[6].strip() else []
-    
-                                # Detailed info (initially None)
-                                shares_outstanding = None
-                                liq_pref_order = None
-                                liq_pref_mult = None
-                                conv_ratio = None
-                                div_rate = None
-                                div_type = None
-                                part_type = None
-                                part_cap = None
-    
-                                try:
-                                    # Get data-index to find the corresponding detail row
-                                    data_index = await row.get_attribute("data-index")
-                                    
-                                    # Click to expand - click the first cell which usually contains the chevron/toggle
-                                    await row.locator("td").first.click()
-                                    # await asyncio.sleep(1.0) # Removed explicit sleep, rely on wait_for below
-                                    
-                                    if data_index:
-                                        # Scope to the specific detail row
-                                        detail_row = page.locator(f"tr.detail[data-index='{data_index}']")
-                                        
-                                        # Wait for it to be visible
-                                        try:
-                                            await detail_row.wait_for(state="visible", timeout=2000)
-                                        except:
-                                            # If wait fails, try clicking again? Or just proceed if it's already open?
-                                            pass
-    
-                                        if await detail_row.is_visible():
-                                            # Helper to get value by label within the detail row
-                                            async def get_scoped_value(label_text):
-                                                try:
-                                                    # Use strict XPath for label text matching (case-insensitive)
-                                                    # Must prefix with 'xpath=' for Playwright
-                                                    label_xpath = f"xpath=.//div[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{label_text.lower()}')]"
-                                                    
-                                                    # Locate the label
-                                                    label_el = detail_row.locator(label_xpath).first
-                                                    
-                                                    # If label found, get the immediate following sibling div
-                                                    if await label_el.count() > 0:
-                                                        value_el = label_el.locator("xpath=following-sibling::div").first
-                                                        if await value_el.count() > 0:
-                                                            text = (await value_el.inner_text()).strip()
-                                                            return text if text and text != "--" else None
-                                                    return None
-                                                except Exception as e:
-                                                    print(f"Error getting value for {label_text}: {e}")
-                                                    return None
-    
-                                            shares_outstanding = await get_scoped_value("Shares Outstanding")
-                                            liq_pref_order = await get_scoped_value("Liquidation Pref Order")
-                                            liq_pref_mult = await get_scoped_value("Liquidation Pref As Multiplier")
-                                            conv_ratio = await get_scoped_value("Conversion Ratio")
-                                            div_rate = await get_scoped_value("Dividend Rate")
-                                            part_cap = await get_scoped_value("Participation Cap")
-                                            
-                                            # For Dividend/Participation Types, we can check for text "Non-cumulative" etc.
-                                            # But let's stick to the requested fields first.
-                                            
-                                except Exception as e:
-                                    print(f"Error extracting details for {round_label}: {e}")
-                                
-                                funding_history.append(FundingRound(
-                                    date=date_str,
-                                    round_label=round_label,
-                                    amount_raised=amount_raised,
-                                    price_per_share=price_per_share,
-                                    valuation=valuation,
-                                    investors=investors_list,
-                                    shares_outstanding=shares_outstanding,
-                                    liquidation_preference_order=liq_pref_order,
-                                    liquidation_preference_multiple=liq_pref_mult,
-                                    conversion_ratio=conv_ratio,
-                                    dividend_rate=div_rate,
-                                    dividend_type=div_type,
-                                    participation_type=part_type,
-                                    participation_cap=part_cap
-                                ))
-                    except Exception as e:
-                        print(f"Error extracting funding: {e}")
-    
-                    # 4. Company Details (Sector, Founded, Headquarters, etc.)
-                    sector = ""
-                    subsector = ""
-                    founded = ""
-                    hq = ""
-                    employees = ""
-                    description = ""
-                    website = ""
-                    
-                    try:
-                        # Extract all .col elements that contain label/value pairs
-                        cols = await page.locator(".col").all()
-                        
-                        for col in cols:
-                            try:
-                                label_el = col.locator(".label").first
-                                value_el = col.locator(".value").first
-                                
-                                if await label_el.count() > 0 and await value_el.count() > 0:
-                                    label = (await label_el.inner_text()).strip().lower()
-                                    value = (await value_el.inner_text()).strip()
-                                    
-                                    if "sector" in label and "subsector" not in label:
-                                        sector = value
-                                    elif "subsector" in label:
-                                        subsector = value
-                                    elif "founded" in label:
-                                        founded = value
-                                    elif "headquarters" in label or "headquarter" in label:
-                                        hq = value
-                                    elif "employees" in label or "employee" in label:
-                                        employees = value
-                            except Exception as e:
-                                continue
-                        
-                        # Description - .desc class
-                        desc_el = page.locator(".desc").first
-                        if await desc_el.count() > 0:
-                            description = (await desc_el.inner_text()).strip()
-                            
-                        # Website - .website-url a
-                        web_el = page.locator(".website-url a").first
-                        if await web_el.count() > 0:
-                            website = await web_el.get_attribute("href")
-                            
-                    except Exception as e:
-                        print(f"Error extracting details: {e}")
-    
-                    result = CompanyDetail(
-                        name=name,
-                        slug=slug,
-                        ticker=ticker,
-                        logo_url=logo_url,
-                        description=description,
-                        sector=sector,
-                        subsector=subsector,
-                        founded=founded,
-                        headquarters=hq,
-                        website=website,
-                        employees=employees,
-                        price=price,
-                        price_change=change,
-                        price_change_pct=change_pct,
-                        valuation=valuation,
-                        funding_history=funding_history,
-                        key_people=[],
-                        investors=list(set([inv for round in funding_history for inv in round.investors]))
-                    )
-                    
-                    # Store in cache
-                    self._detail_cache[slug] = (result, time.time())
-                    return result
-    
+                    return slug, await self.scrape_company_detail(slug), None
                 except Exception as e:
-                    print(f"Detailed scraping error: {e}")
+                    return slug, None, str(e)
+
+        tasks = [asyncio.create_task(fetch(slug)) for slug in misses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away: drop queued work (in-flight scrapes still finish and cache)
+            for task in tasks:
+                task.cancel()
+
+    async def _scrape_detail_uncached(self, slug: str) -> Optional[CompanyDetail]:
+        """
+        Scrapes one company page in the browser and persists it.
+        """
+        url = f"{FORGE_BASE_URL}/{slug}_stock/"
+        print(f"Scraping Company Detail URL: {url}")
+
+        snapshot = await self._browse("detail", url, SpeedProfile.FAST)
+        if snapshot is None:
+            return None
+
+        try:
+            with timed("build_models"):
+                result = self._build_company_detail(slug, snapshot)
+        except Exception as e:
+            print(f"Detailed scraping error: {e}")
+            return None
+        print(f"Extracted {len(result.funding_history)} funding rounds for {slug}.")
+        report_progress("rows", rows=[r.model_dump(mode="json") for r in result.funding_history])
+        price_history.record_detail(result)
+        self._persist(result_store.save_detail(result, time.time()))
+        return result
+
+    def _build_company_detail(self, slug: str, snapshot: Dict[str, Any]) -> CompanyDetail:
+        """
+        Builds a CompanyDetail from the plain-data snapshot returned by DETAIL_SNAPSHOT_JS,
+        or from captured JSON (see forge_json.map_detail).
+        """
+        if snapshot.get("source") == "json":
+            return self._build_company_detail_from_json(slug, snapshot)
+
+        # 1. Header Info (Name, Logo)
+        name = "Unknown"
+        ticker = slug.upper()[:4]
+        logo_url = snapshot.get("logo_url")
+
+        if snapshot.get("name"):
+            name = snapshot["name"].strip().replace(" stock", "").replace(" Stock", "")
+        if logo_url and not logo_url.startswith("http"):
+            # Make absolute URL if relative
+            logo_url = f"{FORGE_BASE_URL}{logo_url}"
+
+        # 2. Market Data (Price, Valuation)
+        # Structure: <div class="dg"><div class="dl">Forge Price</div><div class="dv1">$580.41 <span class="positive">+$17.81 (3.17%)</span></div>
+        price = "N/A"
+        change = "N/A"
+        change_pct = "N/A"
+        valuation = "N/A"
+
+        price_text = (snapshot.get("price_text") or "").strip()
+        price_match = re.search(r'\$[\d,]+\.?\d*', price_text)
+        if price_match:
+            price = price_match.group(0)
+
+        # "+$17.81 (3.17%)" or "-$10.00 (-2.5%)"
+        parts = (snapshot.get("change_text") or "").strip().split(" ")
+        if len(parts) >= 2:
+            change = parts[0]
+            change_pct = parts[1].replace("(", "").replace(")", "")
+
+        val_text = (snapshot.get("valuation_text") or "").strip()
+        if "$" in val_text:
+            valuation = val_text
+
+        # 3. Funding History
+        funding_history = []
+        for row in snapshot.get("rounds", []):
+            try:
+                cells = row["cells"]
+                # Cells: [toggle, Date, Rounds, Amount, Price, Valuation, Investors]
+                if len(cells) < 7:
+                    continue
+
+                # Detail row fields as [label, value] pairs, lowercased labels
+                detail_pairs = row.get("details") or []
+
+                def get_scoped_value(label_text: str) -> Optional[str]:
+                    label_text = label_text.lower()
+                    for label, value in detail_pairs:
+                        if label_text in label:
+                            value = (value or "").strip()
+                            return value if value and value != "--" else None
                     return None
-            finally:
-                if context:
-                    await context.close()
-                
-                gc.collect()
-                # Lock released automatically by async with
+
+                funding_history.append(FundingRound(
+                    date=cells[1].strip(),
+                    round_label=cells[2].strip(),
+                    amount_raised=cells[3].strip(),
+                    price_per_share=cells[4].strip(),
+                    valuation=cells[5].strip(),
+                    investors=[inv.strip() for inv in cells[6].split(",")] if cells[6].strip() else [],
+                    shares_outstanding=get_scoped_value("Shares Outstanding"),
+                    liquidation_preference_order=get_scoped_value("Liquidation Pref Order"),
+                    liquidation_preference_multiple=get_scoped_value("Liquidation Pref As Multiplier"),
+                    conversion_ratio=get_scoped_value("Conversion Ratio"),
+                    dividend_rate=get_scoped_value("Dividend Rate"),
+                    dividend_type=None,
+                    participation_type=None,
+                    participation_cap=get_scoped_value("Participation Cap")
+                ))
+            except Exception as e:
+                print(f"Error extracting funding round: {e}")
+
+        # 4. Company Details (Sector, Founded, Headquarters, etc.)
+        sector = ""
+        subsector = ""
+        founded = ""
+        hq = ""
+        employees = ""
+
+        for label, value in snapshot.get("facts", []):
+            label = label.strip().lower()
+            value = value.strip()
+            if "sector" in label and "subsector" not in label:
+                sector = value
+            elif "subsector" in label:
+                subsector = value
+            elif "founded" in label:
+                founded = value
+            elif "headquarters" in label or "headquarter" in label:
+                hq = value
+            elif "employees" in label or "employee" in label:
+                employees = value
+
+        detail = CompanyDetail(
+            name=name,
+            slug=slug,
+            ticker=ticker,
+            logo_url=logo_url,
+            description=(snapshot.get("description") or "").strip(),
+            sector=sector,
+            subsector=subsector,
+            founded=founded,
+            headquarters=hq,
+            website=snapshot.get("website") or "",
+            employees=employees,
+            price=price,
+            price_change=change,
+            price_change_pct=change_pct,
+            valuation=valuation,
+            funding_history=funding_history,
+            key_people=[],
+            investors=list(set([inv for round in funding_history for inv in round.investors]))
+        )
+
+        # 5. Typed market data and funding round values
+        normalize_detail(detail)
+        return detail
+
+    def _build_company_detail_from_json(self, slug: str, captured: Dict[str, Any]) -> CompanyDetail:
+        """
+        Builds a CompanyDetail from captured JSON: fields and typed values come
+        mapped already, so nothing is parsed out of display strings.
+        """
+        fields = dict(captured["detail"])
+        logo_url = fields.get("logo_url")
+        if logo_url and not logo_url.startswith("http"):
+            fields["logo_url"] = f"{FORGE_BASE_URL}{logo_url}"
+
+        funding_history = [FundingRound(**funding_round) for funding_round in captured["rounds"] or []]
+        return CompanyDetail(
+            **fields,
+            slug=slug,
+            ticker=slug.upper()[:4],
+            funding_history=funding_history,
+            key_people=[],
+            investors=list(set([inv for round in funding_history for inv in round.investors]))
+        )
+
+    @asynccontextmanager
+    async def _browser_slot(self):
+        """
+        Acquires the browser semaphore, queued so background work can tell when
+        users are waiting behind it and jobs get their queue position.
+        """
+        waiter = _SlotWaiter()
+        queue = self._sem_queue
+        queue.append(waiter)
+        if self._sem.locked():
+            waiter.report("queued", {"position": len(queue)})
+        try:
+            with timed("semaphore_wait"):
+                await self._sem.acquire()
+        finally:
+            # By identity: waiters have no equality of their own
+            queue.remove(waiter)
+            # Everyone behind moved up one place
+            for position, waiting in enumerate(queue, start=1):
+                waiting.report("queued", {"position": position})
+        try:
+            yield
+        finally:
+            self._sem.release()
+
+    def revalidate_detail(self, slug: str) -> bool:
+        """
+        Marks a cached detail fresh again when its list row was scraped since the
+        detail was last validated and has not changed since the detail itself was
+        scraped, as long as that scrape is younger than DETAIL_MAX_AGE.
+        """
+        entry = self._detail_cache.peek(slug)
+        if entry is None:
+            return False
+        scraped_at = entry.value.scraped_at.replace(tzinfo=timezone.utc).timestamp()
+        if time.time() - scraped_at >= DETAIL_MAX_AGE:
+            return False
+        if not change_tracker.confirms(slug, scraped_at, entry.stored_at):
+            return False
+
+        now = time.time()
+        self._detail_cache.set(slug, entry.value, stored_at=now)
+        self._persist(result_store.touch_detail(slug, now))
+        ForgeGlobalService._detail_revalidations += 1
+        return True
+
+    def cached_details(self) -> List[CompanyDetail]:
+        """Every company detail currently held in the cache (fresh or stale)."""
+        return [detail for _, detail, _ in self._detail_cache.items()]
+
+    def interactive_waiting(self) -> int:
+        """Number of scrapes queued for the browser that a user request is waiting on."""
+        return sum(1 for waiter in self._sem_queue if not waiter.is_background())
+
+    def most_viewed(self, limit: Optional[int] = None) -> List[str]:
+        """Company slugs ordered by user detail views, most viewed first."""
+        return self._views.most_common(limit)
+
+    def _persist(self, coro):
+        """Writes to the result store in the background so responses don't wait on disk."""
+        if not result_store.is_open:
+            coro.close()
+            return
+
+        async def write():
+            try:
+                await coro
+            except Exception as e:
+                print(f"Error persisting result: {e}")
+
+        task = asyncio.create_task(write())
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def flush_writes(self):
+        """Waits for background result store writes (called on shutdown)."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    async def warm_from_store(self):
+        """
+        Loads the hot set (entries still within TTL + stale window) from the
+        result store back into the in-memory caches, keeping original scrape times.
+        """
+        since = time.time() - (CACHE_TTL + CACHE_STALE_TTL)
+        try:
+            lists = await result_store.load_lists(since, LIST_CACHE_MAX_ENTRIES)
+            # Oldest first so the newest end up most recently used
+            for key, rows, scraped_at in reversed(lists):
+                self._list_cache.set(key, rows, stored_at=scraped_at)
+                catalog_index.upsert_rows(rows)
+
+            for key, meta, scraped_at in reversed(await result_store.load_meta(since, LIST_CACHE_MAX_ENTRIES)):
+                self._meta_cache.set(key, meta, stored_at=scraped_at)
+
+            details = await result_store.load_details(since, min(STORE_WARM_DETAILS, DETAIL_CACHE_MAX_ENTRIES))
+            for detail, scraped_at in reversed(details):
+                self._detail_cache.set(detail.slug, detail, stored_at=scraped_at)
+
+            change_tracker.load(await result_store.load_fingerprints(), await result_store.load_changes(CHANGE_FEED_MAX))
+
+            print(f"Warmed caches from store: {len(lists)} list pages, {len(details)} companies.")
+        except Exception as e:
+            print(f"Error warming caches from store: {e}")
+
+    def stats(self) -> dict:
+        """Scrape pipeline diagnostics exposed on /data/stats."""
+        return {
+            "cache": {
+                "list": self._list_cache.stats(),
+                "detail": self._detail_cache.stats(),
+            },
+            "singleflight": {
+                "list": self._list_flights.stats(),
+                "detail": self._detail_flights.stats(),
+            },
+            "page_pool": browser_manager.pool_stats(),
+            "memory": browser_manager.memory_stats(),
+            "workers": worker_pool.stats(),
+            "changes": {**change_tracker.stats(), "detail_revalidations": self._detail_revalidations},
+            "rate": rate_controller.stats(),
+            "http_fast_path": {
+                "challenges": self._http_challenges,
+                "skipped_for": round(max(0.0, self._http_skip_until - time.monotonic()), 1),
+            },
+        }
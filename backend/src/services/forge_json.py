@@ -0,0 +1,389 @@
+import re
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.config import PAGE_SIZE
+from src.services.normalize import parse_usd, parse_pct, iso_date
+from src.services.forge_parser import slug_from_href, slugify
+
+# Maps JSON payloads captured from the site's own XHR/fetch calls (see
+# browser_tasks.JsonCapture) to model fields: CompanyDetail and FundingRound
+# values, or ForgeCompanyData values for search results. The payloads are not
+# documented, so objects are recognised by their keys (camelCase or snake_case,
+# common aliases) wherever they sit in a payload. Numbers are used as they come;
+# display strings are only parsed when the site sends strings.
+#
+# Payloads are (response URL, parsed JSON) pairs. Nothing is accepted on key
+# names alone: a company must be the requested one (its slug, link or name), its
+# prices must sit inside it, funding rounds must sit inside it or come from a URL
+# naming the company, and search results must add up with the result count sent
+# next to them. Anything else falls back to the DOM.
+
+COMPANY_KEYS = {
+    "name": ("companyname", "name", "displayname"),
+    "description": ("description", "companydescription", "overview", "about", "summary"),
+    "website": ("website", "websiteurl", "homepage", "companywebsite"),
+    "logo_url": ("logourl", "logo", "logoimage", "imageurl"),
+    "sector": ("sector", "industry", "sectorname"),
+    "subsector": ("subsector", "subindustry", "subsectorname"),
+    "founded": ("founded", "foundedyear", "yearfounded", "foundeddate"),
+    "headquarters": ("headquarters", "hq", "hqlocation", "location"),
+    "employees": ("employees", "employeecount", "numberofemployees", "headcount"),
+}
+
+PRICE_KEYS = {
+    "price": ("forgeprice", "forgepriceusd", "currentprice", "price", "lastprice"),
+    "change": ("forgepricechange", "pricechange", "change", "changeamount"),
+    "change_pct": ("forgepricechangepercent", "pricechangepercent", "changepercent", "changepct", "percentchange"),
+    "valuation": ("forgepricevaluation", "forgevaluation", "impliedvaluation", "valuation"),
+}
+
+ROUND_KEYS = {
+    "date": ("closedate", "date", "rounddate", "announceddate", "issuedate", "closedat"),
+    "round_label": ("roundname", "round", "roundtype", "roundlabel", "series", "financingtype"),
+    "amount_raised": ("amountraised", "raised", "amount", "capitalraised"),
+    "price_per_share": ("pricepershare", "shareprice", "originalissueprice", "issueprice"),
+    "valuation": ("postmoneyvaluation", "postmoney", "valuation"),
+    "investors": ("investors", "investornames", "leadinvestors", "participants"),
+    "shares_outstanding": ("sharesoutstanding", "sharesissued"),
+    "liquidation_preference_order": ("liquidationpreforder", "liquidationpreferenceorder", "seniority"),
+    "liquidation_preference_multiple": ("liquidationprefmultiple", "liquidationpreferencemultiple", "liquidationmultiple"),
+    "conversion_ratio": ("conversionratio",),
+    "dividend_rate": ("dividendrate",),
+    "dividend_type": ("dividendtype",),
+    "participation_type": ("participationtype", "participation"),
+    "participation_cap": ("participationcap",),
+}
+
+ROW_KEYS = {
+    "company": ("companyname", "name", "displayname"),
+    "slug": ("slug", "urlslug", "companyslug"),
+    "href": ("href", "url", "path", "link", "profileurl"),
+    "logo_url": ("logourl", "logo", "logoimage", "imageurl"),
+    "sector": ("sector", "industry", "sectorname"),
+    "subsector": ("subsector", "subindustry", "subsectorname"),
+    "last_matched_price": ("lastmatchedprice", "lastmatched", "lasttradeprice"),
+    "round": ("lastround", "latestround", "round", "roundname", "series"),
+    "post_money_valuation": ("postmoneyvaluation", "lastvaluation", "valuation"),
+    "price_per_share": ("pricepershare", "lastroundprice", "shareprice"),
+    "amount_raised": ("amountraised", "totalraised", "totalfunding", "raised"),
+}
+
+# Containers whose (possibly empty) list is the funding history
+ROUNDS_CONTAINERS = ("fundingrounds", "rounds", "financings", "fundinghistory", "fundingroundslist")
+TOTAL_KEYS = ("totalresults", "totalcount", "total", "numresults")
+PAGES_KEYS = ("totalpages", "pagecount", "pages", "numpages")
+
+
+def _norm(key: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", key.lower())
+
+
+def _normalized(obj: Dict[str, Any]) -> Dict[str, Any]:
+    return {_norm(key): value for key, value in obj.items() if isinstance(key, str)}
+
+
+def _pick(obj: Dict[str, Any], aliases: Tuple[str, ...]) -> Any:
+    """First alias present with a usable value (obj has normalized keys)."""
+    for alias in aliases:
+        value = obj.get(alias)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _walk(payload: Any) -> Iterator[Tuple[Any, Optional[Dict[str, Any]], Optional[str], bool]]:
+    """Every dict and list in a payload as (node, parent dict, key in parent, inside a list)."""
+    stack = [(payload, None, None, False)]
+    while stack:
+        node, parent, key, in_list = stack.pop()
+        yield node, parent, key, in_list
+        if isinstance(node, dict):
+            stack.extend((value, node, k, in_list) for k, value in node.items() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend((value, None, None, True) for value in node if isinstance(value, (dict, list)))
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return _text(_pick(_normalized(value), ("name", "label", "value", "text")))
+    if isinstance(value, list):
+        return ", ".join(t for t in (_text(v) for v in value) if t)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _usd(value: float, compact: bool) -> str:
+    if compact:
+        for unit, scale in (("T", 1e12), ("B", 1e9), ("M", 1e6), ("K", 1e3)):
+            if abs(value) >= scale:
+                return f"${value / scale:.2f}".rstrip("0").rstrip(".") + unit
+    return f"${value:,.2f}"
+
+
+def money(value: Any, compact: bool = False) -> Tuple[str, Optional[float]]:
+    """(display string, USD) from a number or a display string."""
+    if isinstance(value, dict):
+        value = _pick(_normalized(value), ("value", "amount", "usd", "price"))
+    if isinstance(value, bool) or value is None:
+        return "", None
+    if isinstance(value, (int, float)):
+        return _usd(float(value), compact), float(value)
+    text = _text(value)
+    if re.fullmatch(r"-?[\d,]+(\.\d+)?", text):
+        number = float(text.replace(",", ""))
+        return _usd(number, compact), number
+    return text, parse_usd(text)
+
+
+def percent(value: Any) -> Tuple[str, Optional[float]]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{value:.2f}%", float(value)
+    text = _text(value)
+    return text, parse_pct(text)
+
+
+def date(value: Any) -> Tuple[str, Optional[str]]:
+    """(display string, YYYY-MM-DD) from an ISO string, epoch seconds/ms or a display string."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        stamp = datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc)
+        return stamp.strftime("%b %d, %Y"), stamp.date().isoformat()
+    text = _text(value)
+    match = re.match(r"(\d{4}-\d{2}-\d{2})", text)
+    if match:
+        parsed = datetime.strptime(match.group(1), "%Y-%m-%d")
+        return parsed.strftime("%b %d, %Y"), match.group(1)
+    return text, iso_date(text)
+
+
+def _is_round(obj: Dict[str, Any]) -> bool:
+    return (
+        _pick(obj, ROUND_KEYS["round_label"]) is not None
+        and _pick(obj, ROUND_KEYS["date"]) is not None
+        and any(_pick(obj, ROUND_KEYS[field]) is not None for field in ("amount_raised", "price_per_share", "valuation"))
+    )
+
+
+def _is_company(obj: Dict[str, Any]) -> bool:
+    if _pick(obj, COMPANY_KEYS["name"]) is None:
+        return False
+    return sum(1 for field, aliases in COMPANY_KEYS.items() if field != "name" and _pick(obj, aliases) is not None) >= 2
+
+
+def _is_row(obj: Dict[str, Any]) -> bool:
+    if _pick(obj, ROW_KEYS["company"]) is None:
+        return False
+    if _pick(obj, ROW_KEYS["slug"]) is None and _pick(obj, ROW_KEYS["href"]) is None:
+        return False
+    return any(_pick(obj, aliases) is not None for aliases in (PRICE_KEYS["price"], ROW_KEYS["round"], ROW_KEYS["post_money_valuation"]))
+
+
+def _strip_stock(name: str) -> str:
+    return name.replace(" stock", "").replace(" Stock", "")
+
+
+def _is_about(record: Dict[str, Any], slug: str) -> bool:
+    """The record is the company behind `slug`: by its own slug or link, else by name."""
+    own = _text(_pick(record, ROW_KEYS["slug"])) or slug_from_href(_text(_pick(record, ROW_KEYS["href"])))
+    if own:
+        return own == slug
+    return slugify(_strip_stock(_text(_pick(record, COMPANY_KEYS["name"])))) == slug
+
+
+def _url_names(url: str, slug: str) -> bool:
+    """The response URL has the slug as a path or query segment (e.g. /api/companies/spacex/rounds)."""
+    parts = urlsplit(url)
+    return slug in re.split(r"[/?&=]|_stock", f"{parts.path}?{parts.query}")
+
+
+def _records(node: Any, test) -> Optional[List[Dict[str, Any]]]:
+    """Normalized dicts of a list when at least half of its items pass `test`."""
+    if not isinstance(node, list) or not node or not all(isinstance(item, dict) for item in node):
+        return None
+    records = [_normalized(item) for item in node]
+    matching = [record for record in records if test(record)]
+    return matching if len(matching) * 2 >= len(records) else None
+
+
+def _funding_round(record: Dict[str, Any]) -> Dict[str, Any]:
+    display_date, date_iso = date(_pick(record, ROUND_KEYS["date"]))
+    amount, amount_usd = money(_pick(record, ROUND_KEYS["amount_raised"]), compact=True)
+    pps, pps_usd = money(_pick(record, ROUND_KEYS["price_per_share"]))
+    valuation, valuation_usd = money(_pick(record, ROUND_KEYS["valuation"]), compact=True)
+    investors = _pick(record, ROUND_KEYS["investors"])
+    if isinstance(investors, list):
+        investors = [_text(investor) for investor in investors]
+    else:
+        investors = [name.strip() for name in _text(investors).split(",")]
+
+    fields = {
+        "date": display_date,
+        "round_label": _text(_pick(record, ROUND_KEYS["round_label"])),
+        "amount_raised": amount,
+        "price_per_share": pps,
+        "valuation": valuation,
+        "investors": [name for name in investors if name],
+        "date_iso": date_iso,
+        "amount_raised_usd": amount_usd,
+        "price_per_share_usd": pps_usd,
+        "valuation_usd": valuation_usd,
+    }
+    for field in ("shares_outstanding", "liquidation_preference_order", "liquidation_preference_multiple",
+                  "conversion_ratio", "dividend_rate", "dividend_type", "participation_type", "participation_cap"):
+        value = _text(_pick(record, ROUND_KEYS[field]))
+        fields[field] = value if value and value != "--" else None
+    return fields
+
+
+def _rounds_in(payload: Any) -> Optional[List[Dict[str, Any]]]:
+    """Funding rounds from the first list of rounds (or empty rounds container) in a payload."""
+    for node, parent, key, in_list in _walk(payload):
+        if not isinstance(node, list):
+            continue
+        records = _records(node, _is_round)
+        if records:
+            return [_funding_round(record) for record in records]
+        if not node and key and _norm(key) in ROUNDS_CONTAINERS:
+            return []
+    return None
+
+
+def map_detail(payloads: List[Tuple[str, Any]], slug: str) -> Dict[str, Any]:
+    """
+    Detail fields for `slug` found across the captured (URL, payload) pairs:
+    {"source": "json", "detail": CompanyDetail fields, "rounds": FundingRound fields
+    or None, "complete": bool}. Complete means the company, its Forge Price and its
+    funding rounds (possibly none) were all found.
+    """
+    # 1. The company object (not inside a list: those are peers, rounds or chart points)
+    company_node: Optional[Dict[str, Any]] = None
+    company: Dict[str, Any] = {}
+    for url, payload in payloads:
+        for node, parent, key, in_list in _walk(payload):
+            if isinstance(node, dict) and not in_list:
+                record = _normalized(node)
+                if _is_company(record) and _is_about(record, slug):
+                    company_node, company = node, record
+                    break
+        if company_node is not None:
+            break
+
+    # 2. Market data from the company object and the objects nested in it
+    prices: Dict[str, Any] = {}
+    if company_node is not None:
+        for node, parent, key, in_list in _walk(company_node):
+            if in_list or not isinstance(node, dict):
+                continue
+            record = _normalized(node)
+            for field, aliases in PRICE_KEYS.items():
+                if field not in prices:
+                    value = _pick(record, aliases)
+                    if value is not None and not isinstance(value, list):
+                        prices[field] = value
+
+    # 3. Funding rounds nested in the company, or from an endpoint for this company
+    rounds: Optional[List[Dict[str, Any]]] = None
+    if company_node is not None:
+        rounds = _rounds_in(company_node)
+        for url, payload in payloads:
+            if rounds is not None:
+                break
+            if _url_names(url, slug):
+                rounds = _rounds_in(payload)
+
+    name = _strip_stock(_text(_pick(company, COMPANY_KEYS["name"]))) if company else ""
+    price, price_usd = money(prices.get("price"))
+    change, change_usd = money(prices.get("change"))
+    change_pct_text, change_pct = percent(prices.get("change_pct"))
+    valuation, valuation_usd = money(prices.get("valuation"), compact=True)
+    if change_usd is not None and change_usd > 0 and not change.startswith("+"):
+        change = "+" + change
+
+    detail = {
+        "name": name or "Unknown",
+        "logo_url": _text(_pick(company, COMPANY_KEYS["logo_url"])) or None,
+        "price": price or "N/A",
+        "price_change": change or "N/A",
+        "price_change_pct": change_pct_text or "N/A",
+        "valuation": valuation or "N/A",
+        "price_usd": price_usd,
+        "change_usd": change_usd,
+        "change_pct": change_pct,
+        "valuation_usd": valuation_usd,
+    }
+    for field in ("description", "website", "sector", "subsector", "founded", "headquarters", "employees"):
+        detail[field] = _text(_pick(company, COMPANY_KEYS[field])) if company else ""
+
+    return {
+        "source": "json",
+        "detail": detail,
+        "rounds": rounds,
+        "complete": bool(name) and price_usd is not None and rounds is not None,
+    }
+
+
+def _list_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    price, price_usd = money(_pick(record, PRICE_KEYS["price"]))
+    change_usd = money(_pick(record, PRICE_KEYS["change"]))[1]
+    change_pct = percent(_pick(record, PRICE_KEYS["change_pct"]))[1]
+    last_matched, last_matched_usd = money(_pick(record, ROW_KEYS["last_matched_price"]))
+    valuation, valuation_usd = money(_pick(record, ROW_KEYS["post_money_valuation"]), compact=True)
+    pps, pps_usd = money(_pick(record, ROW_KEYS["price_per_share"]))
+    amount, amount_usd = money(_pick(record, ROW_KEYS["amount_raised"]), compact=True)
+    href = _text(_pick(record, ROW_KEYS["href"]))
+    return {
+        "company": _text(_pick(record, ROW_KEYS["company"])),
+        "sector": _text(_pick(record, ROW_KEYS["sector"])),
+        "subsector": _text(_pick(record, ROW_KEYS["subsector"])),
+        "forge_price": price,
+        "last_matched_price": last_matched or None,
+        "round": _text(_pick(record, ROW_KEYS["round"])),
+        "post_money_valuation": valuation,
+        "price_per_share": pps,
+        "amount_raised": amount,
+        "logo_url": _text(_pick(record, ROW_KEYS["logo_url"])) or None,
+        "slug": _text(_pick(record, ROW_KEYS["slug"])) or slug_from_href(href),
+        "price_usd": price_usd,
+        "change_usd": change_usd,
+        "change_pct": change_pct,
+        "last_matched_price_usd": last_matched_usd,
+        "valuation_usd": valuation_usd,
+        "price_per_share_usd": pps_usd,
+        "amount_raised_usd": amount_usd,
+    }
+
+
+def map_list(payloads: List[Tuple[str, Any]], page_num: int) -> Dict[str, Any]:
+    """
+    Search results for page `page_num` found in the captured (URL, payload) pairs:
+    {"source": "json", "rows": ForgeCompanyData fields, "total", "pages", "complete"}.
+    Only a list of companies sent with its result count, and exactly as long as that
+    count says this page is, is taken (other company lists, like trending or
+    recently viewed, don't qualify). Complete means such a list was found.
+    """
+    for url, payload in payloads:
+        for node, parent, key, in_list in _walk(payload):
+            if not parent or not isinstance(node, list):
+                continue
+            container = _normalized(parent)
+            total = _pick(container, TOTAL_KEYS)
+            if not isinstance(total, int) or isinstance(total, bool):
+                continue
+            expected = min(PAGE_SIZE, total - (page_num - 1) * PAGE_SIZE)
+            if expected <= 0 or len(node) != expected:
+                continue
+            records = _records(node, _is_row)
+            if not records or len(records) != len(node):
+                continue
+            pages = _pick(container, PAGES_KEYS)
+            return {
+                "source": "json",
+                "rows": [_list_row(record) for record in records],
+                "total": total,
+                "pages": pages if isinstance(pages, int) and not isinstance(pages, bool) else None,
+                "complete": True,
+            }
+    return {"source": "json", "rows": [], "total": None, "pages": None, "complete": False}
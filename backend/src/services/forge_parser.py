@@ -0,0 +1,127 @@
+from typing import List, Dict, Any, Optional
+import re
+from lxml import html as lxml_html
+
+# Markers of bot-protection interstitials served instead of the real page
+CHALLENGE_MARKERS = (
+    "cf-challenge",
+    "challenge-platform",
+    "cf-browser-verification",
+    "<title>Just a moment...</title>",
+    "<title>Attention Required!",
+    "captcha-delivery",
+)
+
+# Elements that break lines when the browser computes innerText
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+_SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+_SLUG_RE = re.compile(r"/([^/?#]+)_stock")
+_NON_SLUG_RE = re.compile(r"[^a-z0-9]+")
+# The whole text of the results-count element, e.g. "5,237 results"
+_COUNT_RE = re.compile(r"^\s*([\d,]+)\s+(?:results|companies)\s*$", re.IGNORECASE)
+_COUNT_XPATH = "//*[contains(@class, 'results-count') or contains(@class, 'result-count') or contains(@class, 'resultsCount')]"
+_PAGE_RE = re.compile(r"[?&]page=(\d+)")
+
+
+def is_challenge_page(status_code: int, text: str) -> bool:
+    """
+    Detects bot-protection responses (Cloudflare & co) that only a real browser can pass.
+    """
+    if status_code in (403, 429, 503):
+        return True
+    head = text[:20000]
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+def inner_text(el) -> str:
+    """
+    Approximates HTMLElement.innerText: block elements break lines,
+    whitespace inside a line is collapsed.
+    """
+    parts: List[str] = []
+
+    def walk(node):
+        tag = node.tag if isinstance(node.tag, str) else None
+        if tag in _SKIP_TAGS:
+            return
+        if tag is not None:
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+
+    walk(el)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_search_page(page_html: str) -> Dict[str, Any]:
+    """
+    Parses the server-rendered search-companies page.
+    Returns the same shape as the in-browser extraction:
+    {"rows": [{"logo_url", "href", "cells"}], "total": int | None, "pages": int | None}
+    """
+    if not page_html:
+        return {"rows": [], "total": None, "pages": None}
+    doc = lxml_html.fromstring(page_html)
+
+    rows: List[Dict[str, Any]] = []
+    for row in doc.xpath("//table//tbody/tr"):
+        cells = row.xpath("./td")
+        if len(cells) < 8:
+            continue
+
+        logo: Optional[str] = None
+        img = cells[0].xpath(".//img[@src]")
+        if img:
+            logo = img[0].get("src")
+
+        link = row.xpath(".//a[contains(@href, '_stock')]/@href")
+
+        rows.append({
+            "logo_url": logo,
+            "href": link[0] if link else None,
+            "cells": [inner_text(c) for c in cells],
+        })
+
+    # "5,237 results" / "5,237 companies" from the results-count element only (other
+    # text like "Top 10 companies" is not a count) and the highest ?page=N link
+    # (pagination may be windowed, so that is only a lower bound)
+    total: Optional[int] = None
+    for el in doc.xpath(_COUNT_XPATH):
+        count_match = _COUNT_RE.match(inner_text(el))
+        if count_match:
+            total = int(count_match.group(1).replace(",", ""))
+            break
+
+    pages: Optional[int] = None
+    for href in doc.xpath("//a[contains(@href, 'page=')]/@href"):
+        page_match = _PAGE_RE.search(href)
+        if page_match:
+            pages = max(pages or 0, int(page_match.group(1)))
+
+    return {"rows": rows, "total": total, "pages": pages}
+
+
+def slug_from_href(href: Optional[str]) -> Optional[str]:
+    """Extracts "spacex" from a detail link like "/spacex_stock/"."""
+    if not href:
+        return None
+    match = _SLUG_RE.search(href)
+    return match.group(1) if match else None
+
+
+def slugify(name: str) -> str:
+    """Same fallback the frontend uses when no detail link is available."""
+    return _NON_SLUG_RE.sub("-", name.lower()).strip("-")
@@ -0,0 +1,49 @@
+import httpx
+from typing import Optional
+from src.config import HTTP_MAX_CONCURRENCY, HTTP_TIMEOUT
+
+# Mimic the Firefox build Camoufox ships so both paths look alike upstream
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:135.0) Gecko/20100101 Firefox/135.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+class HttpClientManager:
+    _instance: Optional['HttpClientManager'] = None
+    _client: Optional[httpx.AsyncClient] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HttpClientManager, cls).__new__(cls)
+        return cls._instance
+
+    async def start(self):
+        """Initializes the global pooled HTTP client (keep-alive connections are reused)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=HTTP_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONCURRENCY,
+                    max_keepalive_connections=HTTP_MAX_CONCURRENCY,
+                ),
+            )
+            print("Global HTTP client started.")
+
+    async def stop(self):
+        """Closes the global HTTP client and its connection pool."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+            print("Global HTTP client closed.")
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """Returns the global HTTP client. Starts it if not running."""
+        if self._client is None:
+            await self.start()
+        return self._client
+
+# Global instance
+http_client_manager = HttpClientManager()
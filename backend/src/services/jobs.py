@@ -0,0 +1,188 @@
+import time
+import uuid
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from src.config import JOB_RESULT_TTL, JOB_MAX_RETAINED, JOB_HEARTBEAT
+from src.models.schemas import ScrapeJob, ScrapeJobRequest
+from src.services.forge_global import ForgeGlobalService, scrape_progress
+
+class Job:
+    """
+    One submitted scrape. Progress is kept as an append-only event list so any
+    number of SSE subscribers can replay it from any point and then follow along.
+    """
+
+    def __init__(self, request: ScrapeJobRequest):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.status = "queued"
+        self.stage = "queued"
+        self.position: Optional[int] = None
+        self.rows = 0
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.finished_mono: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+        # (event, data) pairs; the index is the SSE event id
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+        self._signal = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def emit(self, event: str, data: Dict[str, Any]):
+        self.events.append((event, data))
+        # Wake current subscribers; later ones wait on a fresh event
+        signal, self._signal = self._signal, asyncio.Event()
+        signal.set()
+
+    def report(self, stage: str, data: Dict[str, Any]):
+        """Progress callback installed in the scrape's context (see scrape_progress)."""
+        if self.finished:
+            # A background refresh started by this job outlived it
+            return
+        if stage == "queued":
+            self.position = data["position"]
+            self.emit("queue", {"position": self.position})
+            return
+        self.position = None
+        if stage == "rows":
+            self.rows += len(data["rows"])
+            self.emit("rows", data)
+            return
+        self.stage = stage
+        self.emit("stage", {"stage": stage, **data})
+
+    def info(self) -> ScrapeJob:
+        return ScrapeJob(
+            id=self.id,
+            kind=self.request.kind,
+            status=self.status,
+            stage=self.stage,
+            position=self.position,
+            rows=self.rows,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+        )
+
+    async def stream(self, after: int = -1) -> AsyncIterator[Optional[Tuple[int, str, Dict[str, Any]]]]:
+        """
+        Yields (id, event, data) for every event after `after`, live until the job
+        finishes. Yields None after JOB_HEARTBEAT quiet seconds so callers can send a keep-alive.
+        """
+        index = after + 1
+        while True:
+            signal = self._signal
+            while index < len(self.events):
+                event, data = self.events[index]
+                yield index, event, data
+                index += 1
+            if self.finished:
+                return
+            try:
+                await asyncio.wait_for(signal.wait(), JOB_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield None
+
+class JobManager:
+    """
+    Runs list and detail scrapes as background jobs so clients don't hold a
+    connection open while queued behind the browser. Finished jobs (and their
+    results) are kept for JOB_RESULT_TTL seconds.
+    """
+
+    def __init__(self):
+        self.service = ForgeGlobalService()
+        self._jobs: Dict[str, Job] = {}
+
+        # Diagnostics
+        self.submitted = 0
+        self.expired = 0
+
+    def submit(self, request: ScrapeJobRequest) -> Job:
+        self._expire()
+        job = Job(request)
+        self._jobs[job.id] = job
+        self.submitted += 1
+        job.emit("stage", {"stage": "queued"})
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def stop(self):
+        """Cancels unfinished jobs (called on shutdown)."""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: Job):
+        # Scrape stages report into this job (copied into tasks started from here)
+        scrape_progress.set(job.report)
+        job.status = "running"
+        request = job.request
+        try:
+            if request.kind == "list":
+                data = await self.service.scrape(
+                    sector=request.sector, valuation=request.valuation,
+                    page_num=request.page, speed=request.speed,
+                )
+                job.result = self.service.build_page(data, request.sector, request.valuation, request.page)
+                job.rows = len(data)
+            else:
+                job.result = await self.service.scrape_company_detail(request.slug)
+                if job.result is None:
+                    raise LookupError("Company not found or scraping failed")
+            self._finish(job, "done")
+            job.emit("done", job.info().model_dump(mode="json"))
+        except asyncio.CancelledError:
+            self._finish(job, "failed", "Cancelled")
+            job.emit("failed", {"error": job.error})
+            raise
+        except Exception as e:
+            print(f"Scrape job {job.id} failed: {e}")
+            self._finish(job, "failed", str(e))
+            job.emit("failed", {"error": job.error})
+
+    def _finish(self, job: Job, status: str, error: Optional[str] = None):
+        job.status = job.stage = status
+        job.position = None
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        job.finished_mono = time.monotonic()
+
+    def _expire(self):
+        """Drops finished jobs past their TTL, and the oldest ones beyond JOB_MAX_RETAINED."""
+        now = time.monotonic()
+        finished = [job for job in self._jobs.values() if job.finished]
+        overflow = len(self._jobs) - JOB_MAX_RETAINED
+        for job in finished:
+            if now - job.finished_mono >= JOB_RESULT_TTL or overflow > 0:
+                del self._jobs[job.id]
+                self.expired += 1
+                overflow -= 1
+
+    def stats(self) -> dict:
+        statuses: Dict[str, int] = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "retained": len(self._jobs),
+            "by_status": statuses,
+            "submitted": self.submitted,
+            "expired": self.expired,
+        }
+
+# Global instance
+job_manager = JobManager()
@@ -0,0 +1,122 @@
+import os
+from typing import Dict, List, Optional
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Resident memory of a single process in MB, read from /proc.
+    Returns None where /proc is unavailable (non-Linux dev machines).
+    """
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def descendant_pids(pid: Optional[int] = None, skip_python: bool = False) -> List[int]:
+    """
+    All descendants of a process (the Playwright driver and the Firefox processes it spawns).
+    With skip_python, Python children (browser workers, multiprocessing helpers) and
+    everything under them are left out.
+    """
+    pid = pid or os.getpid()
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return []
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            # comm may contain spaces or parens, so split after the last ')'
+            comm, rest = stat.split(" (", 1)[1].rsplit(")", 1)
+            ppid = int(rest.split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if skip_python and comm.startswith("python"):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    result: List[int] = []
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        result.append(child)
+        stack.extend(children.get(child, []))
+    return result
+
+
+def browser_rss_mb() -> Optional[float]:
+    """
+    Summed RSS of the browser tree: every child process of this process except
+    Python ones, so browser worker processes (and the browsers they own) are not
+    counted in the API process.
+    """
+    pids = descendant_pids(skip_python=True)
+    if not pids:
+        return None
+    return sum(process_rss_mb(pid) or 0.0 for pid in pids)
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+        return None if value == "max" else int(value)
+    except (OSError, ValueError):
+        return None
+
+
+def available_memory_mb() -> Optional[float]:
+    """
+    Memory available for new processes in MB: MemAvailable from /proc/meminfo,
+    lowered to what is left under the container's cgroup limit when one is set.
+    Returns None where /proc is unavailable.
+    """
+    available = None
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) / 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        return None
+
+    # cgroup v2, then v1 (v1 reports a huge number when unlimited)
+    for limit_path, usage_path in (
+        ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+        ("/sys/fs/cgroup/memory/memory.limit_in_bytes", "/sys/fs/cgroup/memory/memory.usage_in_bytes"),
+    ):
+        limit, usage = _read_int(limit_path), _read_int(usage_path)
+        if limit is not None and usage is not None and limit < 1 << 60:
+            left = (limit - usage) / (1024 * 1024)
+            available = left if available is None else min(available, left)
+            break
+    return available
+
+
+def usable_cpus() -> int:
+    """
+    CPUs this process may run on: the affinity mask, capped by a cgroup v2 CPU quota.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
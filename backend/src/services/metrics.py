@@ -0,0 +1,156 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from prometheus_client import Histogram, Counter, generate_latest, CONTENT_TYPE_LATEST, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Seconds spent in each step of a scrape:
+#   semaphore_wait   queued for a browser slot
+#   browser_start    launching Camoufox
+#   context_create   new context + page for the page pool
+#   goto             page.goto until domcontentloaded
+#   evaluate         waiting for content + page.evaluate extraction
+#   http_fetch       HTTP fast path request
+#   http_parse       lxml parse of the fetched page
+#   build_models     raw rows/snapshot -> Pydantic models
+STAGE_SECONDS = Histogram(
+    "forge_stage_seconds",
+    "Time spent per scrape pipeline stage",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+
+SCRAPES = Counter(
+    "forge_scrapes",
+    "Browser and HTTP scrapes by kind and result",
+    ["kind", "result"],
+)
+
+PREFETCHES = Counter(
+    "forge_prefetches",
+    "Predictive prefetches by kind and result (scraped, cached, dropped, error, hit, wasted)",
+    ["kind", "result"],
+)
+
+EXTRACTIONS = Counter(
+    "forge_extractions",
+    "Successful browser extractions by where the data came from (captured JSON or DOM)",
+    ["kind", "source"],
+)
+
+# Worker processes buffer their observations here and ship them with each task
+# result (see worker_pool), so the API process exports one set of histograms
+_stage_buffer: Optional[List[Tuple[str, float]]] = None
+
+def observe_stage(stage: str, seconds: float):
+    if _stage_buffer is not None:
+        _stage_buffer.append((stage, seconds))
+    else:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Observes the time spent in the block under `stage` (also when it raises)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+def buffer_stages():
+    """Switches this process (a worker) to buffering stage observations."""
+    global _stage_buffer
+    _stage_buffer = []
+
+def drain_stages() -> List[Tuple[str, float]]:
+    """Buffered observations since the last drain."""
+    if not _stage_buffer:
+        return []
+    drained = list(_stage_buffer)
+    _stage_buffer.clear()
+    return drained
+
+class PipelineCollector:
+    """
+    Reads cache, coalescing, queue, pool and rate-controller state at scrape time,
+    so the counters kept by those services are exported without double bookkeeping.
+    """
+
+    def describe(self):
+        # Nothing to declare up front; keeps register() from calling collect() at import
+        return []
+
+    def collect(self):
+        # Imported here: the services import this module for observe_stage
+        from src.services.forge_global import ForgeGlobalService
+        from src.services.browser_manager import browser_manager
+        from src.services.worker_pool import worker_pool
+        from src.services.rate_controller import rate_controller
+
+        requests = CounterMetricFamily("forge_cache_requests", "Cache lookups by result", labels=["cache", "result"])
+        evictions = CounterMetricFamily("forge_cache_evictions", "Entries evicted to stay within bounds", labels=["cache"])
+        entries = GaugeMetricFamily("forge_cache_entries", "Entries held", labels=["cache"])
+        size = GaugeMetricFamily("forge_cache_bytes", "Approximate bytes held", labels=["cache"])
+        for cache in (ForgeGlobalService._list_cache, ForgeGlobalService._detail_cache, ForgeGlobalService._meta_cache):
+            stats = cache.stats()
+            for result in ("hits", "stale_hits", "misses"):
+                requests.add_metric([cache.name, result], stats[result])
+            evictions.add_metric([cache.name], stats["evictions"])
+            entries.add_metric([cache.name], stats["entries"])
+            size.add_metric([cache.name], stats["bytes"])
+        yield from (requests, evictions, entries, size)
+
+        in_flight = GaugeMetricFamily("forge_scrapes_in_flight", "Scrapes currently running", labels=["kind"])
+        coalesced = CounterMetricFamily("forge_scrapes_coalesced", "Callers that joined an in-flight scrape", labels=["kind"])
+        for flights in (ForgeGlobalService._list_flights, ForgeGlobalService._detail_flights):
+            stats = flights.stats()
+            in_flight.add_metric([flights.name], stats["in_flight"])
+            coalesced.add_metric([flights.name], stats["coalesced"])
+        yield from (in_flight, coalesced)
+
+        yield GaugeMetricFamily(
+            "forge_browser_queue_depth", "Requests waiting for a browser slot", value=len(ForgeGlobalService._sem_queue)
+        )
+        pool = browser_manager.pool_stats()
+        yield GaugeMetricFamily("forge_page_pool_idle", "Idle pooled pages", value=pool["idle"])
+        rss = browser_manager.browser_rss
+        if rss is not None:
+            yield GaugeMetricFamily(
+                "forge_browser_rss_bytes", "Resident memory of the in-process browser tree (browser workers are not counted)", value=rss * 1024 * 1024
+            )
+
+        # Memory watchdog, in this process and (with WORKER_POOL) in the workers
+        memory = dict(browser_manager.memory_counters())
+        for key, value in worker_pool.memory.items():
+            memory[key] += value
+        yield CounterMetricFamily("forge_browser_restarts", "Browser restarts by the memory watchdog", value=memory["browser_restarts"])
+        yield CounterMetricFamily("forge_gc_runs", "Full collections run by the memory watchdog", value=memory["gc_runs"])
+        yield CounterMetricFamily("forge_gc_seconds", "Time spent in watchdog collections", value=memory["gc_seconds"])
+        reclaimed = CounterMetricFamily("forge_memory_reclaimed_bytes", "RSS given back by the memory watchdog", labels=["action"])
+        reclaimed.add_metric(["browser_restart"], memory["restart_reclaimed_mb"] * 1024 * 1024)
+        reclaimed.add_metric(["gc"], memory["gc_reclaimed_mb"] * 1024 * 1024)
+        yield reclaimed
+
+        if worker_pool.enabled:
+            stats = worker_pool.stats()
+            workers = GaugeMetricFamily("forge_workers", "Browser worker processes", labels=["state"])
+            for state in ("alive", "ready", "busy"):
+                workers.add_metric([state], stats[state])
+            yield workers
+            events = CounterMetricFamily("forge_worker_events", "Worker crashes, timeouts, retirements and tasks no worker took in time", labels=["event"])
+            for event in ("crashes", "timeouts", "unavailable", "recycled"):
+                events.add_metric([event], stats[event])
+            yield events
+
+        rate = rate_controller.stats()
+        yield GaugeMetricFamily("forge_rate_per_second", "Current request rate allowed by the rate controller", value=rate["rate_per_sec"])
+        responses = CounterMetricFamily("forge_upstream_responses", "Upstream responses by outcome", labels=["outcome"])
+        for outcome in ("ok", "slow", "throttled", "challenge", "timeout"):
+            responses.add_metric([outcome], rate[outcome])
+        yield responses
+
+REGISTRY.register(PipelineCollector())
+
+def render() -> Tuple[bytes, str]:
+    """Prometheus text exposition of every metric, with its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,124 @@
+import re
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+# "$1.2B", "$1.2 Billion", "+$17.81", "-$10.00", "$580.41 +$17.81 (3.17%)" (first amount
+# wins). A suffix letter must end the word, so "$10 Market" is $10, not $10M
+_USD_RE = re.compile(
+    r"([+-])?\$\s*(\d[\d,]*(?:\.\d+)?|\.\d+)\s*(?:([KMBT])(?![A-Za-z])|(thousand|million|billion|trillion)\b)?",
+    re.IGNORECASE,
+)
+_SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+
+def parse_usd(text: Optional[str]) -> Optional[float]:
+    """
+    Parses the first dollar amount in a display string into a float.
+    Returns None for placeholders like "--" or "N/A".
+    """
+    if not text:
+        return None
+    match = _USD_RE.search(text)
+    if not match:
+        return None
+    sign, number, letter, word = match.groups()
+    value = float(number.replace(",", ""))
+    suffix = letter or (word[0] if word else None)
+    if suffix:
+        value *= _SUFFIXES[suffix.upper()]
+    return -value if sign == "-" else value
+
+
+# Round dates as shown on company pages ("Mar 15, 2023", "03/15/2023", "Mar 2023", ...)
+_DATE_FORMATS = ("%b %d, %Y", "%B %d, %Y", "%m/%d/%Y", "%Y-%m-%d", "%b %Y", "%B %Y", "%Y")
+
+
+def parse_date(text: Optional[str]) -> Optional[date]:
+    """
+    Parses a display date into a date. Month-only dates map to the 1st.
+    Returns None for placeholders or unknown formats.
+    """
+    if not text:
+        return None
+    text = " ".join(text.replace(".", "").split())
+    text = re.sub(r"\bSept\b", "Sep", text)
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+# "(3.17%)", "-2.5%", "+0.4 %"
+_PCT_RE = re.compile(r"([+-])?\s*(\d[\d,]*(?:\.\d+)?|\.\d+)\s*%")
+
+
+def parse_pct(text: Optional[str]) -> Optional[float]:
+    """Parses the first percentage in a display string ("(3.17%)" -> 3.17)."""
+    if not text:
+        return None
+    match = _PCT_RE.search(text)
+    if not match:
+        return None
+    sign, number = match.groups()
+    value = float(number.replace(",", ""))
+    return -value if sign == "-" else value
+
+
+def parse_price_change(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Parses the signed change in a Forge price string: "$580.41 +$17.81 (3.17%)"
+    or just "+$17.81 (3.17%)" -> (17.81, 3.17). The percent takes the sign of
+    the dollar change when it has none of its own.
+    """
+    if not text:
+        return None, None
+    change = None
+    for match in _USD_RE.finditer(text):
+        if match.group(1):
+            change = parse_usd(match.group(0))
+            break
+    pct = parse_pct(text)
+    if pct is not None and change is not None and change < 0 < pct:
+        pct = -pct
+    return change, pct
+
+
+def iso_date(text: Optional[str]) -> Optional[str]:
+    parsed = parse_date(text)
+    return parsed.isoformat() if parsed else None
+
+
+def normalize_companies(rows: List[Any]):
+    """
+    Fills the typed columns of a batch of ForgeCompanyData in place, once at
+    ingestion. The display strings are kept as they are.
+    """
+    for row in rows:
+        row.price_usd = parse_usd(row.forge_price)
+        row.change_usd, row.change_pct = parse_price_change(row.forge_price)
+        row.last_matched_price_usd = parse_usd(row.last_matched_price)
+        row.valuation_usd = parse_usd(row.post_money_valuation)
+        row.price_per_share_usd = parse_usd(row.price_per_share)
+        row.amount_raised_usd = parse_usd(row.amount_raised)
+
+
+def normalize_funding_rounds(rounds: List[Any]):
+    """Fills the typed columns of a batch of FundingRound in place."""
+    for funding_round in rounds:
+        funding_round.date_iso = iso_date(funding_round.date)
+        funding_round.amount_raised_usd = parse_usd(funding_round.amount_raised)
+        funding_round.price_per_share_usd = parse_usd(funding_round.price_per_share)
+        funding_round.valuation_usd = parse_usd(funding_round.valuation)
+
+
+def normalize_detail(detail: Any):
+    """Fills the typed columns of a CompanyDetail and its funding rounds in place."""
+    detail.price_usd = parse_usd(detail.price)
+    detail.change_usd = parse_usd(detail.price_change)
+    detail.change_pct = parse_pct(detail.price_change_pct)
+    if detail.change_pct is not None and detail.change_usd is not None and detail.change_usd < 0 < detail.change_pct:
+        detail.change_pct = -detail.change_pct
+    detail.valuation_usd = parse_usd(detail.valuation)
+    normalize_funding_rounds(detail.funding_history)
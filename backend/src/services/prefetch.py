@@ -0,0 +1,210 @@
+import time
+import asyncio
+from collections import deque, OrderedDict
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from src.config import (
+    PREFETCH_DETAILS, PREFETCH_BUDGET_PER_MINUTE, PREFETCH_QUEUE_MAX, PREFETCH_MAX_AGE,
+    PREFETCH_HIT_WINDOW, PREFETCH_PAUSE_POLL, PAGE_SIZE, SpeedProfile,
+)
+from src.models.schemas import UnifiedCompanyData
+from src.services.forge_global import ForgeGlobalService, background_scrape
+from src.services.metrics import PREFETCHES
+
+# (kind, key, sector, valuation, page_num, queued_at); key is the cache key (slug for details)
+PrefetchItem = Tuple[str, str, Optional[str], Optional[str], int, float]
+
+class PrefetchScheduler:
+    """
+    Predictive prefetch: after a list page is served, scrapes the next page for
+    the same filters and the detail pages of the first PREFETCH_DETAILS companies
+    in the background, so the user's next click is a cache hit.
+
+    - One prefetch runs at a time, as a background scrape (yields to users
+      queued for the browser), leaving the other browser slots to users.
+    - Keys already queued, or cached and fresh, are not scraped again.
+    - Only real scrapes spend the per-minute budget. Work that would exceed it,
+      or that waited longer than PREFETCH_MAX_AGE, is dropped (the user has
+      moved on by then).
+    - A prefetched key requested by a user within PREFETCH_HIT_WINDOW is a hit,
+      one never requested is wasted.
+    """
+
+    def __init__(self):
+        self.service = ForgeGlobalService()
+        self._task: Optional[asyncio.Task] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_QUEUE_MAX)
+        self._queued: Set[Tuple[str, str]] = set()
+
+        # Times of the scrapes made in the last minute (budget)
+        self._spent: Deque[float] = deque()
+
+        # Prefetched keys not yet requested by a user, oldest first
+        self._prefetched: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
+        # Diagnostics
+        self.counts: Dict[str, int] = {
+            "scheduled": 0, "deduplicated": 0, "cached": 0, "scraped": 0, "errors": 0,
+            "dropped_queue_full": 0, "dropped_budget": 0, "dropped_expired": 0,
+            "hits": 0, "wasted": 0,
+        }
+        self.state = "idle"
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print("Prefetch scheduler started.")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            print("Prefetch scheduler stopped.")
+
+    def after_list(
+        self, sector: Optional[str], valuation: Optional[str], page_num: int, rows: List[UnifiedCompanyData]
+    ):
+        """Queues the predicted next requests after a list page was served. Never blocks."""
+        if self._task is None or not rows:
+            return
+        # Only a full page can have a next one; past a confirmed end there is none
+        end = (self.service.get_list_meta(sector, valuation) or {}).get("end")
+        if len(rows) >= PAGE_SIZE and (end is None or page_num < end):
+            key = self.service.list_cache_key(sector, valuation, page_num + 1)
+            self._schedule(("list", key, sector, valuation, page_num + 1, time.monotonic()))
+        for row in rows[:PREFETCH_DETAILS]:
+            slug = row.raw_data.get("slug")
+            if slug:
+                self._schedule(("detail", slug, None, None, 0, time.monotonic()))
+
+    def record_request(self, kind: str, key: str):
+        """Called for every user request, to count prefetch hits."""
+        self._expire()
+        if self._prefetched.pop((kind, key), None) is not None:
+            self.counts["hits"] += 1
+            PREFETCHES.labels(kind, "hit").inc()
+
+    def _schedule(self, item: PrefetchItem):
+        kind, key = item[0], item[1]
+        if (kind, key) in self._queued or (kind, key) in self._prefetched:
+            self.counts["deduplicated"] += 1
+            return
+        if self._is_fresh(item):
+            self.counts["cached"] += 1
+            return
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.counts["dropped_queue_full"] += 1
+            PREFETCHES.labels(kind, "dropped").inc()
+            return
+        self._queued.add((kind, key))
+        self.counts["scheduled"] += 1
+
+    def _is_fresh(self, item: PrefetchItem) -> bool:
+        kind, key, sector, valuation, page_num, _ = item
+        if kind == "list":
+            return self.service.is_list_fresh(sector, valuation, page_num)
+        return self.service.is_detail_fresh(key)
+
+    async def _run(self):
+        # Everything scraped from this task yields to interactive traffic
+        background_scrape.set(True)
+        while True:
+            self.state = "idle"
+            item = await self._queue.get()
+            try:
+                await self._prefetch(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counts["errors"] += 1
+                print(f"Prefetch error for {item[0]} {item[1]}: {e}")
+            finally:
+                self._queued.discard((item[0], item[1]))
+
+    async def _prefetch(self, item: PrefetchItem):
+        kind, key, sector, valuation, page_num, queued_at = item
+
+        # 1. Skip what a user (or the crawler) fetched in the meantime
+        if self._is_fresh(item) or (kind == "detail" and self.service.revalidate_detail(key)):
+            self.counts["cached"] += 1
+            PREFETCHES.labels(kind, "cached").inc()
+            return
+
+        # 2. Users queued for the browser go first
+        while self.service.interactive_waiting() > 0:
+            self.state = "paused"
+            await asyncio.sleep(PREFETCH_PAUSE_POLL)
+
+        # 3. Too late to help, or over budget: drop
+        if time.monotonic() - queued_at > PREFETCH_MAX_AGE:
+            self.counts["dropped_expired"] += 1
+            PREFETCHES.labels(kind, "dropped").inc()
+            return
+        if not self._take_budget():
+            self.counts["dropped_budget"] += 1
+            PREFETCHES.labels(kind, "dropped").inc()
+            return
+
+        # 4. Scrape into the cache
+        self.state = "prefetching"
+        if kind == "list":
+            result = await self.service.scrape(
+                sector=sector, valuation=valuation, page_num=page_num, speed=SpeedProfile.NORMAL
+            )
+        else:
+            result = await self.service.scrape_company_detail(key)
+        if not result:
+            self.counts["errors"] += 1
+            PREFETCHES.labels(kind, "error").inc()
+            return
+        self.counts["scraped"] += 1
+        PREFETCHES.labels(kind, "scraped").inc()
+        self._prefetched[(kind, key)] = time.monotonic()
+        self._prefetched.move_to_end((kind, key))
+
+    def _budget_used(self) -> int:
+        """Scrapes made in the last minute (sliding window)."""
+        now = time.monotonic()
+        while self._spent and now - self._spent[0] >= 60:
+            self._spent.popleft()
+        return len(self._spent)
+
+    def _take_budget(self) -> bool:
+        if self._budget_used() >= PREFETCH_BUDGET_PER_MINUTE:
+            return False
+        self._spent.append(time.monotonic())
+        return True
+
+    def _expire(self):
+        """Prefetched keys nobody asked for within PREFETCH_HIT_WINDOW count as wasted."""
+        cutoff = time.monotonic() - PREFETCH_HIT_WINDOW
+        while self._prefetched:
+            (kind, key), prefetched_at = next(iter(self._prefetched.items()))
+            if prefetched_at > cutoff:
+                break
+            del self._prefetched[(kind, key)]
+            self.counts["wasted"] += 1
+            PREFETCHES.labels(kind, "wasted").inc()
+
+    def stats(self) -> dict:
+        self._expire()
+        hits, wasted = self.counts["hits"], self.counts["wasted"]
+        return {
+            "running": self._task is not None,
+            "state": self.state,
+            "queued": self._queue.qsize(),
+            "awaiting_request": len(self._prefetched),
+            **self.counts,
+            # Settled prefetches only: those still inside the hit window are left out
+            "hit_rate": round(hits / (hits + wasted), 3) if hits + wasted else None,
+            "budget_per_minute": PREFETCH_BUDGET_PER_MINUTE,
+            "budget_used": self._budget_used(),
+        }
+
+# Global instance
+prefetcher = PrefetchScheduler()
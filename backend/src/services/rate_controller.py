@@ -0,0 +1,135 @@
+import time
+import asyncio
+from typing import Dict, Optional
+from src.config import (
+    SpeedProfile, SPEED_RATE_CAPS, RATE_INITIAL, RATE_MIN, RATE_MAX, RATE_BURST,
+    RATE_INCREASE, RATE_DECREASE, RATE_SLOW_LATENCY, RATE_SLOW_FACTOR,
+    RATE_COOLDOWN, RATE_COOLDOWN_MAX, RATE_MAX_WAIT,
+)
+
+class RateLimitExceeded(Exception):
+    """The request would have to wait longer than its limit to be sent."""
+
+class RateController:
+    """
+    Paces every request to Forge (HTTP fast path and browser navigations) with a
+    token bucket whose rate adapts AIMD-style:
+
+    - Healthy, fast responses add RATE_INCREASE req/s, up to RATE_MAX.
+    - Slow responses (> RATE_SLOW_LATENCY) ease the rate by RATE_SLOW_FACTOR.
+    - Throttling (403/429/503), challenge pages and timeouts cut it by RATE_DECREASE;
+      throttling and challenges also pause all requests for a cooldown that
+      doubles while they keep coming.
+
+    A request's SpeedProfile caps the rate it can be sent at (SPEED_RATE_CAPS);
+    it no longer adds a fixed sleep. Callers take their token before any browser
+    slot, page or worker, so a cooldown doesn't hold those, and give up after
+    RATE_MAX_WAIT instead of sitting out a long cooldown.
+    """
+
+    def __init__(self):
+        self.rate = RATE_INITIAL
+        self._tokens = float(RATE_BURST)
+        self._last_refill = time.monotonic()
+        self._last_request = 0.0
+        self._cooldown_until = 0.0
+        self._failure_streak = 0
+        self._lock = asyncio.Lock()
+
+        # Diagnostics
+        self.latency_ewma: Optional[float] = None
+        self.counts: Dict[str, int] = {"ok": 0, "slow": 0, "throttled": 0, "challenge": 0, "timeout": 0}
+        self.waited = 0.0
+        self.rejected = 0
+
+    async def acquire(self, speed: SpeedProfile = SpeedProfile.FAST, max_wait: Optional[float] = RATE_MAX_WAIT):
+        """
+        Waits until the next request may be sent. Callers queue in order.
+        Raises RateLimitExceeded, without taking a token, as soon as the wait
+        (queueing included) is known to exceed max_wait; None waits as long as needed.
+        """
+        cap = SPEED_RATE_CAPS[speed]
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(max_wait):
+                async with self._lock:
+                    while True:
+                        now = time.monotonic()
+                        self._tokens = min(RATE_BURST, self._tokens + (now - self._last_refill) * self.rate)
+                        self._last_refill = now
+
+                        wait = max(
+                            self._cooldown_until - now,
+                            (1 - self._tokens) / self.rate if self._tokens < 1 else 0,
+                            self._last_request + 1 / cap - now,
+                        )
+                        if wait <= 0:
+                            break
+                        if max_wait is not None and now + wait - started > max_wait:
+                            raise RateLimitExceeded(f"next request slot in {wait:.0f}s ({self.state})")
+                        await asyncio.sleep(wait)
+
+                    self._tokens -= 1
+                    self._last_request = time.monotonic()
+                    self.waited += self._last_request - started
+        except TimeoutError:
+            self.rejected += 1
+            raise RateLimitExceeded(f"waited {max_wait}s behind other requests") from None
+        except RateLimitExceeded:
+            self.rejected += 1
+            raise
+
+    def record_success(self, latency: float):
+        """A normal page came back after `latency` seconds."""
+        self._failure_streak = 0
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+        if latency > RATE_SLOW_LATENCY:
+            self.counts["slow"] += 1
+            self.rate = max(RATE_MIN, self.rate * RATE_SLOW_FACTOR)
+        else:
+            self.counts["ok"] += 1
+            self.rate = min(RATE_MAX, self.rate + RATE_INCREASE)
+
+    def record_failure(self, kind: str):
+        """
+        Upstream pushed back: kind is "throttled" (403/429/503), "challenge"
+        (bot check page) or "timeout".
+        """
+        self.counts[kind] += 1
+        self.rate = max(RATE_MIN, self.rate * RATE_DECREASE)
+        if kind in ("throttled", "challenge"):
+            self._failure_streak += 1
+            cooldown = min(RATE_COOLDOWN_MAX, RATE_COOLDOWN * 2 ** (self._failure_streak - 1))
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + cooldown)
+            print(f"Upstream {kind}: rate cut to {self.rate:.2f} req/s, pausing {cooldown:.0f}s")
+
+    def record_status(self, status: Optional[int], latency: float, challenge: bool = False):
+        """Classifies a response by status code / challenge marker and records it."""
+        if status in (403, 429, 503):
+            self.record_failure("throttled")
+        elif challenge:
+            self.record_failure("challenge")
+        else:
+            self.record_success(latency)
+
+    @property
+    def state(self) -> str:
+        if time.monotonic() < self._cooldown_until:
+            return "cooldown"
+        if self.rate >= RATE_MAX:
+            return "max"
+        return "probing" if self._failure_streak == 0 else "backing_off"
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "rate_per_sec": round(self.rate, 3),
+            "cooldown_remaining": round(max(0.0, self._cooldown_until - time.monotonic()), 1),
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "waited_seconds": round(self.waited, 1),
+            "rejected": self.rejected,
+            **self.counts,
+        }
+
+# Global instance
+rate_controller = RateController()
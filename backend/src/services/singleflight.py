@@ -0,0 +1,82 @@
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+class Flight:
+    """
+    One in-flight call and the contexts of the callers currently awaiting it.
+    The work runs in its own context, so per-caller context variables (progress
+    reporters, background priority) are read from here, not from whoever started it.
+    """
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.callers: List[contextvars.Context] = []
+
+    def values(self, var: contextvars.ContextVar) -> List[Any]:
+        """`var` as seen by each waiting caller."""
+        return [ctx.run(var.get) for ctx in self.callers]
+
+# The flight the current code runs in (None outside SingleFlight.do)
+current_flight: contextvars.ContextVar[Optional[Flight]] = contextvars.ContextVar("current_flight", default=None)
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller starts the work,
+    everyone else arriving before it finishes awaits the same in-flight task.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[str, Flight] = {}
+        self._callers: Dict[str, int] = {}
+
+        # Totals for diagnostics
+        self.flights = 0
+        self.callers = 0
+        self.max_callers = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            # Run as its own task so one cancelled caller doesn't cancel the others
+            flight = Flight()
+            context = contextvars.copy_context()
+            context.run(current_flight.set, flight)
+            flight.task = asyncio.create_task(fn(), context=context)
+            self._flights[key] = flight
+            self._callers[key] = 0
+            flight.task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        else:
+            print(f"Joining in-flight {self.name} scrape: {key}")
+
+        self._callers[key] += 1
+        self.callers += 1
+        caller = contextvars.copy_context()
+        flight.callers.append(caller)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.callers.remove(caller)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    def _finish(self, key: str, task: asyncio.Task):
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        callers = self._callers.pop(key, 0)
+        self.flights += 1
+        self.max_callers = max(self.max_callers, callers)
+        if callers > 1:
+            print(f"Flight {self.name}:{key} served {callers} callers")
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "flights": self.flights,
+            "callers": self.callers,
+            "coalesced": self.callers - self.flights - len(self._flights),
+            "max_callers": self.max_callers,
+        }
@@ -0,0 +1,206 @@
+import os
+import re
+import asyncio
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+from src.config import SNAPSHOT_DIR
+from src.models.schemas import UnifiedCompanyData, CompanyDetail
+
+# pyarrow is optional (the "analytics" extra); snapshots are disabled without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FORMATS = {"parquet": "parquet", "arrow": "arrow"}  # format -> file extension
+
+_DATE_DIR_RE = re.compile(r"^snapshot_date=(\d{4}-\d{2}-\d{2})$")
+
+def _companies_schema():
+    return pa.schema([
+        ("slug", pa.string()),
+        ("name", pa.string()),
+        ("sector", pa.string()),
+        ("subsector", pa.string()),
+        ("round", pa.string()),
+        ("forge_price", pa.string()),
+        ("price_usd", pa.float64()),
+        ("change_usd", pa.float64()),
+        ("change_pct", pa.float64()),
+        ("last_matched_price", pa.string()),
+        ("last_matched_price_usd", pa.float64()),
+        ("post_money_valuation", pa.string()),
+        ("valuation_usd", pa.float64()),
+        ("price_per_share", pa.string()),
+        ("price_per_share_usd", pa.float64()),
+        ("amount_raised", pa.string()),
+        ("amount_raised_usd", pa.float64()),
+        ("logo_url", pa.string()),
+        ("founded", pa.string()),
+        ("headquarters", pa.string()),
+        ("employees", pa.string()),
+        ("website", pa.string()),
+        ("scraped_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+def _funding_rounds_schema():
+    return pa.schema([
+        ("slug", pa.string()),
+        ("company", pa.string()),
+        ("round_index", pa.int32()),  # Order on the company page, newest first
+        ("round_label", pa.string()),
+        ("date", pa.string()),
+        ("round_date", pa.date32()),
+        ("amount_raised", pa.string()),
+        ("amount_raised_usd", pa.float64()),
+        ("price_per_share", pa.string()),
+        ("price_per_share_usd", pa.float64()),
+        ("valuation", pa.string()),
+        ("valuation_usd", pa.float64()),
+        ("investors", pa.list_(pa.string())),
+        ("shares_outstanding", pa.string()),
+        ("liquidation_preference_order", pa.string()),
+        ("liquidation_preference_multiple", pa.string()),
+        ("conversion_ratio", pa.string()),
+        ("dividend_rate", pa.string()),
+        ("dividend_type", pa.string()),
+        ("participation_type", pa.string()),
+        ("participation_cap", pa.string()),
+        ("scraped_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+def _utc(value: datetime) -> datetime:
+    # Models store naive UTC timestamps (datetime.utcnow)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+class SnapshotExporter:
+    """
+    Writes the catalog and a flattened funding-rounds table as Parquet and Arrow IPC
+    files, one Hive-style partition per snapshot day:
+
+        {SNAPSHOT_DIR}/{parquet|arrow}/{table}/snapshot_date=YYYY-MM-DD/part-0.{ext}
+
+    Raw display strings are kept next to parsed numeric columns (*_usd, round_date).
+    The Arrow files are uncompressed IPC, so pa.memory_map + pa.ipc.open_file reads
+    them without copying.
+    """
+
+    def __init__(self, root: str = SNAPSHOT_DIR):
+        self.root = root
+        self._lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        return pa is not None
+
+    async def write(self, rows: List[UnifiedCompanyData], details: List[CompanyDetail]) -> Dict[str, object]:
+        """
+        Writes today's partition from catalog rows and company details, replacing
+        any earlier snapshot of the same day. Runs in a thread.
+        """
+        day = datetime.now(timezone.utc).date()
+        async with self._lock:
+            counts = await asyncio.to_thread(self._write_sync, day, rows, details)
+        print(f"Wrote snapshot {day}: {counts}")
+        return {"date": day.isoformat(), "tables": counts}
+
+    def dates(self) -> List[str]:
+        """Snapshot days on disk, newest first."""
+        table_dir = os.path.join(self.root, "parquet", "companies")
+        if not os.path.isdir(table_dir):
+            return []
+        found = [m.group(1) for m in map(_DATE_DIR_RE.match, os.listdir(table_dir)) if m]
+        return sorted(found, reverse=True)
+
+    def path(self, day: str, table: str, fmt: str) -> Optional[str]:
+        """File for one table of one snapshot ("latest" picks the newest), or None."""
+        if day == "latest":
+            days = self.dates()
+            if not days:
+                return None
+            day = days[0]
+        path = os.path.join(self.root, fmt, table, f"snapshot_date={day}", f"part-0.{FORMATS[fmt]}")
+        return path if os.path.isfile(path) else None
+
+    def _write_sync(self, day: date, rows: List[UnifiedCompanyData], details: List[CompanyDetail]) -> Dict[str, int]:
+        tables = {
+            "companies": self._companies_table(rows, {d.slug: d for d in details}),
+            "funding_rounds": self._funding_rounds_table(details),
+        }
+        for name, table in tables.items():
+            self._write_file(os.path.join(self.root, "parquet", name, f"snapshot_date={day}", "part-0.parquet"),
+                             lambda tmp: pq.write_table(table, tmp, compression="zstd"))
+            self._write_file(os.path.join(self.root, "arrow", name, f"snapshot_date={day}", "part-0.arrow"),
+                             lambda tmp: self._write_ipc(table, tmp))
+        return {name: table.num_rows for name, table in tables.items()}
+
+    @staticmethod
+    def _write_file(path: str, write):
+        # Write next to the target and rename, so readers never see a partial file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        write(tmp)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _write_ipc(table, path: str):
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def _companies_table(self, rows: List[UnifiedCompanyData], details: Dict[str, CompanyDetail]):
+        schema = _companies_schema()
+        columns: Dict[str, list] = {field.name: [] for field in schema}
+        for row in rows:
+            raw = row.raw_data
+            detail = details.get(raw.get("slug"))
+            columns["slug"].append(raw.get("slug"))
+            columns["name"].append(row.name)
+            columns["sector"].append(raw.get("sector"))
+            columns["subsector"].append(raw.get("subsector"))
+            columns["round"].append(raw.get("round"))
+            columns["logo_url"].append(raw.get("logo_url"))
+            for field, usd_col in (
+                ("forge_price", "price_usd"),
+                ("last_matched_price", "last_matched_price_usd"),
+                ("post_money_valuation", "valuation_usd"),
+                ("price_per_share", "price_per_share_usd"),
+                ("amount_raised", "amount_raised_usd"),
+            ):
+                columns[field].append(raw.get(field))
+                columns[usd_col].append(raw.get(usd_col))
+            columns["change_usd"].append(raw.get("change_usd"))
+            columns["change_pct"].append(raw.get("change_pct"))
+            for field in ("founded", "headquarters", "employees", "website"):
+                columns[field].append(getattr(detail, field) if detail else None)
+            columns["scraped_at"].append(_utc(row.date_scraped))
+        return pa.Table.from_pydict(columns, schema=schema)
+
+    def _funding_rounds_table(self, details: List[CompanyDetail]):
+        schema = _funding_rounds_schema()
+        columns: Dict[str, list] = {field.name: [] for field in schema}
+        extra = ("shares_outstanding", "liquidation_preference_order", "liquidation_preference_multiple",
+                 "conversion_ratio", "dividend_rate", "dividend_type", "participation_type", "participation_cap")
+        for detail in details:
+            for index, funding_round in enumerate(detail.funding_history):
+                columns["slug"].append(detail.slug)
+                columns["company"].append(detail.name)
+                columns["round_index"].append(index)
+                columns["round_label"].append(funding_round.round_label)
+                columns["date"].append(funding_round.date)
+                columns["round_date"].append(
+                    date.fromisoformat(funding_round.date_iso) if funding_round.date_iso else None
+                )
+                for field in ("amount_raised", "price_per_share", "valuation"):
+                    columns[field].append(getattr(funding_round, field))
+                    columns[f"{field}_usd"].append(getattr(funding_round, f"{field}_usd"))
+                columns["investors"].append(funding_round.investors)
+                for field in extra:
+                    columns[field].append(getattr(funding_round, field))
+                columns["scraped_at"].append(_utc(detail.scraped_at))
+        return pa.Table.from_pydict(columns, schema=schema)
+
+# Global instance
+snapshot_exporter = SnapshotExporter()
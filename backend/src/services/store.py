@@ -0,0 +1,233 @@
+import os
+import asyncio
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from src.config import STORE_PATH, CHANGE_FEED_MAX
+from pydantic import TypeAdapter
+from src.models.schemas import UnifiedCompanyData, CompanyDetail, ChangeEvent
+
+_list_adapter = TypeAdapter(List[UnifiedCompanyData])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS list_pages (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS list_meta (
+    key TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    pages INTEGER NOT NULL,
+    last_page INTEGER,
+    scraped_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS company_details (
+    slug TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS price_history (
+    slug TEXT PRIMARY KEY,
+    ts BLOB NOT NULL,
+    price BLOB NOT NULL,
+    valuation BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS row_fingerprints (
+    slug TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    changed_at REAL NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS change_feed (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_list_pages_scraped_at ON list_pages (scraped_at);
+CREATE INDEX IF NOT EXISTS idx_company_details_scraped_at ON company_details (scraped_at);
+"""
+
+class ResultStore:
+    """
+    Embedded SQLite store (WAL mode) that persists scraped list pages and company
+    details so a restart starts warm. All queries, and the JSON encoding and
+    decoding around them, run in a worker thread; a lock serializes access to the
+    shared connection.
+    """
+    _instance: Optional['ResultStore'] = None
+    _conn: Optional[sqlite3.Connection] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ResultStore, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    async def open(self, path: str = STORE_PATH):
+        """Opens (and creates) the database file."""
+        if self._conn is None:
+            await asyncio.to_thread(self._open, path)
+            print(f"Result store opened at {path}.")
+
+    def _open(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+    async def close(self):
+        """Closes the database file."""
+        if self._conn is not None:
+            # Waits for queries in flight, so not on the event loop
+            await asyncio.to_thread(self._close)
+            print("Result store closed.")
+
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    def _executemany(self, sql: str, params: List[tuple]):
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.executemany(sql, params)
+            self._conn.commit()
+
+    async def save_list(self, key: str, rows: List[UnifiedCompanyData], scraped_at: float):
+        def save():
+            payload = "[" + ",".join(row.model_dump_json() for row in rows) + "]"
+            self._execute(
+                "INSERT OR REPLACE INTO list_pages (key, payload, scraped_at) VALUES (?, ?, ?)",
+                (key, payload, scraped_at),
+            )
+        await asyncio.to_thread(save)
+
+    async def save_detail(self, detail: CompanyDetail, scraped_at: float):
+        def save():
+            self._execute(
+                "INSERT OR REPLACE INTO company_details (slug, payload, scraped_at) VALUES (?, ?, ?)",
+                (detail.slug, detail.model_dump_json(), scraped_at),
+            )
+        await asyncio.to_thread(save)
+
+    async def save_meta(self, key: str, meta: Dict[str, int], scraped_at: float):
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO list_meta (key, total, pages, last_page, scraped_at) VALUES (?, ?, ?, ?, ?)",
+            (key, meta["total"], meta["pages"], meta.get("end"), scraped_at),
+        )
+
+    async def load_meta(self, since: float, limit: int) -> List[Tuple[str, Dict[str, int], float]]:
+        """Pagination totals (and the confirmed last page, if known) recorded after `since`, newest first."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT key, total, pages, last_page, scraped_at FROM list_meta WHERE scraped_at > ? ORDER BY scraped_at DESC LIMIT ?",
+            (since, limit),
+        )
+        loaded = []
+        for key, total, pages, last_page, scraped_at in rows:
+            meta = {"total": total, "pages": pages}
+            if last_page is not None:
+                meta["end"] = last_page
+            loaded.append((key, meta, scraped_at))
+        return loaded
+
+    async def load_lists(self, since: float, limit: int) -> List[Tuple[str, List[UnifiedCompanyData], float]]:
+        """List pages scraped after `since`, newest first."""
+        def load():
+            rows = self._execute(
+                "SELECT key, payload, scraped_at FROM list_pages WHERE scraped_at > ? ORDER BY scraped_at DESC LIMIT ?",
+                (since, limit),
+            )
+            return [
+                (key, _list_adapter.validate_json(payload), scraped_at)
+                for key, payload, scraped_at in rows
+            ]
+        return await asyncio.to_thread(load)
+
+    async def load_details(self, since: float, limit: int) -> List[Tuple[CompanyDetail, float]]:
+        """Company details scraped after `since`, newest first."""
+        def load():
+            rows = self._execute(
+                "SELECT payload, scraped_at FROM company_details WHERE scraped_at > ? ORDER BY scraped_at DESC LIMIT ?",
+                (since, limit),
+            )
+            return [(CompanyDetail.model_validate_json(payload), scraped_at) for payload, scraped_at in rows]
+        return await asyncio.to_thread(load)
+
+    async def touch_detail(self, slug: str, validated_at: float):
+        """Marks a stored detail as confirmed current without rewriting it."""
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE company_details SET scraped_at = ? WHERE slug = ?",
+            (validated_at, slug),
+        )
+
+    async def save_fingerprints(self, rows: List[Tuple[str, str, str, float, float]]):
+        await asyncio.to_thread(
+            self._executemany,
+            "INSERT OR REPLACE INTO row_fingerprints (slug, fingerprint, fields, changed_at, seen_at) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    async def load_fingerprints(self) -> List[Tuple[str, str, str, float, float]]:
+        return await asyncio.to_thread(
+            self._execute, "SELECT slug, fingerprint, fields, changed_at, seen_at FROM row_fingerprints"
+        )
+
+    async def save_changes(self, events: List[ChangeEvent]):
+        """Appends change events, keeping only the newest CHANGE_FEED_MAX."""
+        def save():
+            self._executemany(
+                "INSERT INTO change_feed (payload) VALUES (?)",
+                [(event.model_dump_json(),) for event in events],
+            )
+            self._execute(
+                "DELETE FROM change_feed WHERE id <= (SELECT MAX(id) FROM change_feed) - ?",
+                (CHANGE_FEED_MAX,),
+            )
+        await asyncio.to_thread(save)
+
+    async def load_changes(self, limit: int) -> List[ChangeEvent]:
+        """The most recent change feed events, oldest first."""
+        def load():
+            rows = self._execute(
+                "SELECT payload FROM (SELECT id, payload FROM change_feed ORDER BY id DESC LIMIT ?) ORDER BY id",
+                (limit,),
+            )
+            return [ChangeEvent.model_validate_json(payload) for (payload,) in rows]
+        return await asyncio.to_thread(load)
+
+    async def save_series(self, series: List[Tuple[str, bytes, bytes, bytes]]):
+        """Replaces the packed (slug, ts, price, valuation) arrays of price histories."""
+        await asyncio.to_thread(
+            self._executemany,
+            "INSERT OR REPLACE INTO price_history (slug, ts, price, valuation) VALUES (?, ?, ?, ?)",
+            series,
+        )
+
+    async def load_series(self) -> List[Tuple[str, bytes, bytes, bytes]]:
+        """Every packed price history."""
+        return await asyncio.to_thread(self._execute, "SELECT slug, ts, price, valuation FROM price_history")
+
+# Global instance
+result_store = ResultStore()
@@ -0,0 +1,200 @@
+import math
+import time
+import asyncio
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.config import HISTORY_MIN_INTERVAL, HISTORY_RETENTION_DAYS, HISTORY_FLUSH_INTERVAL
+from src.models.schemas import UnifiedCompanyData, CompanyDetail
+from src.services.store import result_store
+
+NAN = float("nan")
+
+def _f32(value: Optional[float]) -> float:
+    """Rounds to what a float32 array stores (None -> NaN) so comparisons match."""
+    return NAN if value is None else array("f", [value])[0]
+
+def _same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+def _value(x: float) -> Optional[float]:
+    return None if math.isnan(x) else x
+
+def latest_round_valuation(detail: CompanyDetail) -> Optional[float]:
+    """Valuation of the most recent dated funding round (None without one)."""
+    dated = [r for r in detail.funding_history if r.date_iso and r.valuation_usd is not None]
+    return max(dated, key=lambda r: r.date_iso).valuation_usd if dated else None
+
+class PriceSeries:
+    """
+    One company's observations as three parallel typed arrays:
+    uint32 epoch seconds, float32 Forge Price, float32 valuation of the latest
+    funding round (post-money; NaN = not shown).
+    12 bytes per point, no per-point Python objects.
+    """
+    __slots__ = ("ts", "price", "valuation")
+
+    def __init__(self):
+        self.ts = array("I")
+        self.price = array("f")
+        self.valuation = array("f")
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def append(self, ts: int, price: float, valuation: float) -> bool:
+        """Adds a point unless it repeats the last one within HISTORY_MIN_INTERVAL."""
+        if self.ts:
+            last = len(self.ts) - 1
+            if ts <= self.ts[last]:
+                return False
+            if (_same(price, self.price[last]) and _same(valuation, self.valuation[last])
+                    and ts - self.ts[last] < HISTORY_MIN_INTERVAL):
+                return False
+        self.ts.append(ts)
+        self.price.append(price)
+        self.valuation.append(valuation)
+        return True
+
+    def trim(self, before: int) -> int:
+        """Drops points older than `before`; returns how many."""
+        cut = bisect_left(self.ts, before)
+        if cut:
+            del self.ts[:cut]
+            del self.price[:cut]
+            del self.valuation[:cut]
+        return cut
+
+    def sample(self, start: float, end: float, points: int) -> List[Tuple[int, Optional[float], Optional[float]]]:
+        """
+        Downsamples to `points` evenly spaced times between start and end, taking
+        the last observation at or before each time (None before the first one).
+        """
+        step = (end - start) / (points - 1) if points > 1 else 0
+        result = []
+        for i in range(points):
+            t = end if points == 1 else start + i * step
+            idx = bisect_right(self.ts, t) - 1
+            if idx < 0:
+                result.append((int(t), None, None))
+            else:
+                result.append((int(t), _value(self.price[idx]), _value(self.valuation[idx])))
+        return result
+
+    def pack(self) -> Tuple[bytes, bytes, bytes]:
+        return self.ts.tobytes(), self.price.tobytes(), self.valuation.tobytes()
+
+    @classmethod
+    def unpack(cls, ts: bytes, price: bytes, valuation: bytes) -> "PriceSeries":
+        series = cls()
+        series.ts.frombytes(ts)
+        series.price.frombytes(price)
+        series.valuation.frombytes(valuation)
+        return series
+
+class PriceHistory:
+    """
+    Every observed Forge Price and latest-round valuation per company slug,
+    recorded from list pages and detail pages. Series live in memory as packed arrays and are written
+    to the result store (one BLOB row per slug) every HISTORY_FLUSH_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self._series: Dict[str, PriceSeries] = {}
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, slug: Optional[str], price: Optional[float], valuation: Optional[float], ts: Optional[float] = None):
+        if not slug or (price is None and valuation is None):
+            return
+        series = self._series.get(slug)
+        if series is None:
+            series = self._series[slug] = PriceSeries()
+        if series.append(int(ts or time.time()), _f32(price), _f32(valuation)):
+            self._dirty.add(slug)
+
+    def record_rows(self, rows: Iterable[UnifiedCompanyData]):
+        now = time.time()
+        for row in rows:
+            raw = row.raw_data
+            # valuation_usd of a list row is its Post-Money Valuation column (latest round)
+            self.record(raw.get("slug"), raw.get("price_usd"), raw.get("valuation_usd"), now)
+
+    def record_detail(self, detail: CompanyDetail):
+        """
+        Records a detail page with the same metrics as its list row: the Forge Price
+        and the latest round's valuation, not the page's Forge Price valuation.
+        """
+        self.record(detail.slug, detail.price_usd, latest_round_valuation(detail))
+
+    def query(self, slugs: List[str], days: float, points: int) -> Dict[str, List[Tuple[int, Optional[float], Optional[float]]]]:
+        """Last `days` of each slug downsampled to `points` (slugs without history get an empty list)."""
+        end = time.time()
+        start = end - days * 86400
+        return {
+            slug: self._series[slug].sample(start, end, points) if slug in self._series else []
+            for slug in dict.fromkeys(slugs)
+        }
+
+    async def start(self):
+        """Loads persisted series and starts the periodic flush (needs the result store)."""
+        if not result_store.is_open or self._task is not None:
+            return
+        try:
+            for slug, ts, price, valuation in await result_store.load_series():
+                loaded = PriceSeries.unpack(ts, price, valuation)
+                current = self._series.get(slug)
+                # Points recorded since startup come after the persisted ones
+                if current is not None:
+                    for i in range(len(current)):
+                        loaded.append(current.ts[i], current.price[i], current.valuation[i])
+                self._series[slug] = loaded
+            print(f"Loaded price history for {len(self._series)} companies.")
+        except Exception as e:
+            print(f"Error loading price history: {e}")
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stops the flush loop and writes what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(HISTORY_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def flush(self):
+        """Writes changed series to the store, dropping points past HISTORY_RETENTION_DAYS."""
+        if not self._dirty or not result_store.is_open:
+            return
+        before = int(time.time() - HISTORY_RETENTION_DAYS * 86400)
+        dirty, self._dirty = self._dirty, set()
+        packed = []
+        for slug in dirty:
+            series = self._series[slug]
+            series.trim(before)
+            packed.append((slug, *series.pack()))
+        try:
+            await result_store.save_series(packed)
+        except Exception as e:
+            print(f"Error saving price history: {e}")
+            self._dirty |= dirty
+
+    def stats(self) -> dict:
+        points = sum(len(series) for series in self._series.values())
+        return {
+            "companies": len(self._series),
+            "points": points,
+            "bytes": points * 12,
+            "unsaved": len(self._dirty),
+        }
+
+# Global instance
+price_history = PriceHistory()
@@ -0,0 +1,322 @@
+import signal
+import asyncio
+import multiprocessing
+from typing import Any, Callable, Dict, Optional
+from src.config import (
+    WORKER_POOL, WORKER_MEMORY_MB, WORKER_RESERVED_MB, WORKER_MAX,
+    WORKER_TASK_TIMEOUT, WORKER_ACQUIRE_TIMEOUT, WORKER_MAX_TASKS, WORKER_RSS_LIMIT_MB, WORKER_RESTART_BACKOFF_MAX,
+)
+from src.services.browser_manager import browser_manager
+from src.services.browser_tasks import run_page_task, new_outcome
+from src.services.memory import available_memory_mb, usable_cpus
+from src.services.metrics import buffer_stages, drain_stages
+
+def pool_size(setting: str = WORKER_POOL) -> int:
+    """
+    Number of browser worker processes: 0 when the pool is off, the pinned number,
+    or for "auto" as many WORKER_MEMORY_MB workers as fit in available memory,
+    at most one per usable CPU. Anything else turns the pool off, with a warning.
+    """
+    if setting in ("", "off", "false", "0"):
+        return 0
+    if setting.isdigit():
+        return int(setting)
+    if setting != "auto":
+        print(f"Warning: WORKER_POOL={setting!r} is not 'off', 'auto' or a worker count; running without workers")
+        return 0
+    memory = available_memory_mb()
+    by_memory = int((memory - WORKER_RESERVED_MB) // WORKER_MEMORY_MB) if memory is not None else 1
+    return max(1, min(by_memory, usable_cpus(), WORKER_MAX))
+
+# Worker process side
+
+def worker_main(conn):
+    """
+    Entry point of a worker process: starts its own Camoufox browser and runs one
+    browser task at a time from the pipe until told to stop (None) or the API
+    process goes away.
+    """
+    # Ctrl+C reaches the whole process group; the API process decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_worker_loop(conn))
+
+async def _worker_loop(conn):
+    loop = asyncio.get_running_loop()
+    inbox: asyncio.Queue = asyncio.Queue()
+
+    def on_readable():
+        try:
+            while conn.poll():
+                inbox.put_nowait(conn.recv())
+        except (EOFError, OSError):
+            loop.remove_reader(conn.fileno())
+            inbox.put_nowait(None)
+
+    loop.add_reader(conn.fileno(), on_readable)
+    # Stage timings travel back with each result (see metrics.observe_stage),
+    # and so does what the memory watchdog did since the previous result
+    buffer_stages()
+    reported = browser_manager.memory_counters()
+    try:
+        await browser_manager.start()
+        browser_manager.start_watchdog()
+        conn.send(("ready", None, None))
+
+        while (message := await inbox.get()) is not None:
+            task_id, kind, url = message
+
+            def report(stage: str, **data):
+                conn.send(("progress", task_id, (stage, data)))
+
+            try:
+                async with browser_manager.lease_page() as page:
+                    outcome = await run_page_task(page, kind, url, report)
+            except Exception as e:
+                outcome = new_outcome(str(e))
+            outcome["rss_mb"] = browser_manager.browser_rss
+            outcome["stages"] = drain_stages()
+            counters = browser_manager.memory_counters()
+            outcome["memory"] = {key: value - reported[key] for key, value in counters.items()}
+            reported = counters
+            conn.send(("result", task_id, outcome))
+    except (BrokenPipeError, EOFError):
+        pass
+    finally:
+        await browser_manager.stop_watchdog()
+        await browser_manager.stop()
+
+# API process side
+
+class Worker:
+    __slots__ = ("id", "process", "conn", "ready", "tasks", "task_id", "retiring", "dead")
+
+    def __init__(self, worker_id: int, process, conn):
+        self.id = worker_id
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.tasks = 0
+        self.task_id: Optional[int] = None  # Task in progress
+        self.retiring = False  # Asked to stop; a replacement is already on its way
+        self.dead = False
+
+class WorkerPool:
+    """
+    Runs browser tasks (see browser_tasks.run_page_task) in separate worker
+    processes, each with its own Camoufox browser, so a slow scrape only holds one
+    worker and the server can use more cores and memory. Tasks go to whichever
+    worker is idle; a task that finds none within WORKER_ACQUIRE_TIMEOUT (say
+    every worker keeps crashing at startup) fails. A worker that crashes or hangs past WORKER_TASK_TIMEOUT is
+    replaced (with backoff while crashes repeat), and one that served
+    WORKER_MAX_TASKS tasks or grew past WORKER_RSS_LIMIT_MB is retired and replaced.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: Dict[int, Worker] = {}
+        self._idle: Optional[asyncio.Queue] = None
+        self._pending: Dict[int, asyncio.Queue] = {}  # task id -> messages for the waiting caller
+        self._next_worker = 0
+        self._next_task = 0
+        self._crash_streak = 0
+        self._stopping = False
+
+        # Diagnostics
+        self.completed = 0
+        self.failed = 0
+        self.crashes = 0
+        self.timeouts = 0
+        self.unavailable = 0
+        self.recycled = 0
+        self.memory: Dict[str, float] = {}  # Watchdog counters summed over all workers
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def start(self):
+        """Spawns the workers; each starts its browser in the background."""
+        if not self.enabled or self._idle is not None:
+            return
+        self._stopping = False
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._spawn()
+        print(f"Browser worker pool started with {self.size} worker(s).")
+
+    async def stop(self):
+        """Asks every worker to close its browser and exit; kills the ones that don't."""
+        if self._idle is None:
+            return
+        self._stopping = True
+        workers = list(self._workers.values())
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            await asyncio.to_thread(worker.process.join, 10)
+            if worker.process.is_alive():
+                worker.process.kill()
+        self._idle = None
+        print("Browser worker pool stopped.")
+
+    async def run(self, kind: str, url: str, report: Callable[..., None]) -> Dict[str, Any]:
+        """
+        Runs one browser task on the next idle worker (the caller has its rate token already).
+        Progress events are forwarded to report(stage, **data) from the caller's task.
+        Returns the task outcome; crashes, timeouts and no worker becoming idle in
+        time come back as an error outcome.
+        """
+        if self._idle is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+
+        # 1. Wait for a live worker
+        acquire_deadline = loop.time() + WORKER_ACQUIRE_TIMEOUT
+        while True:
+            try:
+                worker = await asyncio.wait_for(self._idle.get(), acquire_deadline - loop.time())
+            except asyncio.TimeoutError:
+                self.unavailable += 1
+                return new_outcome(f"No browser worker available after {WORKER_ACQUIRE_TIMEOUT}s")
+            if not worker.dead:
+                break
+
+        # 2. Hand the task over
+        self._next_task += 1
+        task_id = self._next_task
+        messages: asyncio.Queue = asyncio.Queue()
+        self._pending[task_id] = messages
+        worker.task_id = task_id
+        try:
+            worker.conn.send((task_id, kind, url))
+
+            # 3. Relay progress until the result (or the worker's end) arrives
+            deadline = loop.time() + WORKER_TASK_TIMEOUT
+            while True:
+                try:
+                    message, payload = await asyncio.wait_for(messages.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    print(f"Worker {worker.id} timed out on {url}, replacing it")
+                    worker.process.kill()
+                    return new_outcome(f"Worker timed out after {WORKER_TASK_TIMEOUT}s")
+                if message == "progress":
+                    stage, data = payload
+                    report(stage, **data)
+                else:
+                    return payload
+        except OSError as e:
+            return new_outcome(f"Worker unavailable: {e}")
+        finally:
+            self._pending.pop(task_id, None)
+
+    def _spawn(self):
+        if self._stopping or self._idle is None:
+            return
+        self._next_worker += 1
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=worker_main, args=(child_conn,), name=f"browser-worker-{self._next_worker}", daemon=True
+        )
+        process.start()
+        child_conn.close()
+
+        worker = Worker(self._next_worker, process, parent_conn)
+        self._workers[worker.id] = worker
+        loop = asyncio.get_running_loop()
+        loop.add_reader(parent_conn.fileno(), self._on_readable, worker)
+        loop.add_reader(process.sentinel, self._on_exit, worker)
+
+    def _on_readable(self, worker: Worker):
+        try:
+            while worker.conn.poll():
+                message, task_id, payload = worker.conn.recv()
+                if message == "ready":
+                    worker.ready = True
+                    self._idle.put_nowait(worker)
+                elif message == "progress":
+                    if task_id in self._pending:
+                        self._pending[task_id].put_nowait(("progress", payload))
+                elif message == "result":
+                    self._on_result(worker, task_id, payload)
+        except (EOFError, OSError):
+            # The process is gone; _on_exit cleans up
+            asyncio.get_running_loop().remove_reader(worker.conn.fileno())
+
+    def _on_result(self, worker: Worker, task_id: int, outcome: Dict[str, Any]):
+        worker.task_id = None
+        worker.tasks += 1
+        self._crash_streak = 0
+        if outcome.get("error"):
+            self.failed += 1
+        else:
+            self.completed += 1
+        # The caller may have given up (cancelled); the worker is free either way
+        if task_id in self._pending:
+            self._pending[task_id].put_nowait(("result", outcome))
+
+        for key, value in outcome.get("memory", {}).items():
+            self.memory[key] = self.memory.get(key, 0) + value
+
+        rss = outcome.get("rss_mb")
+        if worker.tasks >= WORKER_MAX_TASKS or (rss is not None and rss > WORKER_RSS_LIMIT_MB):
+            print(f"Retiring worker {worker.id} after {worker.tasks} task(s) (browser RSS {rss or 0:.0f} MB)")
+            self.recycled += 1
+            worker.retiring = True
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            self._spawn()
+        elif self._idle is not None:
+            self._idle.put_nowait(worker)
+
+    def _on_exit(self, worker: Worker):
+        loop = asyncio.get_running_loop()
+        loop.remove_reader(worker.process.sentinel)
+        try:
+            loop.remove_reader(worker.conn.fileno())
+        except (OSError, ValueError):
+            pass
+        worker.process.join(1)
+        worker.conn.close()
+        worker.dead = True
+        self._workers.pop(worker.id, None)
+
+        if worker.task_id in self._pending:
+            self._pending[worker.task_id].put_nowait(
+                ("result", new_outcome(f"Worker exited with code {worker.process.exitcode}"))
+            )
+        if worker.retiring or self._stopping:
+            return
+
+        # Unexpected exit (crash, OOM kill, timeout kill): replace it, backing off while it repeats
+        self.crashes += 1
+        self._crash_streak += 1
+        delay = min(WORKER_RESTART_BACKOFF_MAX, 2 ** (self._crash_streak - 1) - 1)
+        print(f"Worker {worker.id} exited with code {worker.process.exitcode}, restarting in {delay}s")
+        loop.call_later(delay, self._spawn)
+
+    def stats(self) -> dict:
+        workers = list(self._workers.values())
+        return {
+            "size": self.size,
+            "alive": len(workers),
+            "ready": sum(1 for w in workers if w.ready),
+            "busy": sum(1 for w in workers if w.task_id is not None),
+            "idle": self._idle.qsize() if self._idle else 0,
+            "completed": self.completed,
+            "failed": self.failed,
+            "crashes": self.crashes,
+            "timeouts": self.timeouts,
+            "unavailable": self.unavailable,
+            "recycled": self.recycled,
+            "memory": {key: round(value, 3) for key, value in self.memory.items()},
+        }
+
+# Global instance
+worker_pool = WorkerPool(pool_size())
@@ -0,0 +1,109 @@
+"""TTL/LRU result cache with stale-while-revalidate (services/cache.py)."""
+import asyncio
+from src.services import cache as cache_module
+from src.services.cache import TTLCache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return TTLCache("test", **{"ttl": 60, "stale_ttl": 30, **kwargs}), clock
+
+
+def test_fresh_until_the_ttl_then_stale_then_gone(monkeypatch):
+    cache, clock = make_cache(monkeypatch)
+    cache.set("k", "v")
+
+    clock.now += 59.9
+    assert cache.is_fresh("k")
+    assert cache.get("k") == "v"
+
+    clock.now += 0.1  # Exactly ttl old
+    assert not cache.is_fresh("k")
+    assert cache.get("k") is None
+    assert "k" in cache
+
+    clock.now += 29.9
+    assert "k" in cache
+    clock.now += 0.1  # ttl + stale_ttl old
+    assert "k" not in cache
+
+
+def test_stale_hit_starts_exactly_one_refresh(monkeypatch):
+    cache, clock = make_cache(monkeypatch)
+    cache.set("k", "old")
+    clock.now += 61
+    calls = []
+    release = asyncio.Event()
+
+    async def loader():
+        calls.append(1)
+        await release.wait()
+        return "new"
+
+    async def main():
+        served = [await cache.get_or_load("k", loader) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert cache.stats()["refreshing"] == 1
+        release.set()
+        while cache.stats()["refreshing"]:
+            await asyncio.sleep(0)
+        return served
+
+    assert asyncio.run(main()) == ["old"] * 3
+    assert calls == [1]
+    assert cache.stale_hits == 3
+    assert cache.get("k") == "new"
+
+
+def test_miss_awaits_the_loader_and_skips_empty_results(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+
+    async def empty():
+        return []
+
+    assert asyncio.run(cache.get_or_load("k", empty)) == []
+    assert "k" not in cache
+    assert cache.misses == 1
+
+
+def test_eviction_keeps_the_byte_bound(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_bytes=25, encode=lambda value: value.encode())
+    for key in "abc":
+        cache.set(key, key * 10)
+        cache.get("a")  # Keeps "a" recently used
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 25
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    # Least recently used goes first
+    assert "a" in cache and "b" not in cache and "c" in cache
+
+
+def test_entry_count_bound(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_entries=2)
+    for key in "abc":
+        cache.set(key, key)
+    assert len(cache) == 2
+    assert "a" not in cache
+
+
+def test_etag_follows_the_encoded_value(monkeypatch):
+    cache, _ = make_cache(monkeypatch, encode=lambda value: value.encode())
+    cache.set("k", "one")
+    first = cache.peek("k")
+    assert first.encoded == b"one"
+
+    cache.set("k", "two")
+    assert cache.peek("k").etag != first.etag
+    cache.set("other", "one")
+    assert cache.peek("other").etag == first.etag
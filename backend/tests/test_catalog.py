@@ -0,0 +1,84 @@
+"""Catalog index queries (services/catalog.py)."""
+from datetime import datetime
+from src.models.schemas import UnifiedCompanyData
+from src.services.catalog import CatalogIndex
+
+SECTORS = ("Fintech", "Enterprise Software", "Space")
+ROUNDS = ("Series A", "Series B")
+
+
+def company(n: int, valuation=None) -> UnifiedCompanyData:
+    name = f"Company {n:02d}"
+    return UnifiedCompanyData(
+        name=name, sector=SECTORS[n % 3], date_scraped=datetime(2026, 1, 1), source="forge_global",
+        raw_data={
+            "slug": f"company-{n:02d}", "sector": SECTORS[n % 3], "subsector": "", "round": ROUNDS[n % 2],
+            "valuation_usd": valuation,
+        },
+    )
+
+
+def index(count: int = 40) -> CatalogIndex:
+    catalog = CatalogIndex()
+    # Every fourth company shows no valuation; 1 and 2 share one
+    catalog.upsert_rows(
+        company(n, None if n % 4 == 0 else 1e9 if n in (1, 2) else n * 1e9) for n in range(count)
+    )
+    return catalog
+
+
+def names(rows):
+    return [row.name for row in rows]
+
+
+def test_missing_values_sort_last_both_ways():
+    catalog = index()
+    for descending in (False, True):
+        rows, total = catalog.query(sort="valuation", descending=descending, size=100)
+        valued = [row for row in rows if row.raw_data["valuation_usd"] is not None]
+        assert total == 40
+        assert rows[:30] == valued
+        assert names(rows[30:]) == sorted(f"Company {n:02d}" for n in range(0, 40, 4))
+    ascending, _ = catalog.query(sort="valuation", size=3)
+    assert names(ascending) == ["Company 01", "Company 02", "Company 03"]
+
+
+def test_small_and_large_matches_sort_alike():
+    catalog = index(120)
+    # Ten matches out of 120 take the direct sort, the whole catalog the sorted-column scan
+    few, _ = catalog.query(q="company 0", sort="valuation", size=100)
+    everything, _ = catalog.query(sort="valuation", size=100)
+    assert names(few) == [row.name for row in everything if row.name.startswith("Company 0")]
+    few, _ = catalog.query(q="company 0", sort="valuation", descending=True, size=100)
+    everything, _ = catalog.query(sort="valuation", descending=True, size=100)
+    assert names(few) == [row.name for row in everything if row.name.startswith("Company 0")]
+
+
+def test_filters_or_within_and_across():
+    catalog = index()
+    _, fintech = catalog.query(filters={"sector": ["fintech"]})
+    _, either = catalog.query(filters={"sector": ["Fintech", "space"]})
+    rows, both = catalog.query(filters={"sector": ["Fintech"], "round": ["series-b"]}, size=100)
+    assert (fintech, either, both) == (14, 27, 7)
+    assert all(row.raw_data["sector"] == "Fintech" and row.raw_data["round"] == "Series B" for row in rows)
+    # Unknown values match nothing, unknown columns are ignored
+    assert catalog.query(filters={"sector": ["Biotech"]}) == ([], 0)
+    assert catalog.query(filters={"color": ["red"]})[1] == 40
+
+
+def test_name_prefix_matches_any_word():
+    catalog = index()
+    rows, total = catalog.query(q="company 1")
+    assert total == 10 and names(rows)[0] == "Company 10"
+    assert catalog.query(q="com", filters={"round": ["Series A"]})[1] == 20
+
+
+def test_page_and_total_math():
+    catalog = index(30)
+    first, total = catalog.query(size=12)
+    last, _ = catalog.query(page=3, size=12)
+    assert total == 30
+    assert names(first)[0] == "Company 00" and len(first) == 12
+    assert names(last) == [f"Company {n}" for n in range(24, 30)]
+    assert catalog.query(page=4, size=12) == ([], 30)
+    assert catalog.query(page=2, size=12, filters={"sector": ["Space"]}) == ([], 10)
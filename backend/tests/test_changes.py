@@ -0,0 +1,46 @@
+"""List row fingerprints and detail revalidation (services/changes.py)."""
+from datetime import datetime
+from src.models.schemas import UnifiedCompanyData
+from src.services.changes import ChangeTracker
+
+
+def row(price="$112.50", price_usd=112.5, valuation="$180B", valuation_usd=180e9, slug="spacex"):
+    return UnifiedCompanyData(
+        name="SpaceX", sector="Aerospace", valuation=valuation, date_scraped=datetime(2026, 1, 1), source="forge_global",
+        raw_data={
+            "slug": slug, "forge_price": price, "price_usd": price_usd, "round": "Series J",
+            "post_money_valuation": valuation, "valuation_usd": valuation_usd,
+            "amount_raised": "$9.8B", "amount_raised_usd": 9.8e9,
+        },
+    )
+
+
+def test_first_sighting_does_not_confirm_an_older_detail():
+    tracker = ChangeTracker()
+    # Detail scraped at t=100, its row first seen (already moved) at t=500
+    tracker.observe_rows([row(price="$120.00", price_usd=120.0)], now=500)
+    assert not tracker.confirms("spacex", scraped_at=100, validated_at=100)
+
+
+def test_unchanged_row_confirms_a_detail_scraped_after_it():
+    tracker = ChangeTracker()
+    tracker.observe_rows([row()], now=100)
+    tracker.observe_rows([row()], now=300)
+    assert tracker.confirms("spacex", scraped_at=200, validated_at=200)
+
+
+def test_price_move_is_a_change():
+    tracker = ChangeTracker()
+    tracker.observe_rows([row()], now=100)
+    events = tracker.observe_rows([row(price="$113.00", price_usd=113.0)], now=300)
+    assert [event.kind for event in events] == ["changed"]
+    assert events[0].changes["forge_price"].new == "$113.00"
+    assert not tracker.confirms("spacex", scraped_at=200, validated_at=200)
+
+
+def test_same_values_shown_differently_are_not_a_change():
+    tracker = ChangeTracker()
+    tracker.observe_rows([row()], now=100)
+    # JSON capture formats the same numbers differently
+    assert tracker.observe_rows([row(price="$112.5", valuation="$180.1B", valuation_usd=180.1e9)], now=200) == []
+
@@ -0,0 +1,66 @@
+"""Catalog crawler list walk (services/crawler.py)."""
+import asyncio
+from src.config import PAGE_SIZE
+from src.services.crawler import CatalogCrawler
+
+
+class Row:
+    def __init__(self, slug):
+        self.raw_data = {"slug": slug}
+
+
+class FakeService:
+    """Canned list pages; a missing page fails to fetch unless it is past `end`."""
+
+    def __init__(self, pages, end=None):
+        self.pages, self.end, self.scraped = pages, end, []
+
+    def is_list_fresh(self, sector, valuation, page_num):
+        return True
+
+    def is_detail_fresh(self, slug):
+        return True
+
+    def list_end_confirmed(self, sector, valuation, page_num):
+        return self.end is not None and page_num > self.end
+
+    def most_viewed(self):
+        return []
+
+    async def scrape(self, page_num, speed):
+        self.scraped.append(page_num)
+        return self.pages.get(page_num, [])
+
+
+def crawl(service):
+    crawler = CatalogCrawler()
+    crawler.service = service
+    asyncio.run(crawler.crawl_once())
+    return crawler
+
+
+def full_page(page_num):
+    return [Row(f"company-{page_num}-{i}") for i in range(PAGE_SIZE)]
+
+
+def test_failed_page_does_not_end_the_pass():
+    service = FakeService({1: full_page(1), 3: full_page(3)}, end=3)
+    crawler = crawl(service)
+    assert service.scraped == [1, 2, 3, 4]
+    assert crawler.list_failures == 1
+    assert len(crawler._slugs) == 2 * PAGE_SIZE
+
+
+def test_repeated_failures_stop_the_list_walk():
+    service = FakeService({1: full_page(1)})
+    crawler = crawl(service)
+    assert service.scraped == [1, 2, 3, 4]
+    assert crawler.list_failures == 3
+
+
+def test_zero_budget_disables_the_crawler(monkeypatch):
+    from src.services import crawler as crawler_module
+    monkeypatch.setattr(crawler_module, "CRAWLER_BUDGET_PER_HOUR", 0)
+    crawler = CatalogCrawler()
+    crawler.start()
+    assert crawler._task is None
@@ -0,0 +1,41 @@
+"""Catalog export page walk (ForgeGlobalService.iter_catalog)."""
+import asyncio
+import pytest
+from src.config import PAGE_SIZE
+from src.services import forge_global
+from src.services.forge_global import ForgeGlobalService, CatalogIncomplete
+
+
+def walk(monkeypatch, pages, end=None):
+    """Runs iter_catalog over canned pages; a None page fails to fetch."""
+    calls = []
+
+    async def list_page(self, sector, valuation, page_num, speed, serve_stale):
+        calls.append(page_num)
+        return pages.get(page_num) or []
+
+    monkeypatch.setattr(ForgeGlobalService, "_list_page", list_page)
+    monkeypatch.setattr(ForgeGlobalService, "get_list_meta", lambda self, sector, valuation: {"end": end})
+    monkeypatch.setattr(forge_global, "EXPORT_RETRY_DELAY", 0)
+
+    async def main():
+        return [row async for row in ForgeGlobalService().iter_catalog()]
+
+    return asyncio.run(main()), calls
+
+
+def test_stops_at_a_short_page(monkeypatch):
+    rows, calls = walk(monkeypatch, {1: ["a"] * PAGE_SIZE, 2: ["b"] * 3})
+    assert len(rows) == PAGE_SIZE + 3
+    assert calls == [1, 2]
+
+
+def test_stops_at_a_confirmed_end(monkeypatch):
+    rows, calls = walk(monkeypatch, {1: ["a"] * PAGE_SIZE}, end=1)
+    assert len(rows) == PAGE_SIZE
+    assert calls == [1, 2]
+
+
+def test_failed_page_is_retried_then_aborts(monkeypatch):
+    with pytest.raises(CatalogIncomplete):
+        walk(monkeypatch, {1: ["a"] * PAGE_SIZE, 3: ["c"] * PAGE_SIZE})
@@ -0,0 +1,107 @@
+"""
+Mapping of captured JSON payloads (services/forge_json.py).
+
+The payloads in fixtures/json are written by hand in the shapes the mapper
+accepts; they stand in for recorded responses until those are captured from
+the live site.
+"""
+import json
+import os
+from src.services.forge_json import map_detail, map_list
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "json")
+SITE = "https://forgeglobal.com"
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, f"{name}.json")) as f:
+        return json.load(f)
+
+
+def test_detail_from_company_and_rounds_endpoints():
+    mapped = map_detail([
+        (f"{SITE}/api/companies/spacex", load("company")),
+        (f"{SITE}/api/companies/spacex/rounds", load("rounds")),
+    ], "spacex")
+
+    assert mapped["complete"]
+    detail = mapped["detail"]
+    assert detail["name"] == "SpaceX"
+    assert detail["price_usd"] == 112.5
+    assert detail["change_usd"] == -2.25
+    assert detail["change_pct"] == -1.96
+    assert detail["valuation_usd"] == 180e9
+    assert detail["founded"] == "2002"
+
+    first, second = mapped["rounds"]
+    assert first["date_iso"] == "2023-05-01"
+    assert first["amount_raised_usd"] == 750e6
+    assert first["price_per_share_usd"] == 56.0
+    assert first["investors"] == ["Founders Fund", "Sequoia"]
+    assert first["liquidation_preference_multiple"] == "1.00x"
+    assert second["date_iso"] == "2010-01-01"
+    assert second["amount_raised_usd"] == 50.5e6
+    assert second["valuation_usd"] is None
+    assert second["investors"] == ["A", "B"]
+
+
+def test_detail_ignores_objects_about_something_else():
+    # A session payload arriving first must not supply the name or the price
+    mapped = map_detail([
+        (f"{SITE}/api/session", load("session")),
+        (f"{SITE}/api/companies/spacex", load("company")),
+        (f"{SITE}/api/companies/spacex/rounds", load("rounds")),
+    ], "spacex")
+
+    assert mapped["complete"]
+    assert mapped["detail"]["name"] == "SpaceX"
+    assert mapped["detail"]["price_usd"] == 112.5
+
+
+def test_detail_needs_the_requested_company():
+    mapped = map_detail([
+        (f"{SITE}/api/session", load("session")),
+        (f"{SITE}/api/companies/spacex", load("company")),
+    ], "stripe")
+
+    assert not mapped["complete"]
+    assert mapped["detail"]["name"] == "Unknown"
+
+
+def test_detail_rounds_only_from_this_company():
+    # Rounds from an endpoint that doesn't name the company are not taken
+    mapped = map_detail([
+        (f"{SITE}/api/companies/spacex", load("company")),
+        (f"{SITE}/api/rounds/latest", load("rounds")),
+    ], "spacex")
+
+    assert mapped["rounds"] is None
+    assert not mapped["complete"]
+
+
+def test_list_page_matching_the_result_count():
+    mapped = map_list([(f"{SITE}/api/search?page=2", load("search"))], 2)
+
+    assert mapped["complete"]
+    assert mapped["total"] == 26
+    assert mapped["pages"] == 2
+    spacex, stripe = mapped["rows"]
+    assert spacex["slug"] == "spacex"
+    assert spacex["price_usd"] == 112.5
+    assert spacex["valuation_usd"] == 180e9
+    assert stripe["slug"] == "stripe"
+    assert stripe["price_usd"] == 25.1
+    assert stripe["valuation_usd"] == 50e9
+
+
+def test_list_rejects_rows_that_dont_add_up():
+    # Two rows only fit the last page of 26 results
+    assert not map_list([(f"{SITE}/api/search", load("search"))], 1)["complete"]
+
+
+def test_list_ignores_other_company_lists():
+    # A trending widget has names, slugs and prices but is not the results table
+    mapped = map_list([(f"{SITE}/api/trending", load("trending"))], 1)
+
+    assert not mapped["complete"]
+    assert mapped["rows"] == []
@@ -0,0 +1,61 @@
+"""HTTP fast path falling back to the browser (services/forge_global.py)."""
+import time
+import asyncio
+from contextlib import asynccontextmanager
+import httpx
+from benchmarks.fixtures import list_page
+from src.config import SpeedProfile
+from src.services import forge_global
+from src.services.browser_tasks import new_outcome
+from src.services.forge_global import ForgeGlobalService
+from src.services.forge_parser import parse_search_page
+from src.services.rate_controller import RateController
+
+
+def test_http_challenge_does_not_delay_the_browser_fallback(monkeypatch):
+    rate = RateController()
+    fetched = []
+
+    def forbidden(request):
+        fetched.append(request.url)
+        return httpx.Response(403, text="<title>Just a moment...</title>")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(forbidden))
+
+    async def get_client():
+        return client
+
+    @asynccontextmanager
+    async def lease_page():
+        yield None
+
+    async def run_page_task(page, kind, url, report):
+        outcome = new_outcome()
+        outcome.update(status=200, latency=0.1, source="dom", data=parse_search_page(list_page(1)))
+        return outcome
+
+    monkeypatch.setattr(forge_global, "rate_controller", rate)
+    monkeypatch.setattr(forge_global.http_client_manager, "get_client", get_client)
+    monkeypatch.setattr(forge_global.browser_manager, "lease_page", lease_page)
+    monkeypatch.setattr(forge_global, "run_page_task", run_page_task)
+    monkeypatch.setattr(forge_global.worker_pool, "size", 0)
+    monkeypatch.setattr(ForgeGlobalService, "_http_skip_until", 0.0)
+    monkeypatch.setattr(ForgeGlobalService, "_http_challenges", 0)
+
+    async def main():
+        service = ForgeGlobalService()
+        started = time.monotonic()
+        first = await service._scrape_list_uncached("test:1", "test", 1, f"{service.BASE_URL}?page=1", SpeedProfile.FAST)
+        second = await service._scrape_list_uncached("test:2", "test", 2, f"{service.BASE_URL}?page=2", SpeedProfile.FAST)
+        return first, second, time.monotonic() - started
+
+    first, second, elapsed = asyncio.run(main())
+    assert len(first) == len(second) == 24
+    # No cooldown, no cut: the shared rate only saw the browser's healthy responses
+    assert elapsed < 2
+    assert rate.state != "cooldown"
+    assert rate.counts["throttled"] == rate.counts["challenge"] == 0
+    assert rate.counts["ok"] == 2
+    # The fast path backs off on its own: the second page went straight to the browser
+    assert len(fetched) == 1
+    assert ForgeGlobalService._http_challenges == 1
@@ -0,0 +1,62 @@
+"""Result counts on the search page and the pagination meta derived from them."""
+from src.config import PAGE_SIZE
+from src.services.cache import CacheEntry
+from src.services.forge_global import ForgeGlobalService
+from src.services.forge_parser import parse_search_page
+
+ROW = "<tr>" + "<td>x</td>" * 9 + "</tr>"
+
+
+def search_page(count_html: str, links=(), rows: int = 1) -> str:
+    anchors = "".join(f'<a href="/search-companies/?page={page}">{page}</a>' for page in links)
+    return f"<html><body>{count_html}<table><tbody>{ROW * rows}</tbody></table>{anchors}</body></html>"
+
+
+def meta(counts=None, page_num=1, row_count=PAGE_SIZE, extracted_empty=False, previous=None):
+    entry = CacheEntry(previous, 0.0, 0) if previous else None
+    return ForgeGlobalService()._build_list_meta(counts or {}, page_num, row_count, extracted_empty, entry)
+
+
+def test_count_comes_from_the_results_count_element():
+    page = search_page('<h2>Top 10 companies</h2><div class="results-count">5,243 results</div>', links=(1, 2, 219))
+    parsed = parse_search_page(page)
+    assert parsed["total"] == 5243
+    assert parsed["pages"] == 219
+
+
+def test_stray_count_text_is_ignored():
+    page = search_page("<h2>Top 10 companies</h2><p>Over 400 companies listed</p>")
+    assert parse_search_page(page)["total"] is None
+
+
+def test_count_sets_pages():
+    assert meta({"total": 5243, "pages": 5}) == {"total": 5243, "pages": 219}
+
+
+def test_links_and_full_pages_are_lower_bounds():
+    # A stale count gives way to pages known to exist
+    assert meta({"total": 100, "pages": 30}, page_num=12) == {"total": 29 * PAGE_SIZE + 1, "pages": 30}
+    assert meta({"pages": 5}, page_num=9, previous={"total": 12 * PAGE_SIZE, "pages": 12}) == {
+        "total": 12 * PAGE_SIZE, "pages": 12,
+    }
+
+
+def test_short_page_confirms_the_end():
+    assert meta({"total": 5243}, page_num=219, row_count=11) == {"total": 5243, "pages": 219, "end": 219}
+
+
+def test_empty_fetch_confirms_the_end():
+    previous = {"total": 300 * PAGE_SIZE, "pages": 300}
+    assert meta(page_num=220, row_count=0, extracted_empty=True, previous=previous) == {
+        "total": 219 * PAGE_SIZE, "pages": 219, "end": 219,
+    }
+
+
+def test_failed_fetch_says_nothing():
+    assert meta(page_num=3, row_count=0) is None
+
+
+def test_full_page_past_the_end_reopens_it():
+    previous = {"total": 219 * PAGE_SIZE, "pages": 219, "end": 219}
+    assert meta({"total": 5400}, page_num=219, previous=previous) == {"total": 5400, "pages": 225}
+    assert meta({}, page_num=100, previous=previous)["end"] == 219
@@ -0,0 +1,33 @@
+"""Process tree memory readings (services/memory.py)."""
+import os
+import signal
+import sys
+import time
+import subprocess
+import pytest
+from src.services.memory import descendant_pids
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_python_children_and_their_subtrees_are_skipped():
+    browser = subprocess.Popen(["sleep", "30"])
+    # Stands in for a browser worker: a Python process with its own browser
+    worker = subprocess.Popen(
+        [sys.executable, "-c", "import subprocess; subprocess.Popen(['sleep', '30']).wait()"],
+        start_new_session=True,
+    )
+    try:
+        for _ in range(50):
+            everything = descendant_pids()
+            if len(everything) >= 3:
+                break
+            time.sleep(0.05)
+        assert browser.pid in everything and worker.pid in everything
+        assert len(everything) >= 3
+
+        assert descendant_pids(skip_python=True) == [browser.pid]
+    finally:
+        os.killpg(worker.pid, signal.SIGKILL)  # The worker and its sleep
+        browser.kill()
+        worker.wait()
+        browser.wait()
@@ -0,0 +1,60 @@
+"""Display string parsing (services/normalize.py)."""
+from datetime import date
+from src.services.normalize import parse_usd, parse_pct, parse_date, parse_price_change, iso_date
+
+
+def test_usd_amounts():
+    assert parse_usd("$580.41") == 580.41
+    assert parse_usd("$1,234.50") == 1234.5
+    assert parse_usd("-$10.00") == -10.0
+    assert parse_usd("+$17.81") == 17.81
+    assert parse_usd("$.50") == 0.5
+
+
+def test_usd_suffixes():
+    assert parse_usd("$1.2B") == 1.2e9
+    assert parse_usd("$350M") == 350e6
+    assert parse_usd("$12.5k") == 12.5e3
+    assert parse_usd("$2T") == 2e12
+    assert parse_usd("$1.2B,") == 1.2e9
+    assert parse_usd("$1.5 Billion") == 1.5e9
+    assert parse_usd("$40 million raised") == 40e6
+
+
+def test_usd_suffix_letter_must_end_the_word():
+    assert parse_usd("$10 Market") == 10.0
+    assert parse_usd("$5 Today") == 5.0
+    assert parse_usd("$3 Bonus") == 3.0
+    assert parse_usd("$7 Kickoff") == 7.0
+
+
+def test_usd_first_amount_wins():
+    assert parse_usd("$580.41 +$17.81 (3.17%)") == 580.41
+
+
+def test_usd_placeholders():
+    for text in (None, "", "--", "N/A", "Undisclosed"):
+        assert parse_usd(text) is None
+
+
+def test_percent():
+    assert parse_pct("(3.17%)") == 3.17
+    assert parse_pct("-2.5%") == -2.5
+    assert parse_pct("+0.4 %") == 0.4
+    assert parse_pct("--") is None
+
+
+def test_price_change():
+    assert parse_price_change("$580.41 +$17.81 (3.17%)") == (17.81, 3.17)
+    assert parse_price_change("-$4.20 (1.10%)") == (-4.2, -1.1)
+    assert parse_price_change("$580.41") == (None, None)
+
+
+def test_dates():
+    assert parse_date("Mar 15, 2023") == date(2023, 3, 15)
+    assert parse_date("Sept. 1, 2021") == date(2021, 9, 1)
+    assert parse_date("03/15/2023") == date(2023, 3, 15)
+    assert parse_date("Mar 2023") == date(2023, 3, 1)
+    assert parse_date("2019") == date(2019, 1, 1)
+    assert parse_date("--") is None
+    assert iso_date("Jan 05, 2024") == "2024-01-05"
@@ -0,0 +1,36 @@
+"""Request pacing (services/rate_controller.py)."""
+import time
+import asyncio
+import pytest
+from src.config import SpeedProfile
+from src.services.rate_controller import RateController, RateLimitExceeded
+
+
+def test_cooldown_longer_than_the_limit_fails_fast():
+    async def main():
+        rate = RateController()
+        rate.record_status(200, 0.1, challenge=True)
+        started = time.monotonic()
+        with pytest.raises(RateLimitExceeded):
+            await rate.acquire(SpeedProfile.FAST, max_wait=1)
+        return rate, time.monotonic() - started
+
+    rate, elapsed = asyncio.run(main())
+    assert elapsed < 0.5
+    assert rate.counts["challenge"] == 1
+    assert rate.rejected == 1
+
+
+def test_waiting_behind_other_callers_counts_toward_the_limit():
+    async def main():
+        rate = RateController()
+        # Holds the queue like a caller sleeping out a long wait
+        async with rate._lock:
+            with pytest.raises(RateLimitExceeded):
+                await rate.acquire(SpeedProfile.FAST, max_wait=0.05)
+        # A token is still there for the next caller
+        await rate.acquire(SpeedProfile.FAST, max_wait=0.05)
+        return rate
+
+    rate = asyncio.run(main())
+    assert rate.rejected == 1
@@ -0,0 +1,70 @@
+"""HTTP caching headers of cached results (api/routes.py)."""
+import time
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from src.config import CACHE_TTL, CACHE_STALE_TTL
+from src.main import app
+from src.models.schemas import UnifiedCompanyData, CompanyDetail
+from src.services.forge_global import ForgeGlobalService
+
+SECTOR = "routes-test"
+
+
+@pytest.fixture
+def client():
+    # Without the lifespan: no browser, store or background tasks
+    yield TestClient(app)
+    ForgeGlobalService._list_cache.delete(ForgeGlobalService.list_cache_key(SECTOR, None, 1))
+    ForgeGlobalService._detail_cache.delete("routes-test-co")
+
+
+def cache_list_page(stored_at: float):
+    row = UnifiedCompanyData(
+        name="Routes Test Co", sector="Fintech", date_scraped=datetime(2026, 1, 1), source="forge_global",
+        raw_data={"slug": "routes-test-co"},
+    )
+    ForgeGlobalService._list_cache.set(ForgeGlobalService.list_cache_key(SECTOR, None, 1), [row], stored_at=stored_at)
+
+
+def test_cached_list_page_has_etag_and_cache_control(client):
+    cache_list_page(time.time() - 600)
+    response = client.get("/data/forge", params={"sector": SECTOR})
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    max_age = CACHE_TTL - 600
+    assert response.headers["cache-control"] in (
+        f"public, max-age={age}, stale-while-revalidate={CACHE_STALE_TTL}" for age in (max_age, max_age - 1)
+    )
+    assert response.json()["items"][0]["name"] == "Routes Test Co"
+
+
+def test_matching_if_none_match_is_304(client):
+    cache_list_page(time.time())
+    etag = client.get("/data/forge", params={"sector": SECTOR}).headers["etag"]
+
+    for header in (etag, etag.removeprefix("W/"), f'"other", {etag}'):
+        response = client.get("/data/forge", params={"sector": SECTOR}, headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+    response = client.get("/data/forge", params={"sector": SECTOR}, headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_cached_detail_has_etag(client):
+    detail = CompanyDetail(
+        name="Routes Test Co", slug="routes-test-co", ticker="RTC", description="", sector="Fintech", subsector="",
+        founded="", headquarters="", website="", employees="", price="", price_change="", price_change_pct="",
+        valuation="", funding_history=[], key_people=[], investors=[], scraped_at=datetime(2026, 1, 1),
+    )
+    ForgeGlobalService._detail_cache.set("routes-test-co", detail)
+    response = client.get("/data/company/routes-test-co")
+
+    assert response.status_code == 200
+    assert response.json()["slug"] == "routes-test-co"
+    etag = response.headers["etag"]
+    assert client.get("/data/company/routes-test-co", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,74 @@
+"""Request coalescing and per-caller context (services/singleflight.py)."""
+import asyncio
+from src.services.singleflight import SingleFlight
+from src.services.forge_global import background_scrape, scrape_progress, report_progress, _SlotWaiter
+
+
+def test_callers_share_one_call():
+    async def main():
+        flights = SingleFlight("test")
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(3)))
+        return results, calls, flights.stats()
+
+    results, calls, stats = asyncio.run(main())
+    assert results == ["result"] * 3
+    assert calls == [1]
+    assert stats["coalesced"] == 2
+
+
+def test_job_joining_a_background_flight_gets_progress_and_priority():
+    async def main():
+        flights = SingleFlight("test")
+        events = []
+        started, proceed = asyncio.Event(), asyncio.Event()
+        seen = {}
+
+        async def work():
+            started.set()
+            await proceed.wait()
+            seen["background"] = _SlotWaiter().is_background()
+            report_progress("navigating", url="/x")
+            return "result"
+
+        async def crawler():
+            background_scrape.set(True)
+            return await flights.do("key", work)
+
+        async def job():
+            scrape_progress.set(lambda stage, data: events.append(stage))
+            return await flights.do("key", work)
+
+        first = asyncio.create_task(crawler())
+        await started.wait()
+        second = asyncio.create_task(job())
+        await asyncio.sleep(0)
+        proceed.set()
+        return await asyncio.gather(first, second), events, seen
+
+    results, events, seen = asyncio.run(main())
+    assert results == ["result", "result"]
+    assert events == ["navigating"]
+    assert seen["background"] is False
+
+
+def test_background_flight_stays_background():
+    async def main():
+        flights = SingleFlight("test")
+
+        async def work():
+            return _SlotWaiter().is_background()
+
+        async def crawler():
+            background_scrape.set(True)
+            return await flights.do("key", work)
+
+        return await crawler()
+
+    assert asyncio.run(main()) is True
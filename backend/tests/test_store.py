@@ -0,0 +1,42 @@
+"""SQLite result store (services/store.py)."""
+import asyncio
+from datetime import datetime
+import pytest
+from src.models.schemas import ChangeEvent
+from src.services import store as store_module
+from src.services.store import result_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    asyncio.run(result_store.open(str(tmp_path / "store.db")))
+    yield result_store
+    asyncio.run(result_store.close())
+
+
+def event(n):
+    return ChangeEvent(slug=f"co-{n}", name=f"Co {n}", kind="added", at=datetime(2026, 1, 1))
+
+
+def test_change_feed_is_trimmed_to_the_cap(store, monkeypatch):
+    monkeypatch.setattr(store_module, "CHANGE_FEED_MAX", 3)
+
+    async def main():
+        await store.save_changes([event(n) for n in range(4)])
+        await store.save_changes([event(n) for n in range(4, 6)])
+        return await store.load_changes(100)
+
+    assert [e.slug for e in asyncio.run(main())] == ["co-3", "co-4", "co-5"]
+    assert store._execute("SELECT COUNT(*) FROM change_feed") == [(3,)]
+
+
+def test_meta_keeps_the_confirmed_last_page(store):
+    async def main():
+        await store.save_meta("ended", {"total": 90, "pages": 2, "end": 2}, 100.0)
+        await store.save_meta("open", {"total": 200, "pages": 4}, 101.0)
+        return await store.load_meta(0, 10)
+
+    assert asyncio.run(main()) == [
+        ("open", {"total": 200, "pages": 4}, 101.0),
+        ("ended", {"total": 90, "pages": 2, "end": 2}, 100.0),
+    ]
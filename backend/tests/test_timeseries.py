@@ -0,0 +1,61 @@
+"""Price and valuation history (services/timeseries.py)."""
+from datetime import datetime
+from src.models.schemas import UnifiedCompanyData, CompanyDetail, FundingRound
+from src.services.normalize import normalize_detail
+from src.services.timeseries import PriceHistory
+
+SLUG = "small-company-0001"
+
+
+def list_row() -> UnifiedCompanyData:
+    return UnifiedCompanyData(
+        name="Small Company", sector="Software", valuation="$91.1B", date_scraped=datetime(2026, 1, 1),
+        source="forge_global",
+        raw_data={"slug": SLUG, "price_usd": 41.5, "post_money_valuation": "$91.1B", "valuation_usd": 91.1e9},
+    )
+
+
+def funding_round(date: str, valuation: str) -> FundingRound:
+    return FundingRound(
+        date=date, round_label="Series C", amount_raised="$1B", price_per_share="$30.00",
+        valuation=valuation, investors=[],
+    )
+
+
+def detail() -> CompanyDetail:
+    company = CompanyDetail(
+        name="Small Company", slug=SLUG, ticker="SMAL", description="", sector="Software", subsector="",
+        founded="2015", headquarters="", website="", employees="",
+        price="$41.50", price_change="", price_change_pct="",
+        valuation="$293B",  # Forge Price valuation: a different metric
+        funding_history=[funding_round("Jan 2019", "$20B"), funding_round("Mar 2024", "$91.1B")],
+        key_people=[], investors=[], scraped_at=datetime(2026, 1, 1),
+    )
+    normalize_detail(company)
+    return company
+
+
+def recorded(history: PriceHistory):
+    series = history._series[SLUG]
+    return list(series.price), list(series.valuation)
+
+
+def test_list_and_detail_record_the_same_valuation():
+    from_list, from_detail = PriceHistory(), PriceHistory()
+    from_list.record_rows([list_row()])
+    from_detail.record_detail(detail())
+
+    assert recorded(from_list) == recorded(from_detail)
+    _, valuations = recorded(from_detail)
+    assert round(valuations[0] / 1e9, 1) == 91.1
+
+
+def test_detail_without_dated_rounds_has_no_valuation():
+    company = detail()
+    company.funding_history = []
+    history = PriceHistory()
+    history.record_detail(company)
+
+    (price,), (valuation,) = recorded(history)
+    assert price == 41.5
+    assert valuation != valuation  # NaN: not shown
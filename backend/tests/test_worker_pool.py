@@ -0,0 +1,35 @@
+"""Browser worker pool sizing and task dispatch (services/worker_pool.py)."""
+import asyncio
+from src.services import worker_pool as worker_pool_module
+from src.services.worker_pool import WorkerPool, pool_size
+
+
+def test_off_and_pinned_counts():
+    assert pool_size("off") == 0
+    assert pool_size("") == 0
+    assert pool_size("0") == 0
+    assert pool_size("3") == 3
+
+
+def test_auto_starts_at_least_one_worker():
+    assert pool_size("auto") >= 1
+
+
+def test_unknown_settings_turn_the_pool_off(capsys):
+    for setting in ("on", "true", "yes", "-2", "2.5"):
+        assert pool_size(setting) == 0
+    assert "WORKER_POOL='on'" in capsys.readouterr().out
+
+
+def test_no_idle_worker_fails_after_the_acquire_timeout(monkeypatch):
+    monkeypatch.setattr(worker_pool_module, "WORKER_ACQUIRE_TIMEOUT", 0.05)
+    pool = WorkerPool(1)
+
+    async def main():
+        # Started, but no worker ever reports ready (say each crashes at startup)
+        pool._idle = asyncio.Queue()
+        return await asyncio.wait_for(pool.run("list", "https://example.com", lambda *a, **k: None), 1)
+
+    outcome = asyncio.run(main())
+    assert "No browser worker available" in outcome["error"]
+    assert pool.stats()["unavailable"] == 1
@@ -65,9 +65,9 @@ export default function Deal() {
         );
     }
 
-    // Parse numeric values from string with fallback
-    const price = parseFloat(company.price.replace(/[^0-9.]/g, '')) || 0;
-    const change24h = parseFloat(company.price_change_pct.replace(/[^0-9.-]/g, '')) || 0;
+    // Typed values from the API
+    const price = company.price_usd ?? 0;
+    const change24h = company.change_pct ?? 0;
     const isPositive = change24h >= 0;
 
     // Use mock data for orders as they are not yet in API
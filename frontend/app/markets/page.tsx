@@ -39,10 +39,22 @@ export default function Markets() {
         }
     });
 
+    // Price history for the sparklines of every row on this page
+    const slugs = useMemo(
+        () => (apiData?.items || []).map(item => item.raw_data?.slug).filter(Boolean) as string[],
+        [apiData]
+    );
+    const { data: history } = useQuery({
+        queryKey: ['history', slugs],
+        queryFn: () => api.getPriceHistory(slugs),
+        enabled: slugs.length > 0,
+    });
+
     const filtered = useMemo(() => {
         if (!apiData?.items) return [];
 
-        let items = apiData.items.map(transformCompany);
+        const historyBySlug = new Map((history || []).map(series => [series.slug, series.points]));
+        let items = apiData.items.map(item => transformCompany(item, historyBySlug.get(item.raw_data?.slug)));
 
         if (search) {
             items = items.filter(c =>
@@ -52,7 +64,7 @@ export default function Markets() {
         }
 
         return items;
-    }, [apiData, search]);
+    }, [apiData, history, search]);
 
     const totalPages = apiData?.pages || 1;
 
@@ -1,4 +1,4 @@
-import { PaginatedResponse, CompanyDetail } from '@/types/api';
+import { PaginatedResponse, CompanyDetail, BatchDetailItem, ScrapeJob, ScrapeJobRequest, PriceHistorySeries, PricePoint } from '@/types/api';
 
 const BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -46,35 +46,115 @@ export const api = {
   getCompanyDetail: async (slug: string): Promise<CompanyDetail> => {
     return fetchApi<CompanyDetail>(`/data/company/${slug}`);
   },
+
+  // Streams NDJSON: onItem fires per slug as soon as the backend has it
+  getCompanyDetailsBatch: async (
+    slugs: string[],
+    onItem?: (item: BatchDetailItem) => void
+  ): Promise<BatchDetailItem[]> => {
+    const res = await fetch(`${BASE_URL}/data/companies/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ slugs }),
+    });
+
+    if (!res.ok || !res.body) {
+      const error = await res.text();
+      throw new Error(`API Error: ${res.status} - ${error}`);
+    }
+
+    const items: BatchDetailItem[] = [];
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+
+      const lines = buffer.split('\n');
+      buffer = done ? '' : lines.pop() || '';
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        const item: BatchDetailItem = JSON.parse(line);
+        items.push(item);
+        onItem?.(item);
+      }
+      if (done) break;
+    }
+
+    return items;
+  },
+
+  // One call for a whole page of sparklines
+  getPriceHistory: async (
+    slugs: string[],
+    days: number = 30,
+    points: number = 24
+  ): Promise<PriceHistorySeries[]> => {
+    const params = new URLSearchParams({
+      days: days.toString(),
+      points: points.toString(),
+    });
+    slugs.forEach(slug => params.append('slug', slug));
+
+    return fetchApi<PriceHistorySeries[]>(`/data/history?${params.toString()}`);
+  },
+
+  submitScrapeJob: async (request: ScrapeJobRequest): Promise<ScrapeJob> => {
+    return fetchApi<ScrapeJob>('/data/jobs', {
+      method: 'POST',
+      body: JSON.stringify(request),
+    });
+  },
+
+  getScrapeJob: async (jobId: string): Promise<ScrapeJob> => {
+    return fetchApi<ScrapeJob>(`/data/jobs/${jobId}`);
+  },
+
+  // Follows a job over SSE and resolves with the finished job (EventSource reconnects on its own)
+  followScrapeJob: (
+    jobId: string,
+    handlers: {
+      onQueue?: (position: number) => void;
+      onStage?: (stage: string) => void;
+      onRows?: (rows: unknown[]) => void;
+    } = {}
+  ): Promise<ScrapeJob> => {
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${BASE_URL}/data/jobs/${jobId}/events`);
+      const data = (e: Event) => JSON.parse((e as MessageEvent).data);
+
+      source.addEventListener('queue', (e) => handlers.onQueue?.(data(e).position));
+      source.addEventListener('stage', (e) => handlers.onStage?.(data(e).stage));
+      source.addEventListener('rows', (e) => handlers.onRows?.(data(e).rows));
+      source.addEventListener('done', (e) => {
+        source.close();
+        resolve(data(e));
+      });
+      source.addEventListener('failed', (e) => {
+        source.close();
+        reject(new Error(data(e).error));
+      });
+      // Unknown or expired job (404), or the stream dropped before the job finished
+      source.onerror = () => {
+        source.close();
+        reject(new Error(`Lost the event stream of scrape job ${jobId}`));
+      };
+    });
+  },
 };
 
 import { Company, Category } from './types';
 import { UnifiedCompanyData } from '@/types/api';
 
-export function transformCompany(data: UnifiedCompanyData): Company {
+export function transformCompany(data: UnifiedCompanyData, history?: PricePoint[]): Company {
   // Extract ticker from name or raw_data if available, otherwise generate specific mocked one 
   const ticker = (data.raw_data?.ticker || data.name.substring(0, 4).toUpperCase());
 
-  // Parse price and change from forge_price or other sources
-  // Expected format: "$580.41 +$17.81 (3.17%)" or similar
-  let price = 0;
-  let change24h = 0;
-
-  if (data.raw_data?.forge_price) {
-    const priceText = data.raw_data.forge_price;
-
-    // Extract price
-    const priceMatch = priceText.match(/\$([\d,]+\.?\d*)/);
-    if (priceMatch) {
-      price = parseFloat(priceMatch[1].replace(/,/g, ''));
-    }
-
-    // Extract percentage change: looking for (X.XX%)
-    const pctMatch = priceText.match(/\(([\+\-]?\d+\.?\d*)%\)/);
-    if (pctMatch) {
-      change24h = parseFloat(pctMatch[1]);
-    }
-  }
+  // Price and change come typed from the backend (price_usd, change_pct)
+  const price = data.raw_data?.price_usd ?? 0;
+  const change24h = data.raw_data?.change_pct ?? 0;
 
   // Clean up sector: Match against known valid categories
   // "Enterprise SoftwareData Intelligence" -> "Enterprise"
@@ -89,6 +169,10 @@ export function transformCompany(data: UnifiedCompanyData): Company {
     sector = foundCategory;
   }
 
+  // Sparkline from recorded Forge Prices; flat until there are two observations
+  const observed = (history || []).filter(p => p.price != null).map(p => ({ value: p.price as number }));
+  const sparkline = observed.length >= 2 ? observed : Array(8).fill(0).map(() => ({ value: price }));
+
   return {
     slug: data.name.toLowerCase().replace(/[^a-z0-9]+/g, '-'),
     name: data.name,
@@ -99,7 +183,7 @@ export function transformCompany(data: UnifiedCompanyData): Company {
     change24h: change24h,
     amountRaised: data.raw_data?.amount_raised || '--',
     marketCap: data.valuation || 'N/A',
-    sparkline: Array(8).fill(0).map(() => ({ value: 40 + Math.random() * 20 })),
+    sparkline: sparkline,
     description: '',
     founded: '',
     headquarters: '',
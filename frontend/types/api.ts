@@ -24,6 +24,12 @@ export interface FundingRound {
     dividend_type?: string;
     participation_type?: string;
     participation_cap?: string;
+
+    // Typed values parsed by the backend
+    date_iso?: string;
+    amount_raised_usd?: number;
+    price_per_share_usd?: number;
+    valuation_usd?: number;
 }
 
 export interface KeyPerson {
@@ -52,6 +58,10 @@ export interface CompanyDetail {
     price_change: string;
     price_change_pct: string;
     valuation: string;
+    price_usd?: number;
+    change_usd?: number;
+    change_pct?: number;
+    valuation_usd?: number;
 
     // Deep Data
     funding_history: FundingRound[];
@@ -69,3 +79,43 @@ export interface PaginatedResponse {
     size: number;
     pages: number;
 }
+
+export interface BatchDetailItem {
+    slug: string;
+    status: 'ok' | 'not_found' | 'error';
+    data?: CompanyDetail;
+    error?: string;
+}
+
+export interface ScrapeJobRequest {
+    kind: 'list' | 'detail';
+    sector?: string;
+    valuation?: string;
+    page?: number;
+    speed?: 'fast' | 'normal' | 'slow';
+    slug?: string;
+}
+
+export interface ScrapeJob {
+    id: string;
+    kind: 'list' | 'detail';
+    status: 'queued' | 'running' | 'done' | 'failed';
+    stage: string;
+    position?: number;
+    rows: number;
+    created_at: string;
+    finished_at?: string;
+    result?: PaginatedResponse | CompanyDetail;
+    error?: string;
+}
+
+export interface PricePoint {
+    t: string;
+    price?: number;
+    valuation?: number;
+}
+
+export interface PriceHistorySeries {
+    slug: string;
+    points: PricePoint[];
+}